@@ -0,0 +1,456 @@
+"""
+ReGen Benchmarks.
+
+This script measures every stage of the ReGen pipeline against local fixtures, with
+no network access or API key required:
+
+    parse    parse_job_data and the bulk card extraction on a saved LinkedIn search
+             page, served locally and loaded in a headless browser
+    fetch    description fetching over HTTP against a saved jobPosting fragment
+    score    RelevanceScorer on N job descriptions, cold and with a warm cache
+    regen    regen_resume against the fake LLM backend with injected latency
+    render   generate_resume_from_json and the process-pool batch renderer
+    pdf      loadPdfContent on the sample PDFs in inputs/, per installed backend
+
+Every benchmark reports its throughput, p50 and p95 latency and the peak RSS as JSON,
+so results of two versions can be diffed. Each stage runs in its own process by
+default, so the peak RSS of one stage is not inflated by the ones before it.
+
+Usage:
+    python runBenchmarks.py --output results.json
+    python runBenchmarks.py --stages fetch,regen --n 100 --compare results.json
+"""
+
+import argparse
+import glob
+import http.server
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+
+import numpy as np
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+FIXTURE_DIR = os.path.join(BENCHMARK_DIR, 'fixtures')
+REPO_DIR = os.path.dirname(BENCHMARK_DIR)
+INPUT_DIR = os.path.join(REPO_DIR, 'inputs')
+sys.path.insert(0, os.path.join(REPO_DIR, 'src'))
+
+STAGES = ['parse', 'fetch', 'score', 'regen', 'render', 'pdf']
+
+
+def peak_rss_mb():
+    """
+    Get the peak resident set size of this process.
+
+    Returns:
+        float: The peak RSS in MiB, or None if it cannot be measured on this platform.
+    """
+    try:
+        import resource
+    except ImportError:
+        try:
+            import psutil
+        except ImportError:
+            return None
+        memory = psutil.Process().memory_info()
+        return getattr(memory, 'peak_wset', memory.rss) / 2 ** 20
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return peak / 2 ** 20 if sys.platform == 'darwin' else peak / 2 ** 10
+
+
+def summarize(latencies, items, seconds, **extra):
+    """
+    Summarize one benchmark.
+
+    Args:
+        latencies (list of float): The duration of every timed operation, in seconds.
+        items (int): The number of items processed.
+        seconds (float): The wall-clock time of the whole benchmark.
+        **extra: Additional fields to report.
+
+    Returns:
+        dict: The items, seconds, throughput per second, p50 and p95 latency in
+              milliseconds and peak RSS in MiB.
+    """
+    result = {
+        'items': items,
+        'seconds': round(seconds, 4),
+        'throughput_per_s': round(items / seconds, 3) if seconds else None,
+        'p50_ms': round(float(np.percentile(latencies, 50)) * 1000, 3) if latencies else None,
+        'p95_ms': round(float(np.percentile(latencies, 95)) * 1000, 3) if latencies else None,
+    }
+    result.update(extra)
+    peak = peak_rss_mb()
+    result['peak_rss_mb'] = round(peak, 1) if peak is not None else None
+    return result
+
+
+def run_timed(func, items, workers=1):
+    """
+    Call func on every item, timing each call.
+
+    Args:
+        func (callable): The operation to benchmark.
+        items (list): The arguments of the calls.
+        workers (int): The number of concurrent threads. Defaults to 1.
+
+    Returns:
+        tuple: A tuple containing:
+            - list: The results, in input order.
+            - list of float: The duration of every call, in seconds.
+            - float: The wall-clock time of all calls, in seconds.
+    """
+    def timed(item):
+        start = time.perf_counter()
+        result = func(item)
+        return result, time.perf_counter() - start
+
+    start = time.perf_counter()
+    if workers > 1:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            timed_results = list(executor.map(timed, items))
+    else:
+        timed_results = [timed(item) for item in items]
+    wall = time.perf_counter() - start
+    return [result for result, _ in timed_results], [latency for _, latency in timed_results], wall
+
+
+def load_job_descriptions(n):
+    with open(os.path.join(FIXTURE_DIR, 'job_descriptions.json'), 'r', encoding='utf-8') as f:
+        descriptions = json.load(f)
+    # Repeat the fixtures with a suffix when more are asked for, so no two texts are identical
+    return [descriptions[i % len(descriptions)] + (f"\nRef {i}" if i >= len(descriptions) else '')
+            for i in range(n)]
+
+
+def load_resume_json():
+    with open(os.path.join(INPUT_DIR, 'resume_data.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+class FixtureHandler(http.server.BaseHTTPRequestHandler):
+    """
+    Serves the saved search page at /search and the jobPosting fragment at /jobPosting/<id>.
+    """
+
+    routes = {'/search': 'job_search.html', '/jobPosting/': 'job_posting.html'}
+
+    def do_GET(self):
+        name = next((file_name for prefix, file_name in self.routes.items() if self.path.startswith(prefix)), None)
+        if name is None:
+            self.send_error(404)
+            return
+        with open(os.path.join(FIXTURE_DIR, name), 'rb') as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@contextmanager
+def fixture_server():
+    """
+    Serve the fixtures on a free local port for the duration of the block.
+
+    Yields:
+        str: The base URL of the server.
+    """
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def bench_parse(args):
+    from browserPool import BrowserPool
+    from jobListingScraper import LinkedInJobListingScraper
+
+    results = {}
+    pool = BrowserPool(browser=args.browser, headless=True, max_size=1)
+    scraper = LinkedInJobListingScraper(pool=pool)
+    try:
+        scraper.acquire_driver()
+        with fixture_server() as base_url:
+            job_elements = scraper.fetch_job_listings(f"{base_url}/search")
+            _, latencies, wall = run_timed(scraper.parse_job_data, job_elements * args.repeat)
+            results['parse_job_data'] = summarize(latencies, len(latencies), wall)
+
+            _, latencies, wall = run_timed(lambda _: scraper.get_jobs_data_bulk(), range(args.repeat))
+            results['parse_job_data_bulk'] = summarize(latencies, len(job_elements) * args.repeat, wall,
+                                                       unit='page')
+    finally:
+        scraper.close()
+        pool.close()
+    return results
+
+
+def bench_fetch(args):
+    from httpDescriptionFetcher import LinkedInHttpDescriptionFetcher
+
+    results = {}
+    job_ids = [str(4000000000 + i) for i in range(args.n)]
+    with fixture_server() as base_url:
+        fetcher = LinkedInHttpDescriptionFetcher(base_url=f"{base_url}/jobPosting/", max_workers=args.workers,
+                                                 requests_per_second=None)
+        try:
+            _, latencies, wall = run_timed(fetcher.get_description, job_ids)
+            results['fetch_description'] = summarize(latencies, len(job_ids), wall)
+
+            _, latencies, wall = run_timed(fetcher.get_description, job_ids, workers=args.workers)
+            results['fetch_description_concurrent'] = summarize(latencies, len(job_ids), wall, workers=args.workers)
+        finally:
+            fetcher.close()
+    return results
+
+
+def bench_score(args):
+    from resumeGenerator import render_resume_text
+    from resumeRelevancyScore import RelevanceScorer
+
+    results = {}
+    resume_text = render_resume_text(load_resume_json())
+    descriptions = load_job_descriptions(args.n)
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        start = time.perf_counter()
+        scorer = RelevanceScorer(cache_dir=cache_dir, backend=args.scorer_backend)
+        load_seconds = time.perf_counter() - start
+
+        # The first call embeds every description; the repeats are served by the embedding cache
+        _, latencies, wall = run_timed(lambda _: scorer.score_many(resume_text, descriptions), range(1))
+        results['relevance_score_cold'] = summarize(latencies, len(descriptions), wall,
+                                                    model_load_s=round(load_seconds, 3), unit='batch')
+
+        _, latencies, wall = run_timed(lambda _: scorer.score_many(resume_text, descriptions), range(args.repeat))
+        results['relevance_score_cached'] = summarize(latencies, len(descriptions) * args.repeat, wall,
+                                                      unit='batch')
+    return results
+
+
+def bench_regen(args):
+    import llmClient
+    from llmBackends import FakeBackend
+    from reGenerate import regen_resume
+
+    resume_json = load_resume_json()
+    descriptions = load_job_descriptions(args.n)
+    patch = {"summary": resume_json.get("summary", ""),
+             "experience": [{"index": 0, "responsibilities": {"0": "Tailored bullet."}}]}
+    response = json.dumps(patch) if args.regen_mode == 'patch' else json.dumps(resume_json)
+    backend = FakeBackend(default_response=response, latency=args.llm_latency, jitter=0.2)
+
+    llmClient.set_backend(backend)
+    llmClient.set_completion_cache(None)
+    try:
+        usage_log = []
+        jobs = [(description, f"bench-{i}") for i, description in enumerate(descriptions)]
+        _, latencies, wall = run_timed(
+            lambda job: regen_resume(job[0], resume_json, job[1], write_pdf=False, mode=args.regen_mode,
+                                     usage_log=usage_log),
+            jobs, workers=args.workers)
+    finally:
+        llmClient.set_backend(None)
+
+    usage = llmClient.summarize_usage(usage_log)
+    return {'regen_resume': summarize(latencies, len(jobs), wall, workers=args.workers, mode=args.regen_mode,
+                                      llm_latency_s=args.llm_latency, prompt_tokens=usage['prompt_tokens'])}
+
+
+def bench_render(args):
+    from resumeGenerator import generate_resume_from_json, render_resumes_batch
+
+    results = {}
+    resume_json = load_resume_json()
+    with tempfile.TemporaryDirectory() as output_dir:
+        _, latencies, wall = run_timed(lambda i: generate_resume_from_json(resume_json, f"bench-{i}", output_dir),
+                                       range(args.n))
+        results['generate_resume_from_json'] = summarize(latencies, args.n, wall)
+
+        _, latencies, wall = run_timed(lambda i: generate_resume_from_json(resume_json, i, return_bytes=True),
+                                       range(args.n))
+        results['generate_resume_bytes'] = summarize(latencies, args.n, wall)
+
+        start = time.perf_counter()
+        render_resumes_batch([(resume_json, f"batch-{i}") for i in range(args.n)], output_dir=output_dir)
+        results['render_resumes_batch'] = summarize([], args.n, time.perf_counter() - start,
+                                                    workers=os.cpu_count())
+    return results
+
+
+def bench_pdf(args):
+    from pdfLoader import available_backends, loadPdfContent
+
+    results = {}
+    pdf_paths = sorted(glob.glob(os.path.join(INPUT_DIR, '*.pdf')))
+    for backend in available_backends():
+        calls = [path for path in pdf_paths for _ in range(args.repeat)]
+        _, latencies, wall = run_timed(lambda path: loadPdfContent(path, backend=backend, use_cache=False), calls)
+        results[f"load_pdf_{backend}"] = summarize(latencies, len(calls), wall)
+
+    calls = [path for path in pdf_paths for _ in range(args.repeat)]
+    _, latencies, wall = run_timed(loadPdfContent, calls)
+    results['load_pdf_cached'] = summarize(latencies, len(calls), wall)
+    return results
+
+
+BENCHMARKS = {
+    'parse': bench_parse,
+    'fetch': bench_fetch,
+    'score': bench_score,
+    'regen': bench_regen,
+    'render': bench_render,
+    'pdf': bench_pdf,
+}
+
+
+def run_stage(stage, args):
+    """
+    Run one stage in this process, recording why it was skipped if it cannot run.
+
+    Args:
+        stage (str): The stage name.
+        args (argparse.Namespace): The command-line arguments.
+
+    Returns:
+        dict: The results of the stage's benchmarks.
+    """
+    print(f"Running {stage} benchmarks", file=sys.stderr)
+    try:
+        return BENCHMARKS[stage](args)
+    except Exception as error:
+        # A missing browser or model skips the stage instead of failing the whole run
+        print(f"Skipped {stage}: {error}", file=sys.stderr)
+        return {stage: {'skipped': f"{type(error).__name__}: {error}"}}
+
+
+def run_stage_isolated(stage, argv):
+    """
+    Run one stage in a fresh Python process, so its peak RSS is measured on its own.
+
+    Args:
+        stage (str): The stage name.
+        argv (list of str): The command-line arguments, without --stages and --output.
+
+    Returns:
+        dict: The results of the stage's benchmarks.
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_path = os.path.join(temp_dir, 'results.json')
+        subprocess.run([sys.executable, os.path.abspath(__file__), *argv, '--stages', stage, '--in-process',
+                        '--output', output_path], check=True, cwd=os.path.join(REPO_DIR, 'src'))
+        with open(output_path, 'r') as f:
+            return json.load(f)['results']
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_DIR, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(previous, current):
+    """
+    Print the change of every benchmark against an earlier report.
+
+    Args:
+        previous (dict): The earlier report.
+        current (dict): The new report.
+    """
+    for name, result in current['results'].items():
+        before = previous.get('results', {}).get(name)
+        if not before or 'skipped' in result or 'skipped' in before:
+            continue
+        changes = []
+        for metric in ['throughput_per_s', 'p50_ms', 'p95_ms', 'peak_rss_mb']:
+            if before.get(metric) and result.get(metric) is not None:
+                changes.append(f"{metric} {before[metric]} -> {result[metric]} "
+                               f"({(result[metric] - before[metric]) / before[metric]:+.1%})")
+        print(f"{name}: " + ", ".join(changes), file=sys.stderr)
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list of str): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Benchmark the ReGen pipeline stages on local fixtures.")
+    parser.add_argument('--stages', default=','.join(STAGES), help=f"Comma-separated stages out of {STAGES}.")
+    parser.add_argument('--n', type=int, default=40, help="Items per benchmark, e.g. job descriptions.")
+    parser.add_argument('--repeat', type=int, default=5, help="Repeats of the per-page and per-file benchmarks.")
+    parser.add_argument('--workers', type=int, default=8, help="Threads for the concurrent benchmarks.")
+    parser.add_argument('--llm-latency', type=float, default=0.5, help="Mean fake LLM latency in seconds.")
+    parser.add_argument('--regen-mode', default='patch', choices=['full', 'patch'])
+    parser.add_argument('--scorer-backend', default='torch', choices=['torch', 'onnx'])
+    parser.add_argument('--browser', default='edge', choices=['edge', 'chrome'])
+    parser.add_argument('--output', help="Write the JSON report to this file instead of stdout.")
+    parser.add_argument('--compare', help="An earlier JSON report to print the changes against.")
+    parser.add_argument('--in-process', action='store_true', help="Run all stages in this process.")
+    argv = sys.argv[1:] if argv is None else argv
+    args = parser.parse_args(argv)
+
+    stages = [stage.strip() for stage in args.stages.split(',') if stage.strip()]
+    unknown = set(stages) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"Unknown stages: {', '.join(sorted(unknown))}")
+
+    # Relative paths in the modules (e.g. '../cache') assume src/ is the working directory
+    os.chdir(os.path.join(REPO_DIR, 'src'))
+    passthrough = [arg for option, value in vars(args).items()
+                   if option not in ('stages', 'output', 'compare', 'in_process') and value is not None
+                   for arg in (f"--{option.replace('_', '-')}", str(value))]
+
+    results = {}
+    for stage in stages:
+        if args.in_process or len(stages) == 1:
+            results.update(run_stage(stage, args))
+        else:
+            results.update(run_stage_isolated(stage, passthrough))
+
+    report = {
+        'meta': {
+            'revision': git_revision(),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'cpu_count': os.cpu_count(),
+            'args': {option: value for option, value in vars(args).items() if option not in ('output', 'compare')},
+        },
+        'results': results,
+    }
+
+    if args.compare:
+        with open(args.compare, 'r') as f:
+            compare(json.load(f), report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 
 import streamlit as st
 import sys
+import os
+import json
 import pandas as pd
 from io import StringIO
 
@@ -9,23 +11,24 @@ from io import StringIO
 sys.path.append('../src')
 sys.path.append('../scripts')
 
-# Import required modules (you may need to adjust these imports based on your project structure)
-from jobDescriptionScraper import LinkedInDescriptionScraper
-from jobListingScraper import LinkedInJobListingScraper
-from resumeRestructre import save_restructured_resume
-from pdfLoader import loadPdfContent
-from resumeRelevancyScore import RelevanceScorer
-from reGenerate import regen_resume
+# Project modules pull in selenium, sentence_transformers, openai and reportlab, so they
+# are imported inside the methods that use them; a rerun only pays for what it runs.
 
 class ResumeApp:
-    def __init__(self):
+    def __init__(self, regen_mode='patch'):
+        # 'patch' only rewrites the summary, skills and experience bullets; 'full' rewrites the whole resume
+        self.regen_mode = regen_mode
         self.jobs = None
         self.restructured_resume_path = None
         self.restructured_resume_json = None
+        self.state_store = None
+        self.scorer = None
 
     def upload_resume(self):
         uploaded_file = st.file_uploader("Choose your resume PDF", type="pdf")
         if uploaded_file is not None:
+            from resumeRestructre import save_restructured_resume
+
             with open("temp_resume.pdf", "wb") as f:
                 f.write(uploaded_file.getvalue())
             
@@ -40,26 +43,219 @@ class ResumeApp:
         num_jobs = st.number_input("Number of jobs to scrape:", min_value=1, max_value=20, value=5)
         username = st.text_input("LinkedIn username:")
         password = st.text_input("LinkedIn password:", type="password")
-        return job_title, location, num_jobs, username, password
+        incremental = st.checkbox("Only analyze jobs not seen on earlier runs", value=False)
+        top_k = st.number_input("Only tailor resumes for jobs among the top K stored matches (0 for all):",
+                                min_value=0, value=0)
+        return job_title, location, num_jobs, username, password, incremental, top_k
+
+    def get_state_store(self):
+        from pipelineState import PipelineStateStore
+
+        if self.state_store is None:
+            # The batch pipeline stores different outputs under the same stage names
+            self.state_store = PipelineStateStore(namespace='app')
+        return self.state_store
+
+    def get_scorer(self):
+        from resumeRelevancyScore import RelevanceScorer
+
+        if self.scorer is None:
+            self.scorer = RelevanceScorer()
+        return self.scorer
+
+    def run_stage(self, stage, keys, compute):
+        """
+        Fill in one stage's outputs, computing only those missing from the state store.
+
+        Args:
+            stage (str): The stage name.
+            keys (list of str): The state store key of every row.
+            compute (callable): Takes the indices of the missing rows and returns their
+                                outputs, with None or an exception for rows that failed.
+
+        Returns:
+            list: One output per row, None where the stage failed.
+        """
+        store = self.get_state_store()
+        values = store.get_many(stage, keys)
+        missing = [i for i, value in enumerate(values) if value is None]
+        if missing and compute is not None:
+            for i, value in zip(missing, compute(missing)):
+                if isinstance(value, Exception):
+                    store.record_failure(stage, keys[i], value)
+                    value = None
+                elif value is not None:
+                    store.record(stage, keys[i], value)
+                values[i] = value
+        return values
+
+    def drop_failed_rows(self, column, message):
+        failed = self.jobs[column].isna()
+        if failed.any():
+            st.warning(f"{message} for {failed.sum()} job(s): {', '.join(self.jobs.loc[failed, 'Job ID'].astype(str))}")
+            self.jobs = self.jobs[~failed].reset_index(drop=True)
+        return not self.jobs.empty
+
+    def fetch_descriptions(self, missing):
+        from jobDescriptionScraper import LinkedInDescriptionScraper
+        from httpDescriptionFetcher import LinkedInHttpDescriptionFetcher
+
+        job_ids = [self.jobs['Job ID'].iloc[i] for i in missing]
+        description_fetcher = LinkedInHttpDescriptionFetcher()
+        descriptions = description_fetcher.get_descriptions(job_ids, return_exceptions=True)
+        description_fetcher.close()
+
+        # Fall back to the browser scraper for postings the HTTP fetcher could not read
+        retry = [i for i, description in enumerate(descriptions) if not isinstance(description, str)]
+        if retry:
+            with LinkedInDescriptionScraper() as job_description_scraper:
+                retried = job_description_scraper.get_descriptions([job_ids[i] for i in retry],
+                                                                   return_exceptions=True)
+            for i, description in zip(retry, retried):
+                descriptions[i] = description if isinstance(description, str) else None
+        return descriptions
+
+    def keep_top_k(self, top_k):
+        """
+        Drop the jobs that do not rank among the top K of every stored job for the resume.
+
+        Args:
+            top_k (int): The number of best matching stored jobs to tailor resumes for.
+
+        Returns:
+            bool: True if any job is left.
+        """
+        from jobIndex import build_top_k_filter
+        from pdfLoader import loadPdfContent
+
+        top_k_filter = build_top_k_filter(self.get_scorer(), loadPdfContent(self.restructured_resume_path), top_k)
+        keep = [top_k_filter(job_id, score) for job_id, score in zip(self.jobs['Job ID'], self.jobs['Old Resume Score'])]
+        if not all(keep):
+            st.info(f"Skipping {len(keep) - sum(keep)} job(s) outside the top {top_k} stored matches")
+            self.jobs = self.jobs[keep].reset_index(drop=True)
+        return not self.jobs.empty
+
+    def analyze_jobs(self, compute=True, top_k=0):
+        """
+        Run every stage after scraping, reusing the outputs already in the state store.
+
+        Args:
+            compute (bool): Whether to compute missing outputs. If False, only stored
+                            results are loaded and jobs without them are dropped.
+            top_k (int): If positive, only regenerate resumes for jobs that rank among the
+                         top K of every stored job. Defaults to 0, which keeps every job.
+
+        Returns:
+            bool: True if at least one job has results to display.
+        """
+        from pipelineState import hash_resume
+
+        job_ids = self.jobs['Job ID'].astype(str).tolist()
+        resume_key = hash_resume(self.restructured_resume_json)
+
+        self.jobs['Job Descriptions'] = self.run_stage('describe', job_ids, self.fetch_descriptions if compute else None)
+        if not self.drop_failed_rows('Job Descriptions', "Could not fetch descriptions"):
+            return False
+
+        # Scores and regenerated resumes depend on the uploaded resume as well as the job
+        keys = [f"{job_id}:{resume_key}" for job_id in self.jobs['Job ID'].astype(str)]
+        descriptions = self.jobs['Job Descriptions'].tolist()
+
+        def old_scores(missing):
+            from pdfLoader import loadPdfContent
+
+            old_resume_content = loadPdfContent(self.restructured_resume_path)
+            return self.get_scorer().score_original_resume(old_resume_content, [descriptions[i] for i in missing])
+
+        def regenerate(missing):
+            from llmClient import summarize_usage
+            from reGenerate import regen_resumes_batch
+
+            usage_log = []
+            regen_results = regen_resumes_batch([(descriptions[i], self.jobs['Job ID'].iloc[i]) for i in missing],
+                                                self.restructured_resume_json, write_pdf=False, return_exceptions=True,
+                                                mode=self.regen_mode, usage_log=usage_log)
+            usage = summarize_usage(usage_log)
+            st.caption(f"LLM usage: {usage['prompt_tokens']} prompt tokens "
+                       f"({usage['prompt_cache_ratio']:.0%} prompt-cached), {usage['completion_tokens']} completion tokens")
+            return [result if isinstance(result, Exception) else result[0] for result in regen_results]
+
+        self.jobs['Old Resume Score'] = self.run_stage('score', keys, old_scores if compute else None)
+        if top_k and not self.keep_top_k(top_k):
+            return False
+        # Regenerated resumes also depend on the regeneration mode
+        keys = [f"{job_id}:{resume_key}:{self.regen_mode}" for job_id in self.jobs['Job ID'].astype(str)]
+        descriptions = self.jobs['Job Descriptions'].tolist()
+        self.jobs['ReGen JSON'] = self.run_stage('regenerate', keys, regenerate if compute else None)
+        if not self.drop_failed_rows('ReGen JSON', "Could not regenerate the resume"):
+            return False
+
+        # Score the regenerated JSON directly; the PDFs are only needed for download
+        keys = [f"{job_id}:{resume_key}:{self.regen_mode}" for job_id in self.jobs['Job ID'].astype(str)]
+        regen_jsons = self.jobs['ReGen JSON'].tolist()
+        descriptions = self.jobs['Job Descriptions'].tolist()
+
+        def new_scores(missing):
+            return self.get_scorer().score_pairs([regen_jsons[i] for i in missing], [descriptions[i] for i in missing])
+
+        def render(missing):
+            from resumeGenerator import render_resumes_batch
+
+            return render_resumes_batch([(regen_jsons[i], self.jobs['Job ID'].iloc[i]) for i in missing],
+                                        return_exceptions=True)
+
+        self.jobs['New Resume Score'] = self.run_stage('rescore', keys, new_scores if compute else None)
+        file_paths = self.run_stage('render', keys, render if compute else None)
+        # Re-render tailored resumes whose files were removed since they were stored
+        stale = [i for i, path in enumerate(file_paths) if path is not None and not os.path.exists(path)]
+        if stale and compute:
+            for i, path in zip(stale, render(stale)):
+                file_paths[i] = None if isinstance(path, Exception) else path
+        self.jobs['ReGen FilePath'] = file_paths
+        return self.drop_failed_rows('New Resume Score', "No stored score")
+
+    def store_results(self, job_title, location):
+        from jobStore import JobStore, search_key
+
+        # Keep descriptions, scores and regenerated resumes next to the scraped listings
+        JobStore().append(self.jobs, search_key(job_title, location))
 
-    def scrape_and_analyze_jobs(self, job_title, location, num_jobs, username, password):
-        job_listing_scraper = LinkedInJobListingScraper()
-        self.jobs = job_listing_scraper.scrape_linkedin_jobs(job_title, location, num_jobs, username, password)
+    def scrape_and_analyze_jobs(self, job_title, location, num_jobs, username, password, incremental=False, top_k=0):
+        from jobListingScraper import LinkedInJobListingScraper
 
-        job_description_scraper = LinkedInDescriptionScraper()
-        self.jobs['Job Descriptions'] = self.jobs['Job ID'].apply(lambda x: job_description_scraper.getDescription(job_id=x))
+        with LinkedInJobListingScraper() as job_listing_scraper:
+            # New listings are only marked as seen once they were analyzed successfully
+            self.jobs = job_listing_scraper.scrape_linkedin_jobs(job_title, location, num_jobs, username, password,
+                                                                 incremental=incremental, mark_seen=False)
+        if self.jobs.empty:
+            st.info("No new or changed jobs since the last run.")
+            return False
 
-        old_resume_content = loadPdfContent(self.restructured_resume_path)
-        resume_relevance_scorer = RelevanceScorer()
-        self.jobs['Old Resume Score'] = self.jobs['Job Descriptions'].apply(lambda x: resume_relevance_scorer.calculate_relevance_score(old_resume_content, x))
+        # Remember the listing so the results can be reloaded without scraping again
+        self.get_state_store().record('search', f"{job_title}|{location}", json.loads(self.jobs.to_json(orient='records')))
+        if not self.analyze_jobs(top_k=top_k):
+            return False
+        self.store_results(job_title, location)
+        if incremental:
+            from seenJobsIndex import SeenJobsIndex
+            SeenJobsIndex().update(self.jobs)
+        return True
 
-        self.jobs[['ReGen JSON', 'ReGen FilePath']] = self.jobs.apply(self.apply_regen_resume, axis=1)
+    def load_previous_results(self, job_title, location, top_k=0):
+        listings = self.get_state_store().get('search', f"{job_title}|{location}")
+        if not listings:
+            return False
+        self.jobs = pd.DataFrame(listings).astype({'Job ID': str})
+        return self.analyze_jobs(compute=False, top_k=top_k)
 
-        self.jobs['New Resume Score'] = self.jobs[['Job Descriptions', 'Job ID']].apply(lambda x: resume_relevance_scorer.calculate_relevance_score_new(x[1], x[0]), axis=1)
+    def get_resume_pdf(self, row):
+        from resumeGenerator import generate_resume_from_json
 
-    def apply_regen_resume(self, row):
-        regen_json, output_filepath = regen_resume(row['Job Descriptions'], self.restructured_resume_json, row['Job ID'])
-        return pd.Series({'ReGen JSON': regen_json, 'ReGen FilePath': output_filepath})
+        if isinstance(row['ReGen FilePath'], str) and os.path.exists(row['ReGen FilePath']):
+            with open(row['ReGen FilePath'], "rb") as f:
+                return f.read()
+        # Render in memory when the file is missing rather than failing the download
+        return generate_resume_from_json(row['ReGen JSON'], row['Job ID'], return_bytes=True)
 
     def display_results(self):
         st.subheader("Job Analysis Results")
@@ -74,7 +270,7 @@ class ResumeApp:
             if st.button(f"Download Tailored Resume for {row['Job Title']}"):
                 st.download_button(
                     label="Download PDF",
-                    data=open(row['ReGen FilePath'], "rb").read(),
+                    data=self.get_resume_pdf(row),
                     file_name=f"tailored_resume_{row['Job ID']}.pdf",
                     mime="application/pdf"
                 )
@@ -86,14 +282,22 @@ class ResumeApp:
 def main():
     st.title("Resume Tailoring and Job Application System")
 
-    app = ResumeApp()
+    regen_mode = st.selectbox("Tailoring mode:", ['patch', 'full'],
+                              format_func=lambda mode: {'patch': "Rewrite summary, skills and experience bullets",
+                                                        'full': "Rewrite the whole resume"}[mode])
+    app = ResumeApp(regen_mode)
 
     if app.upload_resume():
-        job_title, location, num_jobs, username, password = app.get_job_search_params()
+        job_title, location, num_jobs, username, password, incremental, top_k = app.get_job_search_params()
 
         if st.button("Search and Analyze Jobs"):
-            app.scrape_and_analyze_jobs(job_title, location, num_jobs, username, password)
-            app.display_results()
+            if app.scrape_and_analyze_jobs(job_title, location, num_jobs, username, password, incremental, top_k):
+                app.display_results()
+        elif st.button("Load Previous Results"):
+            if app.load_previous_results(job_title, location, top_k):
+                app.display_results()
+            else:
+                st.info("No stored results for this search yet.")
     else:
         st.warning("Please upload a resume to get started.")
 
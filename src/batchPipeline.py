@@ -0,0 +1,390 @@
+"""
+Batch Pipeline Module.
+
+This module runs the full ReGen pipeline (scrape, describe, score, regenerate, render)
+from the command line over many job titles and locations listed in a config file.
+Stages run concurrently as a streaming pipeline connected by bounded queues, so
+description fetching, LLM calls and PDF rendering overlap instead of each finishing
+over the whole job list before the next starts. Every stage records its output per
+job in the pipeline state store, so an interrupted run resumes where it stopped.
+
+Usage:
+    python batchPipeline.py --config ../inputs/pipeline_config.json
+"""
+
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+from datetime import date
+
+import pandas as pd
+
+from jobStore import JobStore, search_key
+from llmClient import set_backend, summarize_usage
+from pipelineState import PipelineStateStore, hash_resume
+from seenJobsIndex import SeenJobsIndex
+
+DEFAULT_CONFIG = {
+    'searches': [],
+    'resume_pdf': None,
+    'resume_json': None,
+    'username': None,
+    'password': None,
+    'incremental': False,
+    'min_score': None,
+    'top_k': None,
+    'index_backend': 'exact',
+    'queue_size': 16,
+    'workers': {'describe': 8, 'score': 1, 'regenerate': 4, 'render': 2},
+    'requests_per_minute': 60,
+    'regen_mode': 'patch',
+    'max_job_tokens': 1500,
+    'llm_backend': None,
+    'state_path': '../cache/pipeline_state.sqlite',
+    'output_path': '../data/Pipeline Results.csv',
+    'job_store_path': '../data/jobs',
+    'job_index_path': '../cache/job_index',
+}
+
+_DONE = object()
+
+
+def load_config(config_path):
+    """
+    Load a pipeline config from a JSON or YAML file, filling in defaults.
+
+    Args:
+        config_path (str): The path of the config file; '.yaml' and '.yml' files are
+                           parsed as YAML, anything else as JSON.
+
+    Returns:
+        dict: The config with every key of DEFAULT_CONFIG present.
+    """
+    with open(config_path, 'r') as f:
+        if config_path.endswith(('.yaml', '.yml')):
+            import yaml
+            user_config = yaml.safe_load(f) or {}
+        else:
+            user_config = json.load(f)
+
+    config = dict(DEFAULT_CONFIG)
+    config.update(user_config)
+    config['workers'] = {**DEFAULT_CONFIG['workers'], **user_config.get('workers', {})}
+    config['username'] = config['username'] or os.environ.get('LINKEDIN_USERNAME')
+    config['password'] = config['password'] or os.environ.get('LINKEDIN_PASSWORD')
+    return config
+
+
+class Stage:
+    """
+    A pipeline stage that transforms jobs on a pool of worker threads.
+
+    Attributes:
+        name (str): The stage name, also used in the state store.
+        func (callable): Takes a job dict and returns a dict of new fields, or None to
+                         drop the job from the rest of the pipeline.
+        workers (int): The number of worker threads.
+        depends_on_resume (bool): Whether the output changes with the base resume, in
+                                  which case it is stored per resume.
+    """
+
+    def __init__(self, name, func, workers=1, depends_on_resume=False):
+        """
+        Initialize the Stage.
+
+        Args:
+            name (str): The stage name, also used in the state store.
+            func (callable): Takes a job dict and returns a dict of new fields, or None to drop it.
+            workers (int): The number of worker threads. Defaults to 1.
+            depends_on_resume (bool): Whether the output changes with the base resume.
+                                      Defaults to False.
+        """
+        self.name = name
+        self.func = func
+        self.workers = max(1, workers)
+        self.depends_on_resume = depends_on_resume
+
+
+def run_stages(jobs, stages, store, queue_size=16, resume_key=''):
+    """
+    Stream jobs through stages connected by bounded queues.
+
+    Every stage runs on its own worker threads, so a job can be rendered while later
+    jobs are still being described or regenerated. A full queue blocks its producer,
+    which keeps memory bounded however many jobs are in flight.
+
+    Args:
+        jobs (iterable of dict): The scraped jobs, each with a 'Job ID'.
+        stages (list of Stage): The stages, in order.
+        store (PipelineStateStore): Where stage outputs are recorded and replayed from.
+        queue_size (int): The capacity of each queue between stages. Defaults to 16.
+        resume_key (str): The fingerprint of the base resume, added to the keys of
+                          resume-dependent stages. Defaults to ''.
+
+    Returns:
+        tuple: A tuple containing:
+            - list of dict: The jobs that passed every stage, in input order.
+            - dict: The error message of every job that failed, keyed by job ID.
+    """
+    queues = [queue.Queue(maxsize=queue_size) for _ in range(len(stages) + 1)]
+    failures = {}
+    remaining = [stage.workers for stage in stages]
+    counter_lock = threading.Lock()
+
+    def worker(position, stage):
+        inbox, outbox = queues[position], queues[position + 1]
+        next_workers = stages[position + 1].workers if position + 1 < len(stages) else 1
+        while True:
+            job = inbox.get()
+            if job is _DONE:
+                break
+            job_id = str(job['Job ID'])
+            key = f"{job_id}:{resume_key}" if stage.depends_on_resume else job_id
+            try:
+                output = store.get(stage.name, key)
+                if output is None:
+                    output = stage.func(job)
+                    if output is None:
+                        store.record_skipped(stage.name, key)
+                    else:
+                        store.record(stage.name, key, output)
+                if output is False or output is None:
+                    continue
+                outbox.put({**job, **output})
+            except Exception as error:
+                store.record_failure(stage.name, key, error)
+                with counter_lock:
+                    failures[job_id] = f"{stage.name}: {error}"
+
+        # The last worker of a stage tells every worker of the next stage to stop
+        with counter_lock:
+            remaining[position] -= 1
+            last = remaining[position] == 0
+        if last:
+            for _ in range(next_workers):
+                outbox.put(_DONE)
+
+    threads = [threading.Thread(target=worker, args=(position, stage), daemon=True)
+               for position, stage in enumerate(stages) for _ in range(stage.workers)]
+    for thread in threads:
+        thread.start()
+
+    results = []
+
+    def collect():
+        while True:
+            job = queues[-1].get()
+            if job is _DONE:
+                return
+            results.append(job)
+
+    collector = threading.Thread(target=collect, daemon=True)
+    collector.start()
+
+    order = {}
+    try:
+        for job in jobs:
+            order.setdefault(str(job['Job ID']), len(order))
+            queues[0].put(job)
+    finally:
+        # Let the stages drain even if scraping failed part way
+        for _ in range(stages[0].workers):
+            queues[0].put(_DONE)
+
+    collector.join()
+    results.sort(key=lambda job: order[str(job['Job ID'])])
+    return results, failures
+
+
+def scrape_jobs(config, store):
+    """
+    Scrape the listings of every configured search, replaying searches already scraped.
+
+    Args:
+        config (dict): The pipeline config.
+        store (PipelineStateStore): Where scraped listings are recorded and replayed from.
+
+    Yields:
+        dict: One job listing at a time, each job ID at most once.
+    """
+    seen = set()
+    scraper = None
+    try:
+        for search in config['searches']:
+            # Listings change daily, so a stored scrape is only replayed on the same day
+            key = f"{search['job_title']}|{search.get('location', '')}|{date.today().isoformat()}"
+            listings = store.get('scrape', key)
+            if listings is None:
+                if scraper is None:
+                    from jobListingScraper import LinkedInJobListingScraper
+                    scraper = LinkedInJobListingScraper()
+                jobs = scraper.scrape_linkedin_jobs(search['job_title'], search.get('location', ''),
+                                                    search.get('num_jobs', 25), config['username'],
+                                                    config['password'], incremental=config['incremental'],
+                                                    mark_seen=False)
+                listings = json.loads(jobs.to_json(orient='records'))
+                store.record('scrape', key, listings)
+            for job in listings:
+                if str(job['Job ID']) not in seen:
+                    seen.add(str(job['Job ID']))
+                    yield {**job, 'Search': search_key(search['job_title'], search.get('location', ''))}
+    finally:
+        if scraper is not None:
+            scraper.close()
+
+
+def load_resume(config):
+    """
+    Load the base resume JSON, restructuring the resume PDF if no JSON is configured.
+
+    Args:
+        config (dict): The pipeline config.
+
+    Returns:
+        dict: The resume as a Python dictionary.
+    """
+    if config['resume_json']:
+        with open(config['resume_json'], 'r') as f:
+            return json.load(f)
+    from resumeRestructre import restructure_old_resume
+    return restructure_old_resume(config['resume_pdf'])
+
+
+def build_stages(config, resume_json, render_executor=None, usage_log=None):
+    """
+    Build the describe, score, regenerate and render stages.
+
+    Args:
+        config (dict): The pipeline config.
+        resume_json (dict): The base resume.
+        render_executor (ProcessPoolExecutor): The process pool PDFs are rendered on.
+                                               Defaults to rendering on the stage threads.
+        usage_log (list): If given, the TokenUsage of every LLM request is appended to it.
+
+    Returns:
+        list of Stage: The stages, in order.
+    """
+    from httpDescriptionFetcher import LinkedInHttpDescriptionFetcher
+    from rateLimiter import TokenBucket
+    from reGenerate import regen_resume_json
+    from resumeGenerator import render_resume_text, render_resumes_batch
+    from resumeRelevancyScore import RelevanceScorer
+
+    workers = config['workers']
+    fetcher = LinkedInHttpDescriptionFetcher(max_workers=workers['describe'])
+    scorer = RelevanceScorer()
+    resume_text = render_resume_text(resume_json)
+    rate_limiter = TokenBucket.per_minute(config['requests_per_minute']) if config['requests_per_minute'] else None
+    min_score = config['min_score']
+    top_k_filter = None
+    if config['top_k']:
+        from jobIndex import build_top_k_filter
+        top_k_filter = build_top_k_filter(scorer, resume_text, config['top_k'], JobStore(config['job_store_path']),
+                                          config['job_index_path'], config['index_backend'])
+
+    def describe(job):
+        description = fetcher.get_description(job['Job ID'])
+        if not description:
+            # Raised rather than dropped so a rerun tries the posting again
+            raise ValueError("no description found")
+        return {'Job Descriptions': description}
+
+    def score(job):
+        old_score = scorer.score_original_resume(resume_text, [job['Job Descriptions']])[0]
+        # Jobs below the threshold are not worth an LLM call
+        if min_score is not None and old_score < min_score:
+            return None
+        if top_k_filter is not None and not top_k_filter(job['Job ID'], old_score):
+            return None
+        return {'Old Resume Score': old_score}
+
+    def regenerate(job):
+        regen_json = regen_resume_json(job['Job Descriptions'], resume_json, rate_limiter=rate_limiter,
+                                       mode=config['regen_mode'], max_job_tokens=config['max_job_tokens'],
+                                       usage_log=usage_log)
+        new_score = scorer.score_pairs([regen_json], [job['Job Descriptions']])[0]
+        return {'ReGen JSON': regen_json, 'New Resume Score': new_score}
+
+    def render(job):
+        file_path = render_resumes_batch([(job['ReGen JSON'], job['Job ID'])], executor=render_executor)[0]
+        return {'ReGen FilePath': file_path}
+
+    return [
+        Stage('describe', describe, workers['describe']),
+        Stage('score', score, workers['score'], depends_on_resume=True),
+        Stage('regenerate', regenerate, workers['regenerate'], depends_on_resume=True),
+        Stage('render', render, workers['render'], depends_on_resume=True),
+    ]
+
+
+def run_pipeline(config):
+    """
+    Run the full pipeline for a config and write the results to a CSV file.
+
+    Args:
+        config (dict): The pipeline config, as returned by load_config.
+
+    Returns:
+        pd.DataFrame: One row per job that made it through every stage.
+    """
+    if config['llm_backend']:
+        # e.g. {"name": "local", "base_url": "http://localhost:8000/v1"} or {"name": "fake", "latency": 0.5}
+        from llmBackends import create_backend
+        set_backend(create_backend(**config['llm_backend']))
+
+    from resumeGenerator import create_render_executor
+
+    store = PipelineStateStore(config['state_path'], namespace='batch')
+    resume_json = load_resume(config)
+    usage_log = []
+    # Rendering is CPU-bound, so render threads hand PDFs to worker processes
+    with create_render_executor(config['workers']['render']) as render_executor:
+        stages = build_stages(config, resume_json, render_executor, usage_log)
+        results, failures = run_stages(scrape_jobs(config, store), stages, store, config['queue_size'],
+                                       resume_key=hash_resume(resume_json))
+    for job_id, error in failures.items():
+        print(f"Job {job_id} failed at {error}")
+
+    results_df = pd.DataFrame(results)
+    job_store = JobStore(config['job_store_path'])
+    for search, search_results in results_df.groupby('Search') if results else []:
+        job_store.append(search_results, search)
+    if config['incremental'] and results:
+        # Only jobs that made it through every stage are skipped on the next crawl
+        SeenJobsIndex().update(results_df)
+    if 'ReGen JSON' in results_df.columns:
+        results_df['ReGen JSON'] = results_df['ReGen JSON'].apply(json.dumps)
+    if os.path.dirname(config['output_path']):
+        os.makedirs(os.path.dirname(config['output_path']), exist_ok=True)
+    results_df.to_csv(config['output_path'], index=False)
+    print(f"Processed {len(results)} job(s), {len(failures)} failed. Results written to {config['output_path']}")
+    usage = summarize_usage(usage_log)
+    print(f"LLM requests: {usage['requests']} ({usage['completion_cache_hits']} from cache), "
+          f"prompt tokens: {usage['prompt_tokens']} ({usage['prompt_cache_ratio']:.0%} prompt-cached), "
+          f"completion tokens: {usage['completion_tokens']}")
+    return results_df
+
+
+def main(argv=None):
+    """
+    Command-line entry point.
+
+    Args:
+        argv (list of str): The command-line arguments. Defaults to sys.argv[1:].
+    """
+    parser = argparse.ArgumentParser(description="Run the ReGen scrape, score, regenerate and render pipeline.")
+    parser.add_argument('--config', required=True, help="Path of the JSON or YAML pipeline config.")
+    parser.add_argument('--fresh', action='store_true', help="Forget the stored state of earlier runs.")
+    args = parser.parse_args(argv)
+
+    config = load_config(args.config)
+    if args.fresh:
+        PipelineStateStore(config['state_path'], namespace='batch').clear()
+    run_pipeline(config)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,265 @@
+"""
+Browser Pool Module.
+
+This module provides a shared pool of Selenium WebDriver instances for the LinkedIn
+scrapers. Browsers are started lazily, health-checked before reuse and kept alive
+between scraper instances, so repeated scrapes in one process (including Streamlit
+reruns) skip driver installation and browser startup.
+"""
+
+import atexit
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+
+_driver_paths = {}
+_driver_paths_lock = threading.Lock()
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+# Seconds acquire waits for a free browser before giving up, so a leaked browser cannot hang a scrape
+DEFAULT_ACQUIRE_TIMEOUT = 300
+
+
+def get_driver_path(browser='edge'):
+    """
+    Get the WebDriver binary path for a browser, resolving it only once per process.
+
+    Args:
+        browser (str): Either 'edge' or 'chrome'. Defaults to 'edge'.
+
+    Returns:
+        str: The path of the driver binary, or None to let Selenium Manager locate it.
+    """
+    with _driver_paths_lock:
+        if browser not in _driver_paths:
+            env_path = os.environ.get(f'REGEN_{browser.upper()}DRIVER_PATH')
+            if env_path:
+                _driver_paths[browser] = env_path
+            elif browser == 'edge':
+                from webdriver_manager.microsoft import EdgeChromiumDriverManager
+                _driver_paths[browser] = EdgeChromiumDriverManager().install()
+            else:
+                _driver_paths[browser] = None
+        return _driver_paths[browser]
+
+
+def create_driver(browser='edge', headless=True):
+    """
+    Start a new WebDriver instance.
+
+    Args:
+        browser (str): Either 'edge' or 'chrome'. Defaults to 'edge'.
+        headless (bool): Whether to run the browser without a window. Defaults to True.
+
+    Returns:
+        webdriver: The started WebDriver instance.
+    """
+    if browser == 'edge':
+        from selenium.webdriver.edge.options import Options
+        from selenium.webdriver.edge.service import Service
+        options = Options()
+        options.use_chromium = True
+        driver_class = webdriver.Edge
+    elif browser == 'chrome':
+        from selenium.webdriver.chrome.options import Options
+        from selenium.webdriver.chrome.service import Service
+        options = Options()
+        driver_class = webdriver.Chrome
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+
+    if headless:
+        options.add_argument("--headless")
+
+    service = Service(executable_path=get_driver_path(browser))
+    driver = driver_class(service=service, options=options)
+    driver.maximize_window()
+    return driver
+
+
+def is_driver_healthy(driver):
+    """
+    Check whether a WebDriver session is still usable.
+
+    Args:
+        driver (webdriver): The WebDriver instance to check.
+
+    Returns:
+        bool: True if the browser responds to a command, False otherwise.
+    """
+    try:
+        driver.execute_script("return 1")
+        return True
+    except WebDriverException:
+        return False
+
+
+class BrowserPool:
+    """
+    A thread-safe pool of reusable WebDriver instances.
+
+    Every browser is tagged with the account it was acquired for, and is only handed
+    out again for that account, so a browser signed in to one LinkedIn account is never
+    reused by a scrape for another.
+
+    Attributes:
+        browser (str): The browser the pool starts, either 'edge' or 'chrome'.
+        headless (bool): Whether pooled browsers run without a window.
+        max_size (int): The maximum number of browsers alive at once.
+    """
+
+    def __init__(self, browser='edge', headless=True, max_size=4):
+        """
+        Initialize the BrowserPool. No browser is started until the first acquire.
+
+        Args:
+            browser (str): Either 'edge' or 'chrome'. Defaults to 'edge'.
+            headless (bool): Whether to run browsers without a window. Defaults to True.
+            max_size (int): The maximum number of browsers alive at once. Defaults to 4.
+        """
+        self.browser = browser
+        self.headless = headless
+        self.max_size = max_size
+        self._idle = []
+        self._accounts = {}
+        self._size = 0
+        self._condition = threading.Condition()
+
+    def acquire(self, timeout=DEFAULT_ACQUIRE_TIMEOUT, account=None):
+        """
+        Take a healthy browser from the pool, starting one if none is idle.
+
+        When the pool is full and only browsers of other accounts are idle, one of them
+        is quit to make room.
+
+        Args:
+            timeout (float): Seconds to wait when the pool is exhausted, or None to wait
+                             forever. Defaults to DEFAULT_ACQUIRE_TIMEOUT.
+            account (str): The account the browser will be signed in to, or None for an
+                           anonymous browser. Defaults to None.
+
+        Returns:
+            webdriver: A WebDriver instance reserved for the caller.
+
+        Raises:
+            TimeoutError: If no browser became available within the timeout.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            while True:
+                for driver in reversed([d for d in self._idle if self._accounts.get(id(d)) == account]):
+                    self._idle.remove(driver)
+                    if is_driver_healthy(driver):
+                        return driver
+                    self._discard(driver)
+                if self._size >= self.max_size and self._idle:
+                    # Make room by quitting the least recently used browser of another account
+                    self._discard(self._idle.pop(0))
+                if self._size < self.max_size:
+                    self._size += 1
+                    break
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("No browser became available in the pool")
+                self._condition.wait(remaining)
+
+        try:
+            driver = create_driver(self.browser, self.headless)
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        with self._condition:
+            self._accounts[id(driver)] = account
+        return driver
+
+    def release(self, driver):
+        """
+        Return a browser to the pool, quitting it if it is no longer healthy.
+
+        Args:
+            driver (webdriver): A WebDriver instance obtained from acquire.
+        """
+        with self._condition:
+            if is_driver_healthy(driver):
+                self._idle.append(driver)
+            else:
+                self._discard(driver)
+            self._condition.notify()
+
+    @contextmanager
+    def driver(self, timeout=DEFAULT_ACQUIRE_TIMEOUT, account=None):
+        """
+        Context manager that acquires a browser and releases it on exit.
+
+        Args:
+            timeout (float): Seconds to wait when the pool is exhausted, or None to wait
+                             forever. Defaults to DEFAULT_ACQUIRE_TIMEOUT.
+            account (str): The account the browser will be signed in to. Defaults to None.
+
+        Yields:
+            webdriver: A WebDriver instance reserved for the caller.
+        """
+        driver = self.acquire(timeout, account)
+        try:
+            yield driver
+        finally:
+            self.release(driver)
+
+    def _discard(self, driver):
+        self._size -= 1
+        self._accounts.pop(id(driver), None)
+        try:
+            driver.quit()
+        except WebDriverException:
+            pass
+
+    def close(self):
+        """
+        Quit every idle browser in the pool.
+        """
+        with self._condition:
+            while self._idle:
+                self._discard(self._idle.pop())
+            self._condition.notify_all()
+
+
+def get_browser_pool(browser='edge', headless=True, max_size=4):
+    """
+    Get the process-wide pool for a browser configuration, creating it on first use.
+
+    Pools live at module level, so they survive Streamlit reruns and are shared by every
+    scraper instance in the process.
+
+    Args:
+        browser (str): Either 'edge' or 'chrome'. Defaults to 'edge'.
+        headless (bool): Whether to run browsers without a window. Defaults to True.
+        max_size (int): The maximum pool size used when the pool is created. Defaults to 4.
+
+    Returns:
+        BrowserPool: The shared pool.
+    """
+    key = (browser, headless)
+    with _pools_lock:
+        if key not in _pools:
+            _pools[key] = BrowserPool(browser, headless, max_size)
+        return _pools[key]
+
+
+def close_all_pools():
+    """
+    Quit the idle browsers of every shared pool.
+    """
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+
+
+atexit.register(close_all_pools)
@@ -0,0 +1,151 @@
+"""
+Completion Cache Module.
+
+This module provides a pluggable cache for LLM completions keyed by model plus a hash
+of the request, so sending the same prompt twice returns the stored response instead
+of paying for another API call.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+
+
+def make_cache_key(model, messages, namespace=None, **kwargs):
+    """
+    Build the cache key for a completion request.
+
+    Args:
+        model (str): The model the request is sent to.
+        messages (list of dict): The chat messages of the request.
+        namespace (str): Identifies the client or server the request is sent to, so the
+                         same request to different endpoints gets different keys.
+                         Defaults to None.
+        **kwargs: Any other request parameters that affect the response.
+
+    Returns:
+        str: The hex SHA-256 digest of the canonical JSON form of the request.
+    """
+    request = {'model': model, 'messages': messages, 'params': kwargs}
+    if namespace is not None:
+        request['namespace'] = namespace
+    payload = json.dumps(request, sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class CompletionCache(ABC):
+    """
+    Base class for completion cache backends.
+
+    Backends store completion text by key and return None for missing or expired keys.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """
+        Look up a cached completion.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+
+        Returns:
+            str: The cached completion text, or None if it is missing or expired.
+        """
+
+    @abstractmethod
+    def set(self, key, value):
+        """
+        Store a completion.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+            value (str): The completion text.
+        """
+
+    @abstractmethod
+    def delete(self, key):
+        """
+        Remove a cached completion, if present.
+
+        Args:
+            key (str): The cache key built by make_cache_key.
+        """
+
+
+class SQLiteCompletionCache(CompletionCache):
+    """
+    A completion cache stored in a local SQLite database.
+
+    Entries expire after a time-to-live, and once the cache holds more than
+    max_entries rows the least recently used ones are evicted.
+
+    Attributes:
+        db_path (str): The path of the SQLite database file.
+        ttl (float): The lifetime of an entry in seconds, or None for no expiry.
+        max_entries (int): The maximum number of cached completions.
+    """
+
+    def __init__(self, db_path='../cache/completions.sqlite', ttl=30 * 24 * 3600, max_entries=10000):
+        """
+        Initialize the SQLiteCompletionCache.
+
+        Args:
+            db_path (str): The path of the SQLite database file. Defaults to '../cache/completions.sqlite'.
+            ttl (float): The lifetime of an entry in seconds, or None for no expiry. Defaults to 30 days.
+            max_entries (int): The maximum number of cached completions. Defaults to 10000.
+        """
+        self.db_path = db_path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS completions ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+                "created_at REAL NOT NULL, last_used REAL NOT NULL)"
+            )
+
+    def get(self, key):
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT value, created_at FROM completions WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+
+            value, created_at = row
+            with self._connection:
+                if self.ttl is not None and now - created_at > self.ttl:
+                    self._connection.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    return None
+                self._connection.execute("UPDATE completions SET last_used = ? WHERE key = ?", (now, key))
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO completions (key, value, created_at, last_used) VALUES (?, ?, ?, ?)",
+                (key, value, now, now)
+            )
+            if self.ttl is not None:
+                self._connection.execute("DELETE FROM completions WHERE created_at < ?", (now - self.ttl,))
+            # Evict least recently used entries beyond the size cap
+            self._connection.execute(
+                "DELETE FROM completions WHERE key IN ("
+                "SELECT key FROM completions ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,)
+            )
+
+    def delete(self, key):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM completions WHERE key = ?", (key,))
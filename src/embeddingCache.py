@@ -0,0 +1,265 @@
+"""
+Persistent Embedding Cache Module.
+
+This module provides an on-disk, content-addressed store for sentence embeddings.
+Embeddings are kept in one memory-mapped NumPy matrix per model, next to a small
+JSON index mapping text hashes to matrix rows, so texts that were already embedded
+on a previous run become lookups instead of model passes.
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import weakref
+
+import numpy as np
+
+
+def hash_text(text):
+    """
+    Compute the content hash used as the cache key for a text.
+
+    Args:
+        text (str): The text to hash.
+
+    Returns:
+        str: The hex SHA-256 digest of the UTF-8 encoded text.
+    """
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    A class to store and look up embeddings on disk, keyed by model name and text hash.
+
+    Each model gets its own '{model}.npy' matrix, opened as a memory map, and a
+    '{model}.index.json' file recording the row and last access time of every cached
+    text. When a model's store is full, the least recently used rows are evicted and
+    reused. The index on disk only ever names rows whose embedding has been flushed:
+    evicted entries are removed from it before their rows are overwritten, and new
+    entries are added after. Access times updated by lookups are written back at most
+    every flush_interval seconds, on flush or close, and when the process exits.
+
+    Attributes:
+        cache_dir (str): The directory holding the matrices and index files.
+        max_entries (int): The maximum number of embeddings kept per model.
+        flush_interval (float): The minimum number of seconds between index writes
+                                caused by lookups alone.
+    """
+
+    def __init__(self, cache_dir='../cache/embeddings', max_entries=50000, flush_interval=30):
+        """
+        Initialize the EmbeddingCache.
+
+        Args:
+            cache_dir (str): The directory to store the cache in. Defaults to '../cache/embeddings'.
+            max_entries (int): The maximum number of embeddings kept per model before
+                               least recently used entries are evicted. Defaults to 50000.
+            flush_interval (float): The minimum number of seconds between index writes
+                                    caused by lookups alone. Defaults to 30.
+        """
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.flush_interval = flush_interval
+        self._stores = {}
+        self._lock = threading.Lock()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        # Save pending access times at exit without keeping the cache alive
+        atexit.register(_flush_at_exit, weakref.ref(self))
+
+    def _paths(self, model_name):
+        safe_name = re.sub(r'[^A-Za-z0-9_.-]', '_', model_name)
+        base = os.path.join(self.cache_dir, safe_name)
+        return base + '.npy', base + '.index.json'
+
+    def _load_store(self, model_name):
+        if model_name in self._stores:
+            return self._stores[model_name]
+
+        matrix_path, index_path = self._paths(model_name)
+        store = {'matrix': None, 'index': {}, 'dirty': False, 'saved_at': time.time()}
+        if os.path.exists(matrix_path) and os.path.exists(index_path):
+            try:
+                with open(index_path, 'r') as f:
+                    store['index'] = json.load(f)
+                store['matrix'] = np.load(matrix_path, mmap_mode='r+')
+            except (OSError, ValueError):
+                # A corrupt store is treated as empty and rebuilt on the next write
+                store = {'matrix': None, 'index': {}, 'dirty': False, 'saved_at': time.time()}
+
+        self._stores[model_name] = store
+        return store
+
+    def _save_index(self, model_name, store):
+        _, index_path = self._paths(model_name)
+        temp_path = index_path + '.tmp'
+        with open(temp_path, 'w') as f:
+            json.dump(store['index'], f)
+        os.replace(temp_path, index_path)
+        store['dirty'] = False
+        store['saved_at'] = time.time()
+
+    def _allocate_rows(self, model_name, store, count, dim):
+        """
+        Reserve matrix rows for new entries, growing the matrix or evicting as needed.
+        """
+        matrix_path, _ = self._paths(model_name)
+        matrix = store['matrix']
+        index = store['index']
+
+        released = False
+        if matrix is not None and matrix.shape[1] != dim:
+            # The model changed its output size; start the store over
+            matrix, index = None, {}
+            store['index'] = index
+            released = True
+
+        # Evict least recently used entries so the new ones fit
+        overflow = len(index) + count - self.max_entries
+        if overflow > 0:
+            oldest = sorted(index, key=lambda key: index[key]['last_used'])[:overflow]
+            for key in oldest:
+                del index[key]
+            released = True
+
+        if released:
+            # Drop released rows from the index on disk before they are overwritten, so a
+            # crash in between can never map a text to another text's embedding
+            self._save_index(model_name, store)
+
+        capacity = 0 if matrix is None else matrix.shape[0]
+        needed = min(len(index) + count, self.max_entries)
+        if needed > capacity:
+            new_capacity = min(max(needed, capacity * 2, 64), self.max_entries)
+            new_matrix = np.lib.format.open_memmap(matrix_path + '.tmp', mode='w+',
+                                                   dtype=np.float32, shape=(new_capacity, dim))
+            if matrix is not None:
+                new_matrix[:capacity] = matrix[:capacity]
+            new_matrix.flush()
+            del new_matrix
+            matrix = None
+            store['matrix'] = None
+            os.replace(matrix_path + '.tmp', matrix_path)
+            matrix = np.load(matrix_path, mmap_mode='r+')
+            store['matrix'] = matrix
+            capacity = new_capacity
+
+        used_rows = {entry['row'] for entry in index.values()}
+        free_rows = [row for row in range(capacity) if row not in used_rows]
+        return free_rows[:count]
+
+    def get_many(self, model_name, texts):
+        """
+        Look up cached embeddings for a list of texts.
+
+        Args:
+            model_name (str): The name of the model that produced the embeddings.
+            texts (list of str): The texts to look up.
+
+        Returns:
+            list: One entry per text, either a NumPy array or None if the text is not cached.
+        """
+        with self._lock:
+            store = self._load_store(model_name)
+            index = store['index']
+            matrix = store['matrix']
+            now = time.time()
+
+            results = []
+            for text in texts:
+                entry = index.get(hash_text(text))
+                if entry is None or matrix is None:
+                    results.append(None)
+                    continue
+                entry['last_used'] = now
+                store['dirty'] = True
+                results.append(np.array(matrix[entry['row']]))
+
+            # Persist recency now and then, so runs that only hit the cache still inform eviction
+            if store['dirty'] and now - store['saved_at'] >= self.flush_interval:
+                self._save_index(model_name, store)
+            return results
+
+    def put_many(self, model_name, texts, embeddings):
+        """
+        Store embeddings for a list of texts.
+
+        Args:
+            model_name (str): The name of the model that produced the embeddings.
+            texts (list of str): The texts the embeddings belong to.
+            embeddings (array-like): A 2-D array with one embedding per text.
+        """
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        if len(texts) == 0:
+            return
+
+        with self._lock:
+            store = self._load_store(model_name)
+            index = store['index']
+            now = time.time()
+
+            # Deduplicate by key so a batch never claims two rows for one text
+            pending = {}
+            for text, embedding in zip(texts, embeddings):
+                key = hash_text(text)
+                if key in index and store['matrix'] is not None:
+                    index[key]['last_used'] = now
+                else:
+                    pending[key] = embedding
+
+            if pending:
+                pending_items = list(pending.items())[-self.max_entries:]
+                rows = self._allocate_rows(model_name, store, len(pending_items), embeddings.shape[1])
+                matrix = store['matrix']
+                index = store['index']
+                for row, (key, embedding) in zip(rows, pending_items):
+                    matrix[row] = embedding
+                    index[key] = {'row': row, 'last_used': now}
+                matrix.flush()
+
+            self._save_index(model_name, store)
+
+    def flush(self):
+        """
+        Write the index of every model with unsaved access times to disk.
+        """
+        with self._lock:
+            for model_name, store in self._stores.items():
+                if store['dirty']:
+                    self._save_index(model_name, store)
+
+    def close(self):
+        """
+        Flush pending access times and release the memory-mapped matrices.
+        """
+        self.flush()
+        with self._lock:
+            self._stores.clear()
+
+    def clear(self, model_name):
+        """
+        Remove every cached embedding for a model.
+
+        Args:
+            model_name (str): The name of the model whose cache should be removed.
+        """
+        with self._lock:
+            self._stores.pop(model_name, None)
+            for path in self._paths(model_name):
+                if os.path.exists(path):
+                    os.remove(path)
+
+
+def _flush_at_exit(cache_ref):
+    cache = cache_ref()
+    if cache is None:
+        return
+    try:
+        cache.flush()
+    except OSError:
+        # The cache directory may already be gone, e.g. a temporary one
+        pass
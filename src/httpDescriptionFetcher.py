@@ -0,0 +1,187 @@
+"""
+HTTP Job Description Fetcher Module.
+
+This module fetches LinkedIn job descriptions from the public guest jobPosting API
+with plain HTTP requests instead of a browser. The endpoint returns a static HTML
+fragment, so a pooled requests session and an lxml parse are enough, and many
+descriptions can be fetched concurrently under a shared rate limit.
+"""
+
+import urllib.parse
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from lxml import html
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from rateLimiter import TokenBucket
+
+DESCRIPTION_URL = "https://www.linkedin.com/jobs-guest/jobs/api/jobPosting/"
+
+DESCRIPTION_XPATH = "//*[contains(concat(' ', normalize-space(@class), ' '), ' description__text--rich ')]"
+
+BLOCK_TAGS = {'p', 'div', 'li', 'ul', 'ol', 'br', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'section'}
+
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+              "(KHTML, like Gecko) Chrome/128.0.0.0 Safari/537.36")
+
+
+def element_text(element):
+    """
+    Extract the visible text of an HTML element, keeping line breaks between blocks.
+
+    Args:
+        element (lxml.html.HtmlElement): The element to extract text from.
+
+    Returns:
+        str: The element text with one line per block element.
+    """
+    parts = []
+
+    def walk(node):
+        if node.tag in BLOCK_TAGS:
+            parts.append('\n')
+        if node.text:
+            parts.append(node.text)
+        for child in node:
+            walk(child)
+            if child.tail:
+                parts.append(child.tail)
+        if node.tag in BLOCK_TAGS:
+            parts.append('\n')
+
+    walk(element)
+    lines = (' '.join(line.split()) for line in ''.join(parts).splitlines())
+    return '\n'.join(line for line in lines if line)
+
+
+def parse_description(page_html):
+    """
+    Parse the job description out of a jobPosting HTML fragment.
+
+    Args:
+        page_html (str): The HTML returned by the jobPosting endpoint.
+
+    Returns:
+        str: The job description text, or None if the fragment has no description.
+    """
+    if not page_html or not page_html.strip():
+        return None
+    tree = html.fromstring(page_html)
+    matches = tree.xpath(DESCRIPTION_XPATH)
+    if not matches:
+        return None
+    return element_text(matches[0])
+
+
+class LinkedInHttpDescriptionFetcher:
+    """
+    A class to fetch job descriptions over HTTP from the LinkedIn guest jobPosting API.
+
+    Attributes:
+        base_url (str): The jobPosting endpoint, with the job ID appended per request.
+        max_workers (int): The number of concurrent requests for batch fetches.
+        timeout (float): The per-request timeout in seconds.
+        session (requests.Session): The pooled HTTP session.
+        rate_limiter (TokenBucket): The throttle shared by all requests, or None.
+    """
+
+    def __init__(self, base_url=DESCRIPTION_URL, max_workers=8, requests_per_second=5,
+                 timeout=10, max_retries=3):
+        """
+        Initialize the LinkedInHttpDescriptionFetcher.
+
+        Args:
+            base_url (str): The jobPosting endpoint. Defaults to the LinkedIn guest API.
+            max_workers (int): The number of concurrent requests for batch fetches. Defaults to 8.
+            requests_per_second (float): The request rate limit. Pass None to disable
+                                         throttling. Defaults to 5.
+            timeout (float): The per-request timeout in seconds. Defaults to 10.
+            max_retries (int): Retries for connection errors, 429 and 5xx responses,
+                               with exponential backoff. Defaults to 3.
+        """
+        self.base_url = base_url if base_url.endswith('/') else base_url + '/'
+        self.max_workers = max_workers
+        self.timeout = timeout
+        self.rate_limiter = TokenBucket(requests_per_second) if requests_per_second else None
+
+        retry = Retry(total=max_retries, backoff_factor=0.5,
+                      status_forcelist=(429, 500, 502, 503, 504),
+                      allowed_methods=frozenset(['GET']))
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers, max_retries=retry)
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({'User-Agent': USER_AGENT})
+
+    @staticmethod
+    def get_job_id(job_url):
+        """
+        Extracts the job ID from the given job URL.
+
+        Args:
+            job_url (str): The URL of the job posting.
+
+        Returns:
+            str: The extracted job ID.
+        """
+        query_params = urllib.parse.parse_qs(urllib.parse.urlparse(job_url).query)
+        return query_params['currentJobId'][0]
+
+    def get_description(self, job_id=None, job_url=None):
+        """
+        Fetches one job description by job ID or job URL.
+
+        Args:
+            job_id (str): The ID of the job posting.
+            job_url (str): The URL of the job posting, used when job_id is not given.
+
+        Returns:
+            str: The job description text, or None if the posting has no description.
+
+        Raises:
+            requests.RequestException: If the request fails after all retries.
+        """
+        if job_id is None:
+            job_id = self.get_job_id(job_url)
+
+        if self.rate_limiter is not None:
+            self.rate_limiter.acquire()
+
+        response = self.session.get(self.base_url + str(job_id), timeout=self.timeout)
+        response.raise_for_status()
+        return parse_description(response.text)
+
+    def get_descriptions(self, job_ids, return_exceptions=False):
+        """
+        Fetches many job descriptions concurrently.
+
+        Args:
+            job_ids (iterable): The IDs of the job postings.
+            return_exceptions (bool): If True, a failed request yields its exception in
+                                      place of a description instead of raising. Defaults to False.
+
+        Returns:
+            list: The job description texts, in the same order as job_ids.
+        """
+        job_ids = list(job_ids)
+        with ThreadPoolExecutor(max_workers=max(1, self.max_workers)) as executor:
+            futures = [executor.submit(self.get_description, job_id) for job_id in job_ids]
+
+            descriptions = []
+            for future in futures:
+                try:
+                    descriptions.append(future.result())
+                except Exception as error:
+                    if not return_exceptions:
+                        raise
+                    descriptions.append(error)
+
+        return descriptions
+
+    def close(self):
+        """
+        Closes the pooled HTTP session.
+        """
+        self.session.close()
@@ -1,44 +1,80 @@
 import time
-from selenium import webdriver
-from selenium.webdriver.edge.service import Service
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.webdriver.edge.options import Options
-from selenium.webdriver.support.ui import WebDriverWait
+import queue
+from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import TimeoutException
+from browserPool import get_browser_pool
+from waits import AdaptiveWait, document_ready
 
 import urllib.parse
 
 
+DESCRIPTION_LOCATOR = (By.CSS_SELECTOR, ".description__text.description__text--rich")
+
+
+def description_ready(driver):
+    """
+    Wait condition for a jobPosting page.
+
+    Args:
+        driver (webdriver): The WebDriver instance.
+
+    Returns:
+        The description element once it is present, True if the page finished loading
+        without one, or False while the page is still loading.
+    """
+    elements = driver.find_elements(*DESCRIPTION_LOCATOR)
+    if elements:
+        return elements[0]
+    # A fully loaded fragment without the element will not grow one
+    return document_ready(driver)
+
+
 class LinkedInDescriptionScraper:
     """
     A class to scrape job descriptions from LinkedIn job postings.
 
     Attributes:
-        options (Options): Options for running Edge browser in headless mode.
-        service (Service): Edge WebDriver service.
+        pool (BrowserPool): The shared pool the browser is borrowed from.
         driver (webdriver): Edge WebDriver instance.
-        wait (WebDriverWait): WebDriverWait instance for driver.
+        wait (AdaptiveWait): Adaptive explicit wait for the driver.
+        wait_timings (list of WaitTiming): How long every wait of this scraper took.
     """
 
-    def __init__(self):
+    def __init__(self, pool=None, timeout=5, max_attempts=3):
         """
         Initializes the LinkedInDescriptionScraper with necessary configurations.
+
+        Args:
+            pool (BrowserPool): The pool to borrow a browser from. Defaults to the shared
+                                headless Edge pool.
+            timeout (float): The maximum time in seconds to wait for a description to
+                             appear on each attempt. Defaults to 5.
+            max_attempts (int): The number of times a posting is loaded before giving up.
+                                Defaults to 3.
+        """
+        # Borrow a headless browser from the shared pool
+        self.pool = pool if pool is not None else get_browser_pool(headless=True)
+        self.driver = self.pool.acquire()
+        self.max_attempts = max_attempts
+        # Poll for readiness instead of sleeping a fixed time
+        self.wait_timings = []
+        self.wait = AdaptiveWait(self.driver, timeout, timings=self.wait_timings)
+
+    def close(self):
+        """
+        Returns the browser to the pool so other scrapers can reuse it.
         """
-        # Set up options for running Edge browser in headless mode
-        self.options = Options()
-        self.options.use_chromium = True
-        self.options.add_argument("--headless")
-
-        # Set up Edge WebDriver service
-        self.service = Service(executable_path=EdgeChromiumDriverManager().install())
-        # Initialize Edge WebDriver instance
-        self.driver = webdriver.Edge(service=self.service, options=self.options)
-        # Set up WebDriverWait with a timeout of 10 seconds
-        self.wait = WebDriverWait(self.driver, 10)
-        # Maximize the browser window
-        self.driver.maximize_window()
+        if self.driver is not None:
+            self.pool.release(self.driver)
+            self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def getJobID(self, job_url):
         """
@@ -66,35 +102,27 @@ class LinkedInDescriptionScraper:
             job_id (str): The ID of the job posting.
 
         Returns:
-            str: The job description text.
+            str: The job description text, or None if it could not be found.
         """
         self.job_id = job_id
+        # Reset so a failed lookup never returns the previous job's description
+        self.job_description = None
         # Construct description URL
         self.description_url = f"https://linkedin.com/jobs-guest/jobs/api/jobPosting/{self.job_id}"
         
-        # Open the description URL
-        self.driver.get(self.description_url)
-        # Add a short delay
-        time.sleep(0.5)
-        
-        try:
-            # Use CSS selector to find the element with multiple class names
-            self.job_description = self.driver.find_element(By.CSS_SELECTOR, ".description__text.description__text--rich").text
-        except NoSuchElementException:
-            # Define a maximum number of attempts to avoid infinite loop
-            max_attempts = 5
-            attempts = 0
-            while attempts < max_attempts:
-                self.driver.get(self.description_url)
-                try:
-                    # Use CSS selector to find the element with multiple class names
-                    self.job_description = self.driver.find_element(By.CSS_SELECTOR, ".description__text.description__text--rich").text
+        for attempt in range(self.max_attempts):
+            # Open the description URL and wait until the description is rendered
+            self.driver.get(self.description_url)
+            try:
+                element = self.wait.until(description_ready, label='description')
+                if element is not True:
+                    self.job_description = element.text
                     break
-                except NoSuchElementException:
-                    # Increasing attempts
-                    attempts += 1
-                    # Wait for 1 second before retrying
-                    time.sleep(1) 
+            except TimeoutException:
+                pass
+            # The guest API sometimes serves an empty page; back off before reloading
+            if attempt < self.max_attempts - 1:
+                time.sleep(0.5 * 2 ** attempt)
 
         return self.job_description
 
@@ -106,41 +134,12 @@ class LinkedInDescriptionScraper:
             job_url (str): The URL of the job posting.
 
         Returns:
-            str: The job description text.
+            str: The job description text, or None if it could not be found.
         """
         
         self.job_url = job_url
-        # Get job ID from URL
-        self.job_id = self.getJobID(job_url)
-        
-        # Construct description URL
-        self.description_url = f"https://linkedin.com/jobs-guest/jobs/api/jobPosting/{self.job_id}"
-        
-        # Open the description URL
-        self.driver.get(self.description_url)
-        # Add a short delay
-        time.sleep(0.5)
-        
-        try:
-            # Use CSS selector to find the element with multiple class names
-            self.job_description = self.driver.find_element(By.CSS_SELECTOR, ".description__text.description__text--rich").text
-        except NoSuchElementException:
-            # Define a maximum number of attempts to avoid infinite loop
-            max_attempts = 5
-            attempts = 0
-            while attempts < max_attempts:
-                self.driver.get(self.description_url)
-                try:
-                    # Use CSS selector to find the element with multiple class names
-                    self.job_description = self.driver.find_element(By.CSS_SELECTOR, ".description__text.description__text--rich").text
-                    break
-                except NoSuchElementException:
-                    # Increasing attempts
-                    attempts += 1
-                    # Wait for 1 second before retrying
-                    time.sleep(1) 
-                    
-        return self.job_description
+        # Get job ID from URL and fetch its description
+        return self.getDescriptionFromJobID(self.getJobID(job_url))
 
     def getDescription(self, job_id=None, job_url=None):
         """
@@ -161,4 +160,66 @@ class LinkedInDescriptionScraper:
             # Get description using Job URL
             job_description = self.getDescriptionFromUrl(job_url)
         
-        return job_description
\ No newline at end of file
+        return job_description
+
+    def get_descriptions(self, job_ids, workers=4, return_exceptions=False):
+        """
+        Retrieves many job descriptions in parallel across several headless browsers.
+
+        This scraper's browser is used as one worker and the others are borrowed from the
+        same pool, so at most the pool's max_size browsers run at once. Jobs are handed
+        out from a shared queue, and results are returned in input order.
+
+        Args:
+            job_ids (iterable): The IDs of the job postings.
+            workers (int): The number of browsers to scrape with. Defaults to 4.
+            return_exceptions (bool): If True, a job whose browser raised an error yields the
+                                      exception in place of a description instead of raising.
+                                      Defaults to False.
+
+        Returns:
+            list: One entry per job ID, in input order: the description text, None if the
+                  posting had no description, or an exception when return_exceptions is True.
+        """
+        job_ids = list(job_ids)
+        results = [None] * len(job_ids)
+        pending = queue.Queue()
+        for index, job_id in enumerate(job_ids):
+            pending.put((index, job_id))
+
+        def work(scraper):
+            while True:
+                try:
+                    index, job_id = pending.get_nowait()
+                except queue.Empty:
+                    return
+                try:
+                    results[index] = scraper.getDescriptionFromJobID(job_id)
+                except Exception as error:
+                    results[index] = error
+
+        def work_with_new_browser():
+            # Browsers start inside the worker so startup overlaps with scraping
+            try:
+                scraper = LinkedInDescriptionScraper(pool=self.pool)
+            except Exception:
+                # The remaining workers drain the queue without this browser
+                return
+            try:
+                work(scraper)
+            finally:
+                scraper.close()
+
+        # Never ask for more browsers than the pool can hold, or acquire would block forever
+        workers = max(1, min(workers, self.pool.max_size, len(job_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [executor.submit(work, self)]
+            futures += [executor.submit(work_with_new_browser) for _ in range(workers - 1)]
+            for future in futures:
+                future.result()
+
+        if not return_exceptions:
+            for result in results:
+                if isinstance(result, Exception):
+                    raise result
+        return results
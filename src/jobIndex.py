@@ -0,0 +1,304 @@
+"""
+Job Ranking Index Module.
+
+This module keeps normalized job description embeddings in a compact float16 matrix
+on disk, memory-mapped on load, next to a CSV of job metadata. A resume can then be
+ranked against thousands of stored postings at once, so expensive LLM regeneration is
+only spent on the best matches. A small manifest names the matrix and CSV of the
+current index version and is replaced atomically, so both files always change
+together. Search is an exact NumPy scan by default, with an
+optional approximate nearest neighbour backend built on hnswlib. hnswlib is not in
+requirements.txt; install it separately to use the 'hnsw' backend.
+
+The app and the batch pipeline use build_top_k_filter to only regenerate resumes for
+jobs that rank among the top K of every stored job.
+"""
+
+import json
+import os
+import uuid
+
+import numpy as np
+import pandas as pd
+
+from resumeRelevancyScore import ORIGINAL_RESUME_SCORE_OFFSET
+
+METADATA_COLUMNS = ['Job ID', 'Job Title', 'Company Name', 'Location', 'Job Post Url']
+
+
+def load_scraped_jobs(job_store=None, text_column='Job Descriptions', search=None):
+    """
+    Load every stored job that has a job description.
+
+    Only the metadata and description columns are read from the job store.
+
+    Args:
+        job_store (JobStore): The dataset to read. Defaults to the dataset in '../data/jobs'.
+        text_column (str): The job description column. Defaults to 'Job Descriptions'.
+        search (str or list of str): Only load these search keys. Defaults to every search.
+
+    Returns:
+        pd.DataFrame: The jobs with a non-empty description, deduplicated on Job ID.
+    """
+    from jobStore import JobStore
+
+    job_store = job_store if job_store is not None else JobStore()
+    jobs = job_store.load(columns=METADATA_COLUMNS + [text_column], search=search)
+    jobs = jobs[jobs[text_column].fillna('').str.strip() != '']
+    return jobs.reset_index(drop=True)
+
+
+class JobIndex:
+    """
+    A class to store job description embeddings and rank jobs against a resume.
+
+    Attributes:
+        index_dir (str): The directory holding the manifest, embeddings and job metadata.
+        scorer (RelevanceScorer): The scorer used to embed texts.
+        jobs (pd.DataFrame): The metadata of the indexed jobs, one row per embedding row.
+        embeddings (np.ndarray): The float16 normalized embeddings, memory-mapped when loaded.
+    """
+
+    def __init__(self, scorer, index_dir='../cache/job_index'):
+        """
+        Initialize the JobIndex, loading an existing index from disk if present.
+
+        Args:
+            scorer (RelevanceScorer): The scorer used to embed job descriptions and resumes.
+            index_dir (str): The directory of the index files. Defaults to '../cache/job_index'.
+        """
+        self.scorer = scorer
+        self.index_dir = index_dir
+        self._ann_index = None
+        self.jobs = pd.DataFrame(columns=METADATA_COLUMNS)
+        self.embeddings = np.zeros((0, 0), dtype=np.float16)
+
+        self._load()
+
+    @property
+    def _manifest_path(self):
+        return os.path.join(self.index_dir, 'manifest.json')
+
+    def _read_manifest(self):
+        try:
+            with open(self._manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _load(self):
+        """
+        Load the index version named by the manifest, if its files are complete and aligned.
+        """
+        manifest = self._read_manifest()
+        if manifest is None:
+            if not os.path.exists(os.path.join(self.index_dir, 'embeddings.npy')):
+                return
+            # An index written before versioning; the row check below catches a torn write
+            manifest = {'embeddings': 'embeddings.npy', 'jobs': 'jobs.csv'}
+        try:
+            jobs = pd.read_csv(os.path.join(self.index_dir, manifest['jobs']), dtype={'Job ID': str})
+            embeddings = np.load(os.path.join(self.index_dir, manifest['embeddings']), mmap_mode='r')
+        except (OSError, ValueError, KeyError) as error:
+            print(f"Ignoring unreadable job index in {self.index_dir}: {error}")
+            return
+        if len(jobs) != len(embeddings) or manifest.get('rows', len(jobs)) != len(jobs):
+            print(f"Ignoring job index in {self.index_dir}: {len(jobs)} jobs do not match "
+                  f"{len(embeddings)} embeddings")
+            return
+        self.jobs = jobs
+        self.embeddings = embeddings
+
+    def _save(self, embeddings):
+        """
+        Write a new index version and switch to it by replacing the manifest.
+        """
+        os.makedirs(self.index_dir, exist_ok=True)
+        version = uuid.uuid4().hex
+        manifest = {'version': version, 'rows': len(self.jobs),
+                    'embeddings': f"embeddings-{version}.npy", 'jobs': f"jobs-{version}.csv"}
+        np.save(os.path.join(self.index_dir, manifest['embeddings']), embeddings)
+        self.jobs.to_csv(os.path.join(self.index_dir, manifest['jobs']), index=False)
+
+        # The manifest is the only file replaced in place, so readers see the old or the new pair
+        previous = self._read_manifest() or {'embeddings': 'embeddings.npy', 'jobs': 'jobs.csv'}
+        with open(self._manifest_path + '.tmp', 'w') as f:
+            json.dump(manifest, f)
+        os.replace(self._manifest_path + '.tmp', self._manifest_path)
+
+        self.embeddings = np.load(os.path.join(self.index_dir, manifest['embeddings']), mmap_mode='r')
+        for name in [previous['embeddings'], previous['jobs']]:
+            try:
+                os.remove(os.path.join(self.index_dir, name))
+            except OSError:
+                # Already gone, or still memory-mapped elsewhere on Windows
+                pass
+
+    def __len__(self):
+        return len(self.jobs)
+
+    def add_jobs(self, jobs, text_column='Job Descriptions', batch_size=64):
+        """
+        Embed and add jobs that are not yet in the index, then save the index.
+
+        Args:
+            jobs (pd.DataFrame): Jobs with a 'Job ID' column and a description column.
+            text_column (str): The job description column. Defaults to 'Job Descriptions'.
+            batch_size (int): Batch size passed to the model's encode call. Defaults to 64.
+
+        Returns:
+            int: The number of jobs added.
+        """
+        jobs = jobs[jobs[text_column].fillna('').str.strip() != '']
+        jobs = jobs.assign(**{'Job ID': jobs['Job ID'].astype(str)}).drop_duplicates('Job ID', keep='last')
+        new_jobs = jobs[~jobs['Job ID'].isin(set(self.jobs['Job ID']))]
+        if new_jobs.empty:
+            return 0
+
+        new_embeddings = self.scorer.encode(new_jobs[text_column].tolist(), batch_size=batch_size).astype(np.float16)
+        embeddings = new_embeddings if len(self.embeddings) == 0 else np.vstack([self.embeddings, new_embeddings])
+        metadata = new_jobs.reindex(columns=METADATA_COLUMNS)
+        self.jobs = pd.concat([self.jobs, metadata], ignore_index=True)
+
+        self._save(embeddings)
+        self._ann_index = None
+        return len(new_jobs)
+
+    def _exact_search(self, query, k, chunk_size=65536):
+        """
+        Return the row indices and similarities of the k most similar jobs by a full scan.
+        """
+        similarities = np.empty(len(self.embeddings), dtype=np.float32)
+        # Upcast in chunks so the float16 matrix is never copied whole
+        for start in range(0, len(self.embeddings), chunk_size):
+            chunk = np.asarray(self.embeddings[start:start + chunk_size], dtype=np.float32)
+            similarities[start:start + chunk_size] = chunk @ query
+
+        k = min(k, len(similarities))
+        top = np.argpartition(-similarities, k - 1)[:k]
+        top = top[np.argsort(-similarities[top])]
+        return top, similarities[top]
+
+    def _ann_search(self, query, k, ef=None):
+        """
+        Return the row indices and similarities of approximately the k most similar jobs.
+        """
+        try:
+            import hnswlib
+        except ImportError as error:
+            raise ImportError("The 'hnsw' search backend needs hnswlib; install it with "
+                              "'pip install hnswlib' or use the 'exact' backend") from error
+
+        if self._ann_index is None:
+            ann_path = os.path.join(self.index_dir, 'jobs.hnsw')
+            index = hnswlib.Index(space='ip', dim=self.embeddings.shape[1])
+            if os.path.exists(ann_path):
+                index.load_index(ann_path, max_elements=len(self.embeddings))
+            if index.get_current_count() != len(self.embeddings):
+                index = hnswlib.Index(space='ip', dim=self.embeddings.shape[1])
+                index.init_index(max_elements=len(self.embeddings), ef_construction=200, M=16)
+                index.add_items(np.asarray(self.embeddings, dtype=np.float32), np.arange(len(self.embeddings)))
+                index.save_index(ann_path)
+            self._ann_index = index
+
+        k = min(k, len(self.embeddings))
+        self._ann_index.set_ef(max(ef or 2 * k, k))
+        labels, distances = self._ann_index.knn_query(query, k=k)
+        # hnswlib's inner-product distance is 1 - similarity
+        return labels[0], 1 - distances[0]
+
+    def top_k(self, resume_text, k=10, backend='exact'):
+        """
+        Rank the indexed jobs against a resume.
+
+        Args:
+            resume_text (str): The text content of the resume.
+            k (int): The number of jobs to return. Defaults to 10.
+            backend (str): 'exact' for a full NumPy scan or 'hnsw' for an approximate
+                           hnswlib search. Defaults to 'exact'.
+
+        Returns:
+            pd.DataFrame: The k best matching jobs, best first, with a 'Match Score'
+                          column on RelevanceScorer's 0 to 100 scale. Empty if k is not
+                          positive.
+        """
+        if len(self.jobs) == 0 or k <= 0:
+            return self.jobs.iloc[:0].assign(**{'Match Score': []})
+
+        query = self.scorer.encode([resume_text])[0].astype(np.float32)
+        if backend == 'exact':
+            rows, similarities = self._exact_search(query, k)
+        elif backend == 'hnsw':
+            rows, similarities = self._ann_search(query, k)
+        else:
+            raise ValueError(f"Unknown search backend: {backend}")
+
+        results = self.jobs.iloc[rows].reset_index(drop=True)
+        results['Match Score'] = np.round((similarities.astype(np.float64) + 1) / 2 * 100, 2)
+        return results
+
+
+class TopKFilter:
+    """
+    A class to decide whether a job ranks among the top K stored jobs for a resume.
+
+    Attributes:
+        k (int): The number of best matching stored jobs to keep.
+        job_ids (set of str): The IDs of the top K stored jobs.
+        cutoff (float): The 'Old Resume Score' of the k-th best stored job, or None if
+                        fewer than k jobs are stored, in which case every job passes.
+    """
+
+    def __init__(self, index, resume_text, k, backend='exact'):
+        """
+        Initialize the TopKFilter by ranking the indexed jobs against the resume once.
+
+        Args:
+            index (JobIndex): The index of stored jobs.
+            resume_text (str): The text content of the resume.
+            k (int): The number of best matching stored jobs to keep.
+            backend (str): The search backend of JobIndex.top_k. Defaults to 'exact'.
+        """
+        self.k = k
+        top = index.top_k(resume_text, k, backend)
+        self.job_ids = set(top['Job ID'].astype(str))
+        # Match scores have no offset, while the scores passed to the filter do
+        self.cutoff = top['Match Score'].min() - ORIGINAL_RESUME_SCORE_OFFSET if len(top) >= k else None
+
+    def __call__(self, job_id, old_resume_score):
+        """
+        Check whether a job is worth regenerating a resume for.
+
+        Args:
+            job_id (str): The LinkedIn job ID.
+            old_resume_score (float): The job's score from RelevanceScorer.score_original_resume.
+
+        Returns:
+            bool: True if the job is one of the top K stored jobs, or scores at least as
+                  high as the k-th of them.
+        """
+        if str(job_id) in self.job_ids or self.cutoff is None:
+            return True
+        return old_resume_score >= self.cutoff
+
+
+def build_top_k_filter(scorer, resume_text, k, job_store=None, index_dir='../cache/job_index', backend='exact'):
+    """
+    Bring the job index up to date with the job store and build a TopKFilter from it.
+
+    Args:
+        scorer (RelevanceScorer): The scorer used to embed job descriptions and the resume.
+        resume_text (str): The text content of the resume.
+        k (int): The number of best matching stored jobs to keep.
+        job_store (JobStore): The dataset of scraped jobs. Defaults to the dataset in '../data/jobs'.
+        index_dir (str): The directory of the index files. Defaults to '../cache/job_index'.
+        backend (str): 'exact' or 'hnsw', see JobIndex.top_k. Defaults to 'exact'.
+
+    Returns:
+        TopKFilter: The filter for the resume.
+    """
+    index = JobIndex(scorer, index_dir)
+    added = index.add_jobs(load_scraped_jobs(job_store))
+    if added:
+        print(f"Added {added} stored jobs to the job index")
+    return TopKFilter(index, resume_text, k, backend)
@@ -3,14 +3,45 @@ import time
 import urllib.parse
 import math
 import pandas as pd
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.edge.service import Service
-from selenium.webdriver.edge.options import Options
-from webdriver_manager.microsoft import EdgeChromiumDriverManager
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.common.exceptions import NoSuchElementException
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+from browserPool import get_browser_pool
+from waits import AdaptiveWait
+from seenJobsIndex import SeenJobsIndex, SEEN
+from jobStore import JobStore, search_key
+
+
+# Number of job cards whose title link has been rendered
+RENDERED_CARD_COUNT_SCRIPT = """
+return document.querySelectorAll('.jobs-search-results__list-item .artdeco-entity-lockup__title a').length;
+"""
+
+# Scroll the results pane down by one viewport and report whether it reached the bottom
+SCROLL_JOB_LIST_SCRIPT = """
+const pane = document.getElementsByClassName('jobs-search-results-list')[0];
+if (!pane) { return true; }
+pane.scrollBy(0, pane.clientHeight);
+return pane.scrollTop + pane.clientHeight >= pane.scrollHeight - 1;
+"""
+
+# Read title, link, company and location of every rendered job card in one round-trip
+EXTRACT_JOB_CARDS_SCRIPT = """
+const cards = [];
+for (const item of document.querySelectorAll('.jobs-search-results__list-item')) {
+    const link = item.querySelector('.artdeco-entity-lockup__title a');
+    const company = item.querySelector('.artdeco-entity-lockup__subtitle');
+    const location = item.querySelector('.artdeco-entity-lockup__caption');
+    if (!link || !company || !location) { continue; }
+    cards.push({
+        title: link.innerText,
+        url: link.href,
+        company: company.innerText,
+        location: location.innerText
+    });
+}
+return cards;
+"""
 
 
 class LinkedInJobListingScraper:
@@ -18,22 +49,71 @@ class LinkedInJobListingScraper:
     A class to scrape job listings from LinkedIn job search results.
 
     Attributes:
-        driver (webdriver): The Selenium WebDriver instance.
-        wait (WebDriverWait): WebDriverWait instance for the driver.
+        pool (BrowserPool): The shared pool the browser is borrowed from.
+        driver (webdriver): The Selenium WebDriver instance, or None while no browser is borrowed.
+        account (str): The LinkedIn account the browser is used with, or None.
+        wait (AdaptiveWait): Adaptive explicit wait for the driver.
+        wait_timings (list of WaitTiming): How long every wait of this scraper took.
+        job_store (JobStore): The dataset scraped listings are appended to.
     """
 
-    def __init__(self):
+    def __init__(self, pool=None, timeout=15, bulk_extract=True, job_store=None):
         """
         Initializes the LinkedInJobListingScraper with necessary configurations.
+
+        No browser is borrowed until acquire_driver or scrape_linkedin_jobs is called.
+
+        Args:
+            pool (BrowserPool): The pool to borrow a browser from. Defaults to the shared
+                                non-headless Edge pool.
+            timeout (float): The maximum time in seconds to wait for a page to be ready.
+                             Defaults to 15.
+            bulk_extract (bool): Whether to read all job cards with one script call instead
+                                 of walking each card element. Defaults to True.
+            job_store (JobStore): The dataset to append scraped listings to. Defaults to
+                                  the dataset in '../data/jobs'.
         """
-        self.options = Options()
-        self.options.use_chromium = True
-        # self.options.add_argument("--headless")  # Uncomment for headless mode
+        self.pool = pool if pool is not None else get_browser_pool(headless=False)
+        self.timeout = timeout
+        self.bulk_extract = bulk_extract
+        self.job_store = job_store if job_store is not None else JobStore()
+        self.wait_timings = []
+        # The browser is only borrowed once the account to scrape with is known
+        self.driver = None
+        self.account = None
+        self.wait = None
+
+    def acquire_driver(self, account=None):
+        """
+        Borrows a browser for an account from the pool if the scraper does not hold one.
+
+        A browser held for a different account is returned first, so one LinkedIn
+        session is never reused for another account.
 
-        self.service = Service(executable_path=EdgeChromiumDriverManager().install())
-        self.driver = webdriver.Edge(service=self.service, options=self.options)
-        self.wait = WebDriverWait(self.driver, 10)
-        self.driver.maximize_window()
+        Args:
+            account (str): The LinkedIn account the browser is used with, or None for an
+                           anonymous browser. Defaults to None.
+        """
+        if self.driver is not None and self.account != account:
+            self.close()
+        if self.driver is None:
+            self.driver = self.pool.acquire(account=account)
+            self.account = account
+            self.wait = AdaptiveWait(self.driver, self.timeout, timings=self.wait_timings)
+
+    def close(self):
+        """
+        Returns the browser to the pool so other scrapers can reuse it.
+        """
+        if self.driver is not None:
+            self.pool.release(self.driver)
+            self.driver = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
 
     def login_with_credentials(self, username, password):
         """
@@ -41,7 +121,11 @@ class LinkedInJobListingScraper:
 
         This function locates the username and password fields on the LinkedIn login page,
         fills them with the provided credentials, and clicks the 'Sign In' button to submit the form.
+        A reused browser that is already signed in has no login form, so it is left as is.
         """
+        if not self.driver.find_elements(By.ID, 'username'):
+            return
+
         # Find the username input field by its ID and enter the username
         self.driver.find_element(By.ID, 'username').send_keys(username)
 
@@ -51,8 +135,8 @@ class LinkedInJobListingScraper:
         # Find the 'Sign In' button using CSS selector and click it to submit the login form
         self.driver.find_element(By.CSS_SELECTOR, "button.btn__primary--large").click()
 
-        # Sleeping for 2 seconds
-        time.sleep(2)
+        # Wait until the login form has been submitted and replaced
+        self.wait.until(EC.invisibility_of_element_located((By.ID, 'password')), label='login')
 
     def generate_linkedin_url(self, job_title, location, start):
         """
@@ -83,11 +167,17 @@ class LinkedInJobListingScraper:
             linkedin_url (str): The LinkedIn job search URL.
 
         Returns:
-            list: A list of job listing elements.
+            list: A list of job listing elements, empty past the last results page.
         """
         self.driver.get(linkedin_url)
-        time.sleep(5)
-        table = self.driver.find_element(By.CLASS_NAME, 'scaffold-layout__list-container')
+        table = self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'scaffold-layout__list-container')),
+                                label='job_list')
+        try:
+            self.wait.until(EC.presence_of_element_located((By.CLASS_NAME, 'jobs-search-results__list-item')),
+                            label='job_cards')
+        except TimeoutException:
+            # An empty results page has the list container but no job cards
+            return []
         return table.find_elements(By.CLASS_NAME, 'jobs-search-results__list-item')
 
     def parse_job_data(self, job):
@@ -145,51 +235,148 @@ class LinkedInJobListingScraper:
 
         return pd.DataFrame(lst)
 
-    def scrape_linkedin_jobs(self, job_title, location, num_results, username, password):
+    def scroll_job_list(self, max_rounds=20, growth_timeout=1.5):
+        """
+        Scrolls the results pane step by step until no more job cards get rendered.
+
+        LinkedIn only fills in a card's content once it has been scrolled into view, so
+        the pane is scrolled one viewport at a time and scrolling stops as soon as the
+        number of rendered cards stops growing.
+
+        Args:
+            max_rounds (int): The maximum number of scroll steps. Defaults to 20.
+            growth_timeout (float): Seconds to wait for new cards after each step. Defaults to 1.5.
+
+        Returns:
+            int: The number of rendered job cards.
+        """
+        count = self.driver.execute_script(RENDERED_CARD_COUNT_SCRIPT)
+
+        def cards_grew(driver):
+            rendered = driver.execute_script(RENDERED_CARD_COUNT_SCRIPT)
+            return rendered if rendered > count else False
+
+        for _ in range(max_rounds):
+            at_bottom = self.driver.execute_script(SCROLL_JOB_LIST_SCRIPT)
+            try:
+                count = self.wait.until(cards_grew, label='card_growth', timeout=growth_timeout)
+            except TimeoutException:
+                if at_bottom:
+                    break
+        return count
+
+    def get_jobs_data_bulk(self):
+        """
+        Extracts job data from every rendered job card with a single script call.
+
+        Returns:
+            pd.DataFrame: DataFrame containing the job details.
+        """
+        self.scroll_job_list()
+        cards = self.driver.execute_script(EXTRACT_JOB_CARDS_SCRIPT)
+        lst = [{
+            'Job Title': card['title'].split('\n')[0],
+            'Job Post Url': card['url'],
+            'Company Name': card['company'],
+            'Location': card['location']
+        } for card in cards]
+        return pd.DataFrame(lst)
+
+    def scrape_linkedin_jobs(self, job_title, location, num_results, username, password,
+                             incremental=False, seen_index=None, mark_seen=True):
         """
         Scrapes LinkedIn job listings and returns the job details.
 
+        In incremental mode, listings are checked against a persistent SeenJobsIndex:
+        pagination stops at the first page made up only of already-known jobs, and only
+        new or changed listings are returned (and counted towards num_results). Listings
+        that are crawled but not returned stay unseen, so they surface again next run.
+
         Args:
             job_title (str): The job title to search for.
             location (str): The location to search in.
             num_results (int): The number of results to scrape.
-            cookies_file (str): The path to the cookies file.
+            username (str): The LinkedIn username.
+            password (str): The LinkedIn password.
+            incremental (bool): Whether to skip listings seen on earlier runs. Defaults to False.
+            seen_index (SeenJobsIndex): The index to use in incremental mode. Defaults to
+                                        the shared index in '../cache/seen_jobs.sqlite'.
+            mark_seen (bool): Whether to mark the returned listings as seen right away. Pass
+                              False to mark them with seen_index.update only once they
+                              were processed successfully. Defaults to True.
 
         Returns:
             pd.DataFrame: DataFrame containing all scraped job details.
         """
-        self.driver.get('https://www.linkedin.com/checkpoint/lg/sign-in-another-account')
-        self.login_with_credentials(username, password)
-        
+        if incremental and seen_index is None:
+            seen_index = SeenJobsIndex()
+
         all_jobs = []
         start = 0  # Start at the first page
         total_jobs_collected = 0  # Keep track of how many jobs have been collected
 
-        # Continue scraping until we have collected the desired number of jobs
-        while total_jobs_collected < num_results:
-            print(f"Scraping page starting at {start}")
-            linkedin_url = self.generate_linkedin_url(job_title, location, start)
-            jobs = self.fetch_job_listings(linkedin_url)
-            jobs_data = self.get_jobs_data(jobs)
-            
-            all_jobs.append(jobs_data)
-            total_jobs_collected += len(jobs_data)  # Update the total number of jobs collected
-
-            # If fewer jobs were found than expected (e.g., end of listings), break the loop
-            if len(jobs_data) == 0:
-                print("No more jobs found on this page.")
-                break
-
-            start += 25  # Move to the next page
+        # The browser goes back to the pool even if login or scraping fails
+        try:
+            self.acquire_driver(account=username)
+            self.driver.get('https://www.linkedin.com/checkpoint/lg/sign-in-another-account')
+            self.login_with_credentials(username, password)
+
+            # Continue scraping until we have collected the desired number of jobs
+            while total_jobs_collected < num_results:
+                print(f"Scraping page starting at {start}")
+                linkedin_url = self.generate_linkedin_url(job_title, location, start)
+                jobs = self.fetch_job_listings(linkedin_url)
+                if not jobs:
+                    jobs_data = pd.DataFrame()
+                elif self.bulk_extract:
+                    jobs_data = self.get_jobs_data_bulk()
+                else:
+                    jobs_data = self.get_jobs_data(jobs)
+
+                # If fewer jobs were found than expected (e.g., end of listings), break the loop
+                if len(jobs_data) == 0:
+                    print("No more jobs found on this page.")
+                    break
+
+                jobs_data['Job ID'] = jobs_data['Job Post Url'].apply(lambda x: x.split('/')[5])
+
+                if incremental:
+                    jobs_data['Status'] = seen_index.classify(jobs_data)
+                    all_jobs.append(jobs_data)
+                    fresh_jobs = (jobs_data['Status'] != SEEN).sum()
+                    total_jobs_collected += fresh_jobs
+                    # Listings are sorted by recency, so a fully known page means we caught up
+                    if fresh_jobs == 0:
+                        print("Only already-known jobs found on this page.")
+                        break
+                else:
+                    all_jobs.append(jobs_data)
+                    total_jobs_collected += len(jobs_data)  # Update the total number of jobs collected
+
+                start += 25  # Move to the next page
+        finally:
+            self.close()
+
+        if not all_jobs:
+            # The first page was already empty
+            columns = ['Job Title', 'Job Post Url', 'Company Name', 'Location', 'Job ID']
+            return pd.DataFrame(columns=columns + ['Status'] if incremental else columns)
 
         # Combine all the jobs into one DataFrame
         jobs_dataframe = pd.concat(all_jobs).reset_index(drop=True)
-        jobs_dataframe['Job ID'] = jobs_dataframe['Job Post Url'].apply(lambda x: x.split('/')[5])
 
-        self.driver.quit()
+        if incremental:
+            new_jobs = jobs_dataframe[jobs_dataframe['Status'] != SEEN]
+            new_jobs = new_jobs.drop_duplicates('Job ID').head(num_results).reset_index(drop=True)
+            # Known listings refresh their last-seen time; new ones are only marked once returned
+            seen_index.update(jobs_dataframe[jobs_dataframe['Status'] == SEEN])
+            if mark_seen:
+                seen_index.update(new_jobs)
+            self.job_store.append(jobs_dataframe, search_key(job_title, location))
+            return new_jobs
 
         jobs_df = jobs_dataframe.head(num_results)
-        jobs_df.to_csv(f'../data/Scraped {job_title}.csv', index=False)
+        self.job_store.append(jobs_df, search_key(job_title, location))
 
         # If we collected more jobs than required, trim the DataFrame
-        return jobs_df
\ No newline at end of file
+        return jobs_df
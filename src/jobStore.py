@@ -0,0 +1,189 @@
+"""
+Job Store Module.
+
+This module keeps every scraped job listing, along with its description, scores and
+regenerated resume JSON once they are known, in a Parquet dataset partitioned by
+search and scrape date:
+
+    ../data/jobs/search=<search>/date=<YYYY-MM-DD>/part-<id>.parquet
+
+Each append writes a new file, so nothing already stored is rewritten. Readers load
+only the columns and partitions they ask for, and rows are merged on Job ID, taking
+each column from the most recently stored row that has a value for it. A rescrape
+that stores only the listing therefore never hides an earlier description or score.
+"""
+
+import glob
+import json
+import os
+import re
+import uuid
+from datetime import date, datetime, timezone
+
+import pandas as pd
+
+# Every stored file is written with this schema, so old and new partitions read back together
+JOB_COLUMNS = {
+    'Job ID': 'string',
+    'Job Title': 'string',
+    'Company Name': 'string',
+    'Location': 'string',
+    'Job Post Url': 'string',
+    'Status': 'string',
+    'Job Descriptions': 'string',
+    'Old Resume Score': 'float64',
+    'New Resume Score': 'float64',
+    'ReGen JSON': 'string',
+    'ReGen FilePath': 'string',
+    'Scraped At': 'timestamp',
+}
+
+
+def search_key(job_title, location=''):
+    """
+    Build the partition value of a search.
+
+    Args:
+        job_title (str): The job title searched for.
+        location (str): The location searched in. Defaults to ''.
+
+    Returns:
+        str: A lowercase, filesystem-safe key such as 'data-analyst-india'.
+    """
+    return re.sub(r'[^a-z0-9]+', '-', f"{job_title} {location}".lower()).strip('-')
+
+
+def _arrow_schema():
+    import pyarrow as pa
+
+    types = {'string': pa.string(), 'float64': pa.float64(), 'timestamp': pa.timestamp('us', tz='UTC')}
+    return pa.schema([(column, types[kind]) for column, kind in JOB_COLUMNS.items()])
+
+
+class JobStore:
+    """
+    A class to append scraped jobs to, and load them from, a partitioned Parquet dataset.
+
+    Attributes:
+        root (str): The root directory of the dataset.
+    """
+
+    def __init__(self, root='../data/jobs'):
+        """
+        Initialize the JobStore.
+
+        Args:
+            root (str): The root directory of the dataset. Defaults to '../data/jobs'.
+        """
+        self.root = root
+
+    def append(self, jobs, search, scraped_date=None):
+        """
+        Append jobs to the partition of a search and date.
+
+        Columns outside JOB_COLUMNS are dropped and missing ones are stored as nulls.
+        Dictionaries in 'ReGen JSON' are stored as JSON text.
+
+        Args:
+            jobs (pd.DataFrame): The jobs, with a 'Job ID' column.
+            search (str): The search key, as returned by search_key.
+            scraped_date (date): The partition date. Defaults to today.
+
+        Returns:
+            str: The path of the written file, or None if there were no jobs.
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        if jobs.empty:
+            return None
+
+        frame = jobs.reindex(columns=list(JOB_COLUMNS))
+        frame['Job ID'] = frame['Job ID'].astype(str)
+        frame['ReGen JSON'] = frame['ReGen JSON'].apply(
+            lambda value: json.dumps(value) if isinstance(value, dict) else value)
+        frame['Scraped At'] = frame['Scraped At'].fillna(pd.Timestamp(datetime.now(timezone.utc)))
+        for column, kind in JOB_COLUMNS.items():
+            if kind == 'string':
+                frame[column] = frame[column].astype(object).where(frame[column].notna(), None)
+        frame['Scraped At'] = pd.to_datetime(frame['Scraped At'], utc=True)
+
+        partition = os.path.join(self.root, f"search={search}",
+                                 f"date={(scraped_date or date.today()).isoformat()}")
+        os.makedirs(partition, exist_ok=True)
+        name = f"part-{uuid.uuid4().hex}.parquet"
+        path = os.path.join(partition, name)
+        temporary_path = os.path.join(partition, f".{name}.tmp")
+        table = pa.Table.from_pandas(frame, schema=_arrow_schema(), preserve_index=False)
+
+        # Dot-prefixed files are skipped by readers, so a half-written file is never loaded
+        pq.write_table(table, temporary_path)
+        os.replace(temporary_path, path)
+        return path
+
+    def load(self, columns=None, search=None, since=None, dedupe=True):
+        """
+        Load stored jobs, reading only the requested columns and partitions.
+
+        Args:
+            columns (list of str): The columns to load. Defaults to every column.
+            search (str or list of str): Only load these search keys. Defaults to every search.
+            since (date): Only load partitions scraped on or after this date. Defaults to every date.
+            dedupe (bool): Whether to merge the stored rows of each Job ID into one, taking
+                           every column's latest non-null value. Defaults to True.
+
+        Returns:
+            pd.DataFrame: The jobs, with 'Search' and 'Date' columns when requested.
+        """
+        import pyarrow as pa
+        import pyarrow.dataset as ds
+
+        requested = list(columns) if columns is not None else list(JOB_COLUMNS) + ['Search', 'Date']
+        if not glob.glob(os.path.join(self.root, 'search=*', 'date=*', '*.parquet')):
+            return pd.DataFrame(columns=requested)
+
+        partitioning = ds.partitioning(pa.schema([('search', pa.string()), ('date', pa.string())]), flavor='hive')
+        dataset = ds.dataset(self.root, format='parquet', partitioning=partitioning, schema=pa.unify_schemas(
+            [_arrow_schema(), partitioning.schema]))
+
+        expression = None
+        if search is not None:
+            expression = ds.field('search').isin([search] if isinstance(search, str) else list(search))
+        if since is not None:
+            since_expression = ds.field('date') >= since.isoformat()
+            expression = since_expression if expression is None else expression & since_expression
+
+        renamed = {'Search': 'search', 'Date': 'date'}
+        read_columns = [renamed.get(column, column) for column in requested]
+        if dedupe:
+            read_columns += [column for column in ['Job ID', 'Scraped At'] if column not in read_columns]
+        table = dataset.to_table(columns=read_columns, filter=expression)
+        jobs = table.to_pandas().rename(columns={'search': 'Search', 'date': 'Date'})
+
+        if dedupe:
+            # groupby().last() skips nulls, so bare listing rows do not shadow enriched ones
+            jobs = jobs.sort_values('Scraped At', kind='stable').groupby('Job ID', sort=False).last().reset_index()
+        return jobs[requested].reset_index(drop=True)
+
+    def import_csv_dumps(self, data_dir='../data'):
+        """
+        Import the legacy 'Scraped {job_title}.csv' files into the dataset.
+
+        The search key is taken from the file name and the date from the file's
+        modification time.
+
+        Args:
+            data_dir (str): The directory holding the CSV files. Defaults to '../data'.
+
+        Returns:
+            int: The number of jobs imported.
+        """
+        imported = 0
+        for path in sorted(glob.glob(os.path.join(data_dir, 'Scraped *.csv'))):
+            jobs = pd.read_csv(path, dtype={'Job ID': str})
+            modified = datetime.fromtimestamp(os.path.getmtime(path), timezone.utc)
+            jobs['Scraped At'] = modified
+            job_title = os.path.basename(path)[len('Scraped '):-len('.csv')]
+            self.append(jobs, search_key(job_title), scraped_date=modified.date())
+            imported += len(jobs)
+        return imported
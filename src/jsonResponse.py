@@ -0,0 +1,122 @@
+"""
+JSON Response Module.
+
+This module requests JSON from the LLM in the provider's JSON mode, parses the reply
+tolerantly (code fences, text around the object) and validates it. A reply that still
+cannot be parsed or validated gets exactly one repair request, which shows the model
+its previous reply and the error, instead of failing the job outright.
+"""
+
+import json
+import logging
+import re
+
+from llmClient import create_completion, invalidate_completion, resolve_backend, store_completion
+
+logger = logging.getLogger(__name__)
+
+JSON_MODE = {"type": "json_object"}
+
+CODE_FENCE = re.compile(r"^```[\w-]*[ \t]*\n?(.*?)\n?```$", re.DOTALL)
+
+REPAIR_PROMPT = """Your previous response could not be used: {error}
+
+Reply with the corrected JSON only, keeping everything else in your previous response unchanged."""
+
+
+def strip_code_fence(text):
+    """
+    Remove a Markdown code fence, such as ```json ... ```, wrapped around a response.
+
+    Args:
+        text (str): The response text.
+
+    Returns:
+        str: The text inside the fence, or the stripped text if it is not fenced.
+    """
+    text = text.strip()
+    match = CODE_FENCE.match(text)
+    return match.group(1).strip() if match else text
+
+
+def parse_json_response(text):
+    """
+    Parse the JSON object in a response.
+
+    Args:
+        text (str): The response text.
+
+    Returns:
+        The parsed JSON value.
+
+    Raises:
+        ValueError: If the response holds no parseable JSON.
+    """
+    if text is None:
+        raise ValueError("The response was empty")
+    text = strip_code_fence(text)
+    try:
+        return json.loads(text)
+    except ValueError:
+        # Fall back to the outermost object, ignoring any prose around it
+        start, end = text.find('{'), text.rfind('}')
+        if start == -1 or end <= start:
+            raise
+        return json.loads(text[start:end + 1])
+
+
+def request_json(messages, validate=None, model=None, client=None, rate_limiter=None,
+                 usage_log=None, json_mode=True, max_repairs=1, **kwargs):
+    """
+    Request a JSON response, validating it and repairing it at most max_repairs times.
+
+    Args:
+        messages (list of dict): The chat messages to send.
+        validate (callable): Takes the parsed JSON and returns the value to hand back,
+                             raising ValueError if it is unusable. Defaults to accepting
+                             any JSON.
+        model (str): The model to use. Defaults to the backend's default model.
+        client (OpenAI or LLMBackend): The backend, or an OpenAI client, to send requests
+                                       to. Defaults to the process-wide backend.
+        rate_limiter (TokenBucket): An optional throttle for the API calls.
+        usage_log (list): If given, the TokenUsage of every request is appended to it.
+        json_mode (bool): Whether to request the provider's JSON mode. Defaults to True.
+        max_repairs (int): The number of repair requests allowed. Defaults to 1.
+        **kwargs: Extra arguments passed to create_completion.
+
+    Returns:
+        The value returned by validate, or the parsed JSON.
+
+    Raises:
+        ValueError: If the response is still unusable after the last repair.
+    """
+    if json_mode:
+        kwargs['response_format'] = JSON_MODE
+    # Resolve the backend and model up front so cache invalidation uses the same key as the request
+    client = resolve_backend(client)
+    model = model or client.default_model
+
+    conversation = list(messages)
+    for attempt in range(max_repairs + 1):
+        result = create_completion(messages=conversation, model=model, client=client, rate_limiter=rate_limiter,
+                                   usage_log=usage_log, **kwargs)
+        try:
+            value = parse_json_response(result)
+            if validate is not None:
+                value = validate(value)
+        except ValueError as error:
+            # Never serve an unusable response from the completion cache again
+            invalidate_completion(conversation, model=model, client=client, **kwargs)
+            if attempt == max_repairs:
+                raise
+            logger.warning("Unusable JSON response (%s), sending a repair request", error)
+            conversation = list(messages) + [
+                {"role": "assistant", "content": result or ""},
+                {"role": "user", "content": REPAIR_PROMPT.format(error=error)},
+            ]
+            continue
+
+        if attempt > 0:
+            # Cache the repaired response under the original request as well
+            store_completion(messages, result, model=model, client=client, **kwargs)
+        return value
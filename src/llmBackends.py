@@ -0,0 +1,291 @@
+"""
+LLM Backends Module.
+
+This module puts chat completion providers behind one small interface, so the same
+regeneration code can run against OpenAI, a local OpenAI-compatible server such as
+llama.cpp or vLLM, or a deterministic fake that replays recorded responses with a
+configurable latency for offline load tests and CI.
+"""
+
+import json
+import math
+import os
+import random
+import threading
+import time
+from abc import ABC, abstractmethod
+
+from completionCache import make_cache_key
+
+DEFAULT_MODEL = "gpt-4o-mini"
+DEFAULT_LOCAL_URL = "http://localhost:8080/v1"
+
+
+class LLMBackend(ABC):
+    """
+    Base class for chat completion backends.
+
+    Attributes:
+        name (str): A short name of the backend.
+        default_model (str): The model used when a request names none.
+        cache_namespace (str): Separates this backend's entries in the completion cache
+                               from those of other backends and endpoints.
+    """
+
+    name = 'base'
+    default_model = DEFAULT_MODEL
+    cache_namespace = None
+
+    @abstractmethod
+    def complete(self, messages, model, **kwargs):
+        """
+        Send a chat completion request.
+
+        Args:
+            messages (list of dict): The chat messages to send.
+            model (str): The model to use.
+            **kwargs: Extra request parameters, such as response_format.
+
+        Returns:
+            tuple: A tuple containing:
+                - str: The content of the first completion choice.
+                - dict: The 'prompt_tokens', 'cached_prompt_tokens' and 'completion_tokens'
+                        of the request.
+        """
+
+
+class OpenAIBackend(LLMBackend):
+    """
+    A backend sending requests through an OpenAI client.
+
+    Responses are cached per API endpoint and organization of the client, so two
+    clients pointing at different servers or accounts never share cache entries.
+
+    Attributes:
+        client (OpenAI): The client requests are sent with.
+    """
+
+    name = 'openai'
+
+    def __init__(self, client=None, default_model=DEFAULT_MODEL):
+        """
+        Initialize the OpenAIBackend.
+
+        Args:
+            client (OpenAI): The client to use. Defaults to the shared client.
+            default_model (str): The model used when a request names none. Defaults to 'gpt-4o-mini'.
+        """
+        if client is None:
+            from llmClient import get_openai_client
+            client = get_openai_client()
+        self.client = client
+        self.default_model = default_model
+        self.cache_namespace = ":".join(str(part) for part in [
+            self.name, getattr(client, 'base_url', None), getattr(client, 'organization', None),
+            getattr(client, 'project', None)] if part)
+
+    def complete(self, messages, model, **kwargs):
+        completion = self.client.chat.completions.create(model=model, messages=messages, **kwargs)
+        usage = getattr(completion, 'usage', None)
+        details = getattr(usage, 'prompt_tokens_details', None)
+        return completion.choices[0].message.content, {
+            'prompt_tokens': getattr(usage, 'prompt_tokens', 0) or 0,
+            'cached_prompt_tokens': getattr(details, 'cached_tokens', 0) or 0,
+            'completion_tokens': getattr(usage, 'completion_tokens', 0) or 0,
+        }
+
+
+class OpenAICompatibleBackend(OpenAIBackend):
+    """
+    A backend for a local server with an OpenAI-compatible API, e.g. llama.cpp or vLLM.
+
+    Attributes:
+        base_url (str): The API root of the server.
+        json_mode (bool): Whether the server accepts response_format; if not, it is dropped.
+    """
+
+    name = 'local'
+
+    def __init__(self, base_url=DEFAULT_LOCAL_URL, default_model='local-model', api_key=None, json_mode=True,
+                 timeout=120):
+        """
+        Initialize the OpenAICompatibleBackend.
+
+        Args:
+            base_url (str): The API root of the server. Defaults to 'http://localhost:8080/v1'.
+            default_model (str): The model used when a request names none. Defaults to 'local-model'.
+            api_key (str): The API key, if the server needs one. Defaults to a placeholder.
+            json_mode (bool): Whether the server accepts response_format. Defaults to True.
+            timeout (float): The request timeout in seconds; local models can be slow.
+                             Defaults to 120.
+        """
+        from openai import OpenAI
+
+        self.base_url = base_url
+        self.json_mode = json_mode
+        # create_completion retries with backoff, so the SDK's own retries are disabled
+        client = OpenAI(base_url=base_url, api_key=api_key or 'not-needed', timeout=timeout, max_retries=0)
+        super().__init__(client, default_model=default_model)
+
+    def complete(self, messages, model, **kwargs):
+        if not self.json_mode:
+            kwargs.pop('response_format', None)
+        return super().complete(messages, model, **kwargs)
+
+
+class FakeBackend(LLMBackend):
+    """
+    A deterministic backend that replays recorded responses without any network access.
+
+    Responses are looked up by the same request key as the completion cache. Requests
+    without a recording get default_response. Latency is drawn per request from a
+    generator seeded with the request key, so a run takes the same time every time.
+
+    Attributes:
+        recordings (dict): The recorded response of every request key.
+        latency (float): The mean simulated latency in seconds.
+        jitter (float): The maximum deviation from latency, as a fraction of it.
+        calls (int): The number of requests served.
+    """
+
+    name = 'fake'
+    cache_namespace = 'fake'
+
+    def __init__(self, recordings_path=None, recordings=None, default_response='{}', latency=0.0, jitter=0.0,
+                 default_model=DEFAULT_MODEL):
+        """
+        Initialize the FakeBackend.
+
+        Args:
+            recordings_path (str): A JSONL file written by RecordingBackend to replay.
+            recordings (dict): Extra responses keyed by request key.
+            default_response (str or callable): The response to requests without a
+                                                recording, or a function of the messages
+                                                returning it. Defaults to '{}'.
+            latency (float): The mean simulated latency in seconds. Defaults to 0.
+            jitter (float): The maximum deviation from latency, as a fraction of it. Defaults to 0.
+            default_model (str): The model used when a request names none. Defaults to 'gpt-4o-mini'.
+        """
+        self.recordings = {}
+        if recordings_path is not None:
+            with open(recordings_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if line.strip():
+                        record = json.loads(line)
+                        self.recordings[record['key']] = record['response']
+        self.recordings.update(recordings or {})
+        self.default_response = default_response
+        self.latency = latency
+        self.jitter = jitter
+        self.default_model = default_model
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, model, **kwargs):
+        key = make_cache_key(model, messages, **kwargs)
+        if key in self.recordings:
+            content = self.recordings[key]
+        elif callable(self.default_response):
+            content = self.default_response(messages)
+        else:
+            content = self.default_response
+
+        if self.latency:
+            rng = random.Random(key)
+            time.sleep(max(0.0, self.latency * (1 + self.jitter * (2 * rng.random() - 1))))
+        with self._lock:
+            self.calls += 1
+
+        prompt_chars = sum(len(message.get('content') or '') for message in messages)
+        # A rough four characters per token keeps the usage figures plausible
+        return content, {
+            'prompt_tokens': math.ceil(prompt_chars / 4),
+            'cached_prompt_tokens': 0,
+            'completion_tokens': math.ceil(len(content or '') / 4),
+        }
+
+
+class RecordingBackend(LLMBackend):
+    """
+    A backend that passes requests to another backend and records every response.
+
+    The recording can be replayed offline with FakeBackend(recordings_path=...).
+
+    Attributes:
+        backend (LLMBackend): The backend requests are passed to.
+        path (str): The JSONL file responses are appended to.
+    """
+
+    name = 'recording'
+
+    def __init__(self, backend, path):
+        """
+        Initialize the RecordingBackend.
+
+        Args:
+            backend (LLMBackend): The backend requests are passed to.
+            path (str): The JSONL file responses are appended to.
+        """
+        self.backend = backend
+        self.path = path
+        self.default_model = backend.default_model
+        self.cache_namespace = backend.cache_namespace
+        self._lock = threading.Lock()
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    def complete(self, messages, model, **kwargs):
+        content, usage = self.backend.complete(messages, model, **kwargs)
+        record = {'key': make_cache_key(model, messages, **kwargs), 'model': model, 'response': content}
+        with self._lock, open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        return content, usage
+
+
+BACKENDS = {
+    'openai': OpenAIBackend,
+    'local': OpenAICompatibleBackend,
+    'fake': FakeBackend,
+}
+
+
+def create_backend(name='openai', record_path=None, **options):
+    """
+    Create a backend by name.
+
+    Args:
+        name (str): 'openai', 'local' or 'fake'. Defaults to 'openai'.
+        record_path (str): If given, wrap the backend in a RecordingBackend writing to this file.
+        **options: Arguments passed to the backend class.
+
+    Returns:
+        LLMBackend: The backend.
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown LLM backend: {name}")
+    backend = BACKENDS[name](**options)
+    return RecordingBackend(backend, record_path) if record_path else backend
+
+
+def backend_from_env():
+    """
+    Create the backend selected by the REGEN_LLM_* environment variables.
+
+    REGEN_LLM_BACKEND picks 'openai' (the default), 'local' or 'fake'. REGEN_LLM_MODEL
+    sets the default model, REGEN_LLM_BASE_URL the local server URL,
+    REGEN_LLM_RECORDINGS the file a fake backend replays and REGEN_LLM_LATENCY its
+    latency in seconds.
+
+    Returns:
+        LLMBackend: The backend.
+    """
+    name = os.environ.get('REGEN_LLM_BACKEND', 'openai')
+    options = {}
+    if os.environ.get('REGEN_LLM_MODEL'):
+        options['default_model'] = os.environ['REGEN_LLM_MODEL']
+    if name == 'local' and os.environ.get('REGEN_LLM_BASE_URL'):
+        options['base_url'] = os.environ['REGEN_LLM_BASE_URL']
+    if name == 'fake':
+        options['recordings_path'] = os.environ.get('REGEN_LLM_RECORDINGS')
+        options['latency'] = float(os.environ.get('REGEN_LLM_LATENCY', 0))
+    return create_backend(name, **options)
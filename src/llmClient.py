@@ -0,0 +1,270 @@
+"""
+LLM Client Module.
+
+This module provides a shared, connection-pooled OpenAI client and a helper that sends
+chat completion requests through an optional rate limiter, retrying failed calls with
+exponential backoff. Requests go to the process-wide LLM backend (OpenAI by default,
+see llmBackends), and responses are served from a completion cache when the same
+request was sent before.
+"""
+
+import random
+import threading
+import time
+from collections import namedtuple
+
+from completionCache import SQLiteCompletionCache, make_cache_key
+from llmBackends import DEFAULT_MODEL, LLMBackend, OpenAIBackend, backend_from_env
+
+TokenUsage = namedtuple('TokenUsage', ['model', 'prompt_tokens', 'cached_prompt_tokens', 'completion_tokens',
+                                       'from_cache'])
+
+_client = None
+_client_lock = threading.Lock()
+
+_completion_cache = None
+_completion_cache_set = False
+
+_backend = None
+
+
+def get_openai_client():
+    """
+    Get the process-wide OpenAI client, creating it on first use.
+
+    The client keeps a pooled HTTP connection and is safe to share between threads,
+    so reusing it avoids a new connection handshake for every request. Its built-in
+    retries are disabled, since create_completion already retries with backoff.
+
+    Returns:
+        OpenAI: The shared OpenAI client.
+    """
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                # The openai package is imported on first use to keep startup fast
+                from openai import OpenAI
+                _client = OpenAI(max_retries=0)
+    return _client
+
+
+def retryable_errors():
+    """
+    Get the API errors worth retrying; anything else (bad request, auth) fails immediately.
+
+    Returns:
+        tuple: The retryable exception classes.
+    """
+    try:
+        from openai import APIConnectionError, APITimeoutError, InternalServerError, RateLimitError
+    except ImportError:
+        # Without the openai package only custom clients can be used, and nothing is retried
+        return ()
+    return (APIConnectionError, APITimeoutError, InternalServerError, RateLimitError)
+
+
+def get_backend():
+    """
+    Get the process-wide LLM backend, creating it from the REGEN_LLM_* environment
+    variables on first use.
+
+    Returns:
+        LLMBackend: The active backend.
+    """
+    global _backend
+    if _backend is None:
+        with _client_lock:
+            if _backend is None:
+                _backend = backend_from_env()
+    return _backend
+
+
+def set_backend(backend):
+    """
+    Replace the process-wide LLM backend.
+
+    Args:
+        backend (LLMBackend): The backend to send requests to, or None to recreate it
+                              from the environment on next use.
+    """
+    global _backend
+    with _client_lock:
+        _backend = backend
+
+
+def resolve_backend(client=None):
+    """
+    Get the backend a request should be sent to.
+
+    Args:
+        client (OpenAI or LLMBackend): A backend, or an OpenAI client to wrap in one.
+                                       Defaults to the process-wide backend.
+
+    Returns:
+        LLMBackend: The backend.
+    """
+    if client is None:
+        return get_backend()
+    if isinstance(client, LLMBackend):
+        return client
+    return OpenAIBackend(client)
+
+
+def completion_cache_key(backend, model, messages, **kwargs):
+    """
+    Build the completion cache key of a request to a backend.
+
+    Args:
+        backend (LLMBackend): The backend the request is sent to.
+        model (str): The model of the request.
+        messages (list of dict): The chat messages of the request.
+        **kwargs: The extra request parameters.
+
+    Returns:
+        str: The cache key.
+    """
+    return make_cache_key(model, messages, namespace=backend.cache_namespace, **kwargs)
+
+
+def get_completion_cache():
+    """
+    Get the process-wide completion cache, creating the default SQLite cache on first use.
+
+    Returns:
+        CompletionCache: The active completion cache, or None if caching is disabled.
+    """
+    global _completion_cache, _completion_cache_set
+    if not _completion_cache_set:
+        with _client_lock:
+            if not _completion_cache_set:
+                _completion_cache = SQLiteCompletionCache()
+                _completion_cache_set = True
+    return _completion_cache
+
+
+def set_completion_cache(cache):
+    """
+    Replace the process-wide completion cache.
+
+    Args:
+        cache (CompletionCache): The cache backend to use, or None to disable caching.
+    """
+    global _completion_cache, _completion_cache_set
+    with _client_lock:
+        _completion_cache = cache
+        _completion_cache_set = True
+
+
+def create_completion(messages, model=None, client=None, rate_limiter=None,
+                      max_retries=3, backoff=1.0, use_cache=True, usage_log=None, **kwargs):
+    """
+    Send a chat completion request and return the message content.
+
+    Args:
+        messages (list of dict): The chat messages to send.
+        model (str): The model to use. Defaults to the backend's default model.
+        client (OpenAI or LLMBackend): The backend, or an OpenAI client, to send the
+                                       request to. Defaults to the process-wide backend.
+        rate_limiter (TokenBucket): An optional throttle acquired before every attempt.
+        max_retries (int): The number of retries after the first failed attempt. Defaults to 3.
+        backoff (float): The base delay in seconds, doubled after every failure. Defaults to 1.0.
+        use_cache (bool): Whether to look up and store the response in the completion cache.
+                          Defaults to True.
+        usage_log (list): If given, a TokenUsage of the request is appended to it. A
+                          response served from the completion cache counts no tokens.
+        **kwargs: Extra request parameters passed to the backend.
+
+    Returns:
+        str: The content of the first completion choice.
+
+    Raises:
+        Exception: The last retryable error once all retries are exhausted, or any
+                   non-retryable error raised by the client.
+    """
+    backend = resolve_backend(client)
+    model = model or backend.default_model
+
+    cache = get_completion_cache() if use_cache else None
+    if cache is not None:
+        cache_key = completion_cache_key(backend, model, messages, **kwargs)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            if usage_log is not None:
+                usage_log.append(TokenUsage(model, 0, 0, 0, True))
+            return cached
+
+    retryable = retryable_errors()
+
+    for attempt in range(max_retries + 1):
+        if rate_limiter is not None:
+            rate_limiter.acquire()
+        try:
+            content, usage = backend.complete(messages, model, **kwargs)
+            if usage_log is not None:
+                usage_log.append(TokenUsage(model=model, from_cache=False, **usage))
+            if cache is not None and content is not None:
+                cache.set(cache_key, content)
+            return content
+        except retryable:
+            if attempt == max_retries:
+                raise
+            # Exponential backoff with jitter so concurrent workers do not retry in lockstep
+            time.sleep(backoff * (2 ** attempt) * (1 + random.random()))
+
+
+def summarize_usage(usage_log):
+    """
+    Total the token counts of many requests.
+
+    Args:
+        usage_log (list of TokenUsage): The recorded requests.
+
+    Returns:
+        dict: The number of requests and of completion cache hits, the prompt, cached
+              prompt and completion token totals, and the share of prompt tokens served
+              from the provider's prompt cache.
+    """
+    prompt_tokens = sum(usage.prompt_tokens for usage in usage_log)
+    cached_prompt_tokens = sum(usage.cached_prompt_tokens for usage in usage_log)
+    return {
+        'requests': len(usage_log),
+        'completion_cache_hits': sum(usage.from_cache for usage in usage_log),
+        'prompt_tokens': prompt_tokens,
+        'cached_prompt_tokens': cached_prompt_tokens,
+        'completion_tokens': sum(usage.completion_tokens for usage in usage_log),
+        'prompt_cache_ratio': cached_prompt_tokens / prompt_tokens if prompt_tokens else 0.0,
+    }
+
+
+def store_completion(messages, content, model=None, client=None, **kwargs):
+    """
+    Cache a response for a request, for example after repairing an unusable one.
+
+    Args:
+        messages (list of dict): The chat messages of the request.
+        content (str): The response text.
+        model (str): The model of the request. Defaults to the backend's default model.
+        client (OpenAI or LLMBackend): The backend of the request. Defaults to the process-wide backend.
+        **kwargs: The extra request arguments that were passed to create_completion.
+    """
+    cache = get_completion_cache()
+    if cache is not None and content is not None:
+        backend = resolve_backend(client)
+        cache.set(completion_cache_key(backend, model or backend.default_model, messages, **kwargs), content)
+
+
+def invalidate_completion(messages, model=None, client=None, **kwargs):
+    """
+    Remove a cached response, for example after it turned out to be unparseable.
+
+    Args:
+        messages (list of dict): The chat messages of the request.
+        model (str): The model of the request. Defaults to the backend's default model.
+        client (OpenAI or LLMBackend): The backend of the request. Defaults to the process-wide backend.
+        **kwargs: The extra request arguments that were passed to create_completion.
+    """
+    cache = get_completion_cache()
+    if cache is not None:
+        backend = resolve_backend(client)
+        cache.delete(completion_cache_key(backend, model or backend.default_model, messages, **kwargs))
@@ -0,0 +1,74 @@
+"""
+Model Registry Module.
+
+This module loads each embedding model once per process and hands the same instance
+to every caller. Under Streamlit the loader is wrapped in st.cache_resource, so the
+model also survives reruns and is shared between sessions.
+"""
+
+import sys
+import threading
+
+_models = {}
+_models_lock = threading.Lock()
+_streamlit_loader = None
+
+
+def _load_model(model_name, backend):
+    if backend == 'torch':
+        from sentence_transformers import SentenceTransformer
+        return SentenceTransformer(model_name)
+    if backend == 'onnx':
+        from onnxEncoder import OnnxSentenceEncoder
+        return OnnxSentenceEncoder(model_name)
+    raise ValueError(f"Unknown backend: {backend}")
+
+
+def _running_in_streamlit():
+    # A Streamlit app has imported streamlit already; CLI and batch runs should not pay for it
+    if 'streamlit' not in sys.modules:
+        return False
+    try:
+        from streamlit import runtime
+    except ImportError:
+        return False
+    return runtime.exists()
+
+
+def get_model(model_name='paraphrase-MiniLM-L6-v2', backend='torch'):
+    """
+    Get the shared instance of an embedding model, loading it on first use.
+
+    Args:
+        model_name (str): The name of the Sentence Transformer model. Defaults to 'paraphrase-MiniLM-L6-v2'.
+        backend (str): 'torch' for a SentenceTransformer or 'onnx' for an
+                       OnnxSentenceEncoder. Defaults to 'torch'.
+
+    Returns:
+        The loaded model, shared by all callers in the process.
+    """
+    global _streamlit_loader
+    key = (model_name, backend)
+    if key in _models:
+        return _models[key]
+
+    with _models_lock:
+        if key not in _models:
+            if _running_in_streamlit():
+                if _streamlit_loader is None:
+                    import streamlit as st
+                    _streamlit_loader = st.cache_resource(show_spinner="Loading embedding model...")(_load_model)
+                _models[key] = _streamlit_loader(model_name, backend)
+            else:
+                _models[key] = _load_model(model_name, backend)
+        return _models[key]
+
+
+def clear_models():
+    """
+    Drop every loaded model so the next get_model call reloads it.
+    """
+    with _models_lock:
+        _models.clear()
+        if _streamlit_loader is not None:
+            _streamlit_loader.clear()
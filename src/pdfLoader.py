@@ -1,18 +1,147 @@
-import PyPDF2
+import importlib
+import mmap
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 
-def loadPdfContent(file_path):
+# Text extraction backends, fastest first
+PDF_BACKENDS = ['pymupdf', 'pypdf', 'PyPDF2', 'pdfminer']
+
+_BACKEND_MODULES = {
+    'pymupdf': 'fitz',
+    'pypdf': 'pypdf',
+    'PyPDF2': 'PyPDF2',
+    'pdfminer': 'pdfminer.high_level',
+}
+
+_text_cache = OrderedDict()
+_text_cache_lock = threading.Lock()
+TEXT_CACHE_SIZE = 128
+
+
+def available_backends():
+    """
+    List the PDF text extraction backends that can be imported.
+
+    Returns:
+        list of str: The installed backend names, fastest first.
+    """
+    backends = []
+    for name in PDF_BACKENDS:
+        try:
+            importlib.import_module(_BACKEND_MODULES[name])
+            backends.append(name)
+        except ImportError:
+            pass
+    return backends
+
+
+@lru_cache(maxsize=None)
+def get_default_backend():
+    """
+    Pick the fastest installed PDF backend, probing the installed libraries only once.
+
+    Returns:
+        str: The name of the backend.
+
+    Raises:
+        ImportError: If none of the supported PDF libraries is installed.
+    """
+    backends = available_backends()
+    if not backends:
+        raise ImportError(f"No PDF backend installed; install one of {', '.join(PDF_BACKENDS)}")
+    return backends[0]
+
+
+@contextmanager
+def _open_mapped(file_path):
+    """
+    Open a file as a read-only memory map, falling back to a plain file when it cannot be mapped.
+    """
+    with open(file_path, 'rb') as file:
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # Empty files cannot be memory-mapped
+            yield file
+            return
+        try:
+            yield mapped
+        finally:
+            mapped.close()
+
+
+def iter_pdf_pages(file_path, backend=None):
+    """
+    Lazily extract the text of a PDF file page by page.
+
+    Args:
+        file_path (str): The path to the PDF file.
+        backend (str): The backend to use, one of PDF_BACKENDS. Defaults to the fastest installed one.
+
+    Yields:
+        str: The text of each page, in page order.
+    """
+    backend = backend or get_default_backend()
+
+    if backend == 'pymupdf':
+        import fitz
+        # PyMuPDF memory-maps the file itself
+        with fitz.open(file_path) as document:
+            for page in document:
+                yield page.get_text()
+        return
+
+    if backend == 'pdfminer':
+        from pdfminer.high_level import extract_pages
+        from pdfminer.layout import LTTextContainer
+        # pdfminer only accepts paths or real file objects, and parses pages lazily itself
+        for page_layout in extract_pages(file_path):
+            yield ''.join(element.get_text() for element in page_layout
+                          if isinstance(element, LTTextContainer))
+        return
+
+    if backend not in ('pypdf', 'PyPDF2'):
+        raise ValueError(f"Unknown PDF backend: {backend}")
+
+    with _open_mapped(file_path) as stream:
+        reader = importlib.import_module(backend).PdfReader(stream)
+        for page in reader.pages:
+            yield page.extract_text() or ''
+
+
+def loadPdfContent(file_path, backend=None, use_cache=True):
     """
     Load the content of a PDF file.
 
+    Extracted text is cached in memory keyed by the file's path, modification time and
+    size, so loading an unchanged PDF again returns immediately.
+
     Args:
         file_path (str): The path to the PDF file.
+        backend (str): The backend to use, one of PDF_BACKENDS. Defaults to the fastest installed one.
+        use_cache (bool): Whether to use the text cache. Defaults to True.
 
     Returns:
         str: The content of the PDF file.
     """
-    with open(file_path, 'rb') as file:
-        reader = PyPDF2.PdfReader (file)
-        content = ''
-        for page in range(len(reader.pages)):
-            content += reader.pages[page].extract_text()
+    backend = backend or get_default_backend()
+    stat = os.stat(file_path)
+    cache_key = (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size, backend)
+
+    if use_cache:
+        with _text_cache_lock:
+            if cache_key in _text_cache:
+                _text_cache.move_to_end(cache_key)
+                return _text_cache[cache_key]
+
+    content = ''.join(iter_pdf_pages(file_path, backend))
+
+    if use_cache:
+        with _text_cache_lock:
+            _text_cache[cache_key] = content
+            while len(_text_cache) > TEXT_CACHE_SIZE:
+                _text_cache.popitem(last=False)
     return content
@@ -0,0 +1,192 @@
+"""
+Pipeline State Store Module.
+
+This module records the progress and outputs of every job through every pipeline
+stage in a local SQLite database. Both the batch pipeline and the Streamlit app read
+it before doing any work, so a run that failed part way resumes where it stopped and
+earlier results can be shown again without recomputing them. Each consumer works in
+its own namespace, since the app and the batch pipeline store different outputs under
+the same stage names and keys.
+"""
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+DONE = 'done'
+SKIPPED = 'skipped'
+FAILED = 'failed'
+
+
+def hash_resume(resume_json):
+    """
+    Compute a short fingerprint of a resume, used to key resume-dependent stage outputs.
+
+    Args:
+        resume_json (dict): The resume as a Python dictionary.
+
+    Returns:
+        str: The first 16 hex digits of the SHA-256 of the canonical resume JSON.
+    """
+    canonical = json.dumps(resume_json, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(canonical.encode('utf-8')).hexdigest()[:16]
+
+
+class PipelineStateStore:
+    """
+    A class to store per-job, per-stage pipeline state in SQLite.
+
+    Every (stage, key) pair has a status of DONE, SKIPPED or FAILED, the JSON-encoded
+    output of the stage, and the error message of the last failure.
+
+    Attributes:
+        db_path (str): The path of the SQLite database file.
+        namespace (str): Prefixed to every stage name, so stores of different consumers
+                         sharing one database never read each other's outputs.
+    """
+
+    def __init__(self, db_path='../cache/pipeline_state.sqlite', namespace=None):
+        """
+        Initialize the PipelineStateStore.
+
+        Args:
+            db_path (str): The path of the SQLite database file. Defaults to '../cache/pipeline_state.sqlite'.
+            namespace (str): The consumer's namespace, e.g. 'app' or 'batch'. Defaults to
+                             None, which shares the stage names with other un-namespaced stores.
+        """
+        self.db_path = db_path
+        self.namespace = namespace
+        self._lock = threading.Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS stage_state ("
+                "stage TEXT NOT NULL, key TEXT NOT NULL, status TEXT NOT NULL, "
+                "output TEXT, error TEXT, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (stage, key))"
+            )
+
+    def _stage(self, stage):
+        return stage if self.namespace is None else f"{self.namespace}/{stage}"
+
+    def _write(self, stage, key, status, output=None, error=None):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO stage_state (stage, key, status, output, error, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self._stage(stage), str(key), status, json.dumps(output, ensure_ascii=False) if output is not None else None,
+                 error, time.time())
+            )
+
+    def get(self, stage, key):
+        """
+        Look up the output of a finished stage.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The job ID, or another key identifying the unit of work.
+
+        Returns:
+            The stage output for DONE, False for SKIPPED, or None if the stage has not
+            finished this key (including after a failure).
+        """
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT status, output FROM stage_state WHERE stage = ? AND key = ?", (self._stage(stage), str(key))
+            ).fetchone()
+        if row is None or row[0] == FAILED:
+            return None
+        if row[0] == SKIPPED:
+            return False
+        return json.loads(row[1])
+
+    def get_many(self, stage, keys):
+        """
+        Look up the outputs of a stage for many keys.
+
+        Args:
+            stage (str): The stage name.
+            keys (list of str): The keys to look up.
+
+        Returns:
+            list: One entry per key, as returned by get.
+        """
+        return [self.get(stage, key) for key in keys]
+
+    def record(self, stage, key, output):
+        """
+        Mark a stage as done for a key and store its output.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The job ID, or another key identifying the unit of work.
+            output: A JSON-serializable output.
+        """
+        self._write(stage, key, DONE, output=output)
+
+    def record_skipped(self, stage, key):
+        """
+        Mark a key as deliberately dropped by a stage, e.g. a job below the score threshold.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The job ID, or another key identifying the unit of work.
+        """
+        self._write(stage, key, SKIPPED)
+
+    def record_failure(self, stage, key, error):
+        """
+        Mark a stage as failed for a key, so the next run retries it.
+
+        Args:
+            stage (str): The stage name.
+            key (str): The job ID, or another key identifying the unit of work.
+            error (str): A description of the failure.
+        """
+        self._write(stage, key, FAILED, error=str(error))
+
+    def failures(self, stage=None):
+        """
+        List the recorded failures.
+
+        Args:
+            stage (str): Only list failures of this stage. Defaults to every stage.
+
+        Returns:
+            dict: The error message of every failed (stage, key) pair of this namespace.
+        """
+        query = "SELECT stage, key, error FROM stage_state WHERE status = ?"
+        params = [FAILED]
+        if stage is not None:
+            query += " AND stage = ?"
+            params.append(self._stage(stage))
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        prefix = '' if self.namespace is None else f"{self.namespace}/"
+        return {(row_stage[len(prefix):], key): error for row_stage, key, error in rows
+                if row_stage.startswith(prefix) and (prefix or '/' not in row_stage)}
+
+    def clear(self, stage=None):
+        """
+        Forget recorded state so it is recomputed.
+
+        Args:
+            stage (str): Only clear this stage. Defaults to every stage of this namespace.
+        """
+        with self._lock, self._connection:
+            if stage is not None:
+                self._connection.execute("DELETE FROM stage_state WHERE stage = ?", (self._stage(stage),))
+            elif self.namespace is None:
+                # Namespaced stages contain a '/', and belong to other consumers
+                self._connection.execute("DELETE FROM stage_state WHERE instr(stage, '/') = 0")
+            else:
+                prefix = f"{self.namespace}/"
+                self._connection.execute("DELETE FROM stage_state WHERE substr(stage, 1, ?) = ?",
+                                         (len(prefix), prefix))
@@ -0,0 +1,188 @@
+"""
+Prompt Builder Module.
+
+This module lays out chat prompts so provider-side prefix caching can reuse as much of
+each request as possible: static instructions go first in their own system message,
+followed by the resume, which stays the same across a batch, and the job description,
+which changes with every call, goes last. It also counts prompt tokens and trims job
+descriptions to a token budget, dropping boilerplate such as benefits and
+equal-opportunity statements before cutting into the description itself.
+"""
+
+import math
+import re
+from collections import namedtuple
+from functools import lru_cache
+
+from llmClient import DEFAULT_MODEL
+
+DEFAULT_JOB_TOKEN_BUDGET = 1500
+
+# Characters per token assumed when tiktoken is not installed
+APPROX_CHARS_PER_TOKEN = 4
+
+PromptStats = namedtuple('PromptStats', ['instruction_tokens', 'resume_tokens', 'job_tokens',
+                                         'total_tokens', 'untrimmed_job_tokens'])
+
+# Headings of job description sections that say nothing about the role itself
+BOILERPLATE_HEADING = re.compile(
+    r"^\s*(about (us|the company|the team|(?!(the )?(role|job|position|opportunity|you)\b)[\w&.,' -]{1,40})|"
+    r"benefits|perks|what we offer|why join( us)?|"
+    r"our (culture|values|mission)|equal (employment )?opportunity|eeo statement|disclaimer|"
+    r"privacy( notice| policy)?|how to apply)\b.{0,40}$",
+    re.IGNORECASE
+)
+# Bulleted or numbered list items, which belong to the section above them
+LIST_ITEM = re.compile(r"^\s*([-*•·▪◦‣–]|\d{1,2}[.)])\s+")
+# Boilerplate sentences that can appear anywhere
+BOILERPLATE_LINE = re.compile(
+    r"(equal opportunity employer|regardless of (race|age|gender)|reasonable accommodation|"
+    r"background check|e-verify|#LI-\w+|apply now|privacy (notice|policy)|recruitment fraud)",
+    re.IGNORECASE
+)
+
+
+@lru_cache(maxsize=None)
+def get_encoding(model=DEFAULT_MODEL):
+    """
+    Get the tiktoken encoding of a model.
+
+    Args:
+        model (str): The model name. Defaults to DEFAULT_MODEL.
+
+    Returns:
+        tiktoken.Encoding: The encoding, or None if tiktoken is not installed.
+    """
+    try:
+        import tiktoken
+    except ImportError:
+        return None
+    try:
+        return tiktoken.encoding_for_model(model)
+    except KeyError:
+        return tiktoken.get_encoding('o200k_base')
+
+
+def count_tokens(text, model=DEFAULT_MODEL):
+    """
+    Count the tokens of a text, approximately if tiktoken is not installed.
+
+    Args:
+        text (str): The text.
+        model (str): The model whose tokenizer to use. Defaults to DEFAULT_MODEL.
+
+    Returns:
+        int: The number of tokens.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        return math.ceil(len(text) / APPROX_CHARS_PER_TOKEN)
+    return len(encoding.encode(text, disallowed_special=()))
+
+
+def truncate_to_tokens(text, max_tokens, model=DEFAULT_MODEL):
+    """
+    Cut a text down to at most max_tokens tokens, keeping its beginning.
+
+    Args:
+        text (str): The text.
+        max_tokens (int): The token budget.
+        model (str): The model whose tokenizer to use. Defaults to DEFAULT_MODEL.
+
+    Returns:
+        str: The text, shortened if it was over budget.
+    """
+    encoding = get_encoding(model)
+    if encoding is None:
+        max_chars = max_tokens * APPROX_CHARS_PER_TOKEN
+        if len(text) <= max_chars:
+            return text
+        # Cut at a word boundary so no half word is left at the end
+        return text[:max_chars].rsplit(None, 1)[0] if ' ' in text[:max_chars] else text[:max_chars]
+    tokens = encoding.encode(text, disallowed_special=())
+    return text if len(tokens) <= max_tokens else encoding.decode(tokens[:max_tokens])
+
+
+def strip_boilerplate(job_description):
+    """
+    Remove boilerplate sections and sentences from a job description.
+
+    A section starts at a heading matching BOILERPLATE_HEADING and runs until the next
+    short heading-like line. List items are never headings, so a bulleted section is
+    dropped as a whole.
+
+    Args:
+        job_description (str): The job description text.
+
+    Returns:
+        str: The job description without boilerplate.
+    """
+    kept = []
+    in_boilerplate = False
+    for line in job_description.splitlines():
+        stripped = line.strip()
+        is_heading = 0 < len(stripped) <= 60 and not stripped.endswith('.') and not LIST_ITEM.match(stripped)
+        if is_heading:
+            in_boilerplate = bool(BOILERPLATE_HEADING.match(stripped))
+        if in_boilerplate or BOILERPLATE_LINE.search(stripped):
+            continue
+        kept.append(line)
+    return re.sub(r'\n{3,}', '\n\n', "\n".join(kept)).strip()
+
+
+def trim_job_description(job_description, max_tokens=DEFAULT_JOB_TOKEN_BUDGET, model=DEFAULT_MODEL):
+    """
+    Fit a job description into a token budget.
+
+    Descriptions within budget are returned unchanged. Longer ones first lose their
+    boilerplate, and are then cut to the budget if still too long.
+
+    Args:
+        job_description (str): The job description text.
+        max_tokens (int): The token budget, or None for no limit. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+        model (str): The model whose tokenizer to use. Defaults to DEFAULT_MODEL.
+
+    Returns:
+        str: The job description, trimmed if it was over budget.
+    """
+    if max_tokens is None or count_tokens(job_description, model) <= max_tokens:
+        return job_description
+    trimmed = strip_boilerplate(job_description)
+    return truncate_to_tokens(trimmed, max_tokens, model)
+
+
+def build_messages(instructions, resume_section, job_description, max_job_tokens=DEFAULT_JOB_TOKEN_BUDGET,
+                   model=DEFAULT_MODEL):
+    """
+    Build chat messages ordered from most to least shared between calls.
+
+    Args:
+        instructions (str): The static instructions, identical for every call.
+        resume_section (str): The resume part of the prompt, identical across a batch.
+        job_description (str): The job description, different for every call.
+        max_job_tokens (int): The token budget of the job description, or None for no
+                              limit. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+        model (str): The model whose tokenizer to use. Defaults to DEFAULT_MODEL.
+
+    Returns:
+        tuple: A tuple containing:
+            - list of dict: The system and user messages.
+            - PromptStats: The token count of every part of the prompt.
+    """
+    job_section = trim_job_description(job_description, max_job_tokens, model)
+    messages = [
+        {"role": "system", "content": instructions},
+        {"role": "user", "content": f"{resume_section}\n\n**Job Description:** {job_section}"},
+    ]
+
+    instruction_tokens = count_tokens(instructions, model)
+    resume_tokens = count_tokens(resume_section, model)
+    job_tokens = count_tokens(job_section, model)
+    stats = PromptStats(
+        instruction_tokens=instruction_tokens,
+        resume_tokens=resume_tokens,
+        job_tokens=job_tokens,
+        total_tokens=instruction_tokens + resume_tokens + job_tokens,
+        untrimmed_job_tokens=job_tokens if job_section is job_description else count_tokens(job_description, model),
+    )
+    return messages, stats
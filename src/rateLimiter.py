@@ -0,0 +1,75 @@
+"""
+Rate Limiting Module.
+
+This module provides a thread-safe token-bucket throttle shared by code that calls
+rate-limited services concurrently, such as the OpenAI API or LinkedIn endpoints.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    A thread-safe token bucket.
+
+    Tokens are added continuously at a fixed rate up to the bucket capacity, and each
+    call to acquire removes tokens, blocking until enough are available.
+
+    Attributes:
+        rate (float): The number of tokens added per second.
+        capacity (float): The maximum number of tokens the bucket can hold.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        Initialize the TokenBucket.
+
+        Args:
+            rate (float): The number of tokens added per second.
+            capacity (float): The maximum burst size. Defaults to max(rate, 1).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(self.rate, 1.0)
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def per_minute(cls, requests_per_minute, capacity=None):
+        """
+        Create a TokenBucket from a requests-per-minute limit.
+
+        Args:
+            requests_per_minute (float): The number of requests allowed per minute.
+            capacity (float): The maximum burst size. Defaults to max(rate, 1).
+
+        Returns:
+            TokenBucket: The configured bucket.
+        """
+        return cls(requests_per_minute / 60.0, capacity)
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    def acquire(self, tokens=1):
+        """
+        Remove tokens from the bucket, blocking until they are available.
+
+        Args:
+            tokens (float): The number of tokens to remove. Defaults to 1.
+        """
+        if tokens > self.capacity:
+            raise ValueError("cannot acquire more tokens than the bucket capacity")
+        while True:
+            with self._lock:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                wait_time = (tokens - self._tokens) / self.rate
+            time.sleep(wait_time)
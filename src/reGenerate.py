@@ -5,9 +5,99 @@ This module provides functionality to generate and optimize resumes based on job
 It uses OpenAI's GPT model to refine resume content and generate tailored resumes.
 """
 
-from openai import OpenAI
+import copy
 import json
+import logging
+from concurrent.futures import ThreadPoolExecutor
 from resumeGenerator import generate_resume_from_json
+from jsonResponse import request_json
+from rateLimiter import TokenBucket
+from resumeRestructre import drop_unknown_keys, validate_resume_json
+from promptBuilder import DEFAULT_JOB_TOKEN_BUDGET, build_messages
+
+REGEN_MODES = ('full', 'patch')
+
+logger = logging.getLogger(__name__)
+
+
+REGEN_INSTRUCTIONS = """You are given a resume in JSON format and a job description. Your task is to update the resume to make it as relevant as possible to the job description while strictly preserving the structure of the JSON.
+
+**Instructions:**
+1. Rephrase, expand, and optimize the content within the JSON to reflect the skills, qualifications, and experiences that align with the job description.
+2. Where appropriate, add details, achievements, and relevant context that would make the candidate stand out for the job.
+3. Ensure the JSON structure remains completely intact. The keys, nested objects, arrays, and their structure must not be changed. Only modify the values where necessary.
+4. Do **not** fabricate any facts. All changes should be based on plausible improvements of the existing information.
+5. Focus on aligning the resume with the job responsibilities, required qualifications, and desired skills as described in the job description."""
+
+PATCH_INSTRUCTIONS = """You are given the tailorable sections of a resume in JSON format and a job description. Your task is to decide which of these sections should change to make the resume as relevant as possible to the job description, and to return only those changes as a JSON patch.
+
+**Instructions:**
+1. Return a JSON object with any of these optional keys, leaving out everything that does not need to change:
+   - "summary": the rewritten professional summary as a string.
+   - "skills": the complete rewritten skills object, mapping skill category names to lists of skills.
+   - "experience": a list of objects of the form {"index": <experience index>, "responsibilities": {"<bullet index>": "<rewritten bullet>"}, "append": ["<new bullet>"]}, where "responsibilities" holds only the bullets that change and "append" is optional.
+2. Rephrase and optimize the content to reflect the skills, qualifications and experiences that align with the job description.
+3. Do **not** fabricate any facts. All changes should be based on plausible improvements of the existing information.
+4. Only use experience and bullet indices that appear in the resume sections below.
+5. Give the output in JSON format only and dont add anything except the json to the output."""
+
+
+def tailorable_sections(resume_json):
+    """
+    Extract the resume sections sent in patch mode, with experience and bullet indices.
+
+    Args:
+        resume_json (dict): The original resume as a Python dictionary.
+
+    Returns:
+        dict: The summary, skills and indexed experience bullets.
+    """
+    return {
+        "summary": resume_json.get("summary", ""),
+        "skills": resume_json.get("skills", {}),
+        "experience": [
+            {"index": i, "title": job.get("title", ""), "company": job.get("company", ""),
+             "responsibilities": {str(j): bullet for j, bullet in enumerate(job.get("responsibilities") or [])}}
+            for i, job in enumerate(resume_json.get("experience") or [])
+        ],
+    }
+
+
+def build_regen_messages(job_description, resume_json, mode='full', max_job_tokens=DEFAULT_JOB_TOKEN_BUDGET):
+    """
+    Build the chat messages of a regeneration request.
+
+    The static instructions come first, then the resume, then the job description, so
+    every request of a batch for the same resume shares the longest possible prefix
+    and hits the provider's prompt cache.
+
+    Args:
+        job_description (str): The job description to tailor the resume to.
+        resume_json (dict or str): The original resume, as a dictionary or JSON text.
+        mode (str): 'full' or 'patch', as for regen_resume_json. Defaults to 'full'.
+        max_job_tokens (int): The token budget of the job description, or None for no
+                              limit. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+
+    Returns:
+        tuple: A tuple containing:
+            - list of dict: The chat messages.
+            - PromptStats: The token count of every part of the prompt.
+    """
+    if mode not in REGEN_MODES:
+        raise ValueError(f"Unknown regeneration mode: {mode}")
+
+    if mode == 'patch':
+        if isinstance(resume_json, str):
+            resume_json = json.loads(resume_json)
+        resume_section = f"**Resume Sections:** {json.dumps(tailorable_sections(resume_json), ensure_ascii=False, separators=(',', ':'))}"
+        instructions = PATCH_INSTRUCTIONS
+    else:
+        if not isinstance(resume_json, str):
+            resume_json = json.dumps(resume_json, ensure_ascii=False)
+        resume_section = f"**Resume JSON:** {resume_json}"
+        instructions = REGEN_INSTRUCTIONS
+
+    return build_messages(instructions, resume_section, job_description, max_job_tokens=max_job_tokens)
 
 
 def generate_regen_prompt(job_description, resume_json):
@@ -24,24 +114,91 @@ def generate_regen_prompt(job_description, resume_json):
     Returns:
         str: A formatted prompt for the AI model.
     """
-    regen_prompt = f"""
-    You are given a resume in JSON format and a job description. Your task is to update the resume to make it as relevant as possible to the job description while strictly preserving the structure of the JSON.
+    messages, _ = build_regen_messages(job_description, resume_json, mode='full', max_job_tokens=None)
+    return "\n\n".join(message["content"] for message in messages)
+
+
+def generate_patch_prompt(job_description, resume_json):
+    """
+    Generate a prompt asking only for the resume sections that should change.
 
-    **Instructions:**
-    1. Rephrase, expand, and optimize the content within the JSON to reflect the skills, qualifications, and experiences that align with the job description.
-    2. Where appropriate, add details, achievements, and relevant context that would make the candidate stand out for the job.
-    3. Ensure the JSON structure remains completely intact. The keys, nested objects, arrays, and their structure must not be changed. Only modify the values where necessary.
-    4. Do **not** fabricate any facts. All changes should be based on plausible improvements of the existing information.
-    5. Focus on aligning the resume with the job responsibilities, required qualifications, and desired skills as described in the job description.
+    Only the summary, skills and indexed experience bullets are sent, and the model
+    answers with a small patch instead of the whole resume, so both prompt and output
+    tokens stay far below a full rewrite.
 
-    **Resume JSON:** {resume_json}
+    Args:
+        job_description (str): The job description to tailor the resume to.
+        resume_json (dict): The original resume as a Python dictionary.
 
-    **Job Description:** {job_description}
+    Returns:
+        str: A formatted prompt for the AI model.
+    """
+    messages, _ = build_regen_messages(job_description, resume_json, mode='patch', max_job_tokens=None)
+    return "\n\n".join(message["content"] for message in messages)
+
+
+def apply_resume_patch(resume_json, patch):
+    """
+    Merge a patch returned for generate_patch_prompt into a copy of the resume.
+
+    Args:
+        resume_json (dict): The original resume as a Python dictionary.
+        patch (dict): The patch, with optional 'summary', 'skills' and 'experience' keys.
+
+    Returns:
+        dict: The patched resume; resume_json itself is left unchanged.
+
+    Raises:
+        ValueError: If the patch is malformed or the patched resume no longer matches
+                    the resume structure.
     """
-    return regen_prompt
+    if not isinstance(patch, dict):
+        raise ValueError(f"Resume patch should be an object, got {type(patch).__name__}")
+    unknown = set(patch) - {"summary", "skills", "experience"}
+    if unknown:
+        raise ValueError(f"Resume patch has unexpected sections: {', '.join(sorted(unknown))}")
+
+    patched = copy.deepcopy(resume_json)
+    if "summary" in patch:
+        patched["summary"] = patch["summary"]
+    if "skills" in patch:
+        patched["skills"] = patch["skills"]
+
+    experience = patched.get("experience") or []
+    edits = patch.get("experience") or []
+    if not isinstance(edits, list):
+        raise ValueError(f"Resume patch 'experience' should be a list, got {type(edits).__name__}")
+    for edit in edits:
+        index = edit.get("index") if isinstance(edit, dict) else None
+        # bool is a subclass of int, but true and false are not experience indices
+        if type(index) is not int or not 0 <= index < len(experience):
+            raise ValueError(f"Resume patch edits an unknown experience entry: {edit!r}")
+
+        replacements = edit.get("responsibilities") or {}
+        if not isinstance(replacements, dict) or not all(isinstance(text, str) for text in replacements.values()):
+            raise ValueError(f"Resume patch 'responsibilities' of experience {index} should map bullet "
+                             f"indices to strings, got {replacements!r}")
+        appended = edit.get("append") or []
+        if not isinstance(appended, list) or not all(isinstance(text, str) for text in appended):
+            raise ValueError(f"Resume patch 'append' of experience {index} should be a list of strings, "
+                             f"got {appended!r}")
+
+        bullets = list(experience[index].get("responsibilities") or [])
+        for bullet_index, text in replacements.items():
+            if not str(bullet_index).isdigit() or int(bullet_index) >= len(bullets):
+                raise ValueError(f"Resume patch edits an unknown bullet {bullet_index} of experience {index}")
+            bullets[int(bullet_index)] = text
+        bullets += appended
+        experience[index]["responsibilities"] = bullets
+
+    errors = validate_resume_json(patched)
+    if errors:
+        raise ValueError("Patched resume does not match the resume structure: " + "; ".join(errors))
+    return patched
 
 
-def regen_resume_json(job_description, resume_json):
+def regen_resume_json(job_description, resume_json, client=None, rate_limiter=None, mode='full',
+                      max_job_tokens=DEFAULT_JOB_TOKEN_BUDGET, usage_log=None):
     """
     Regenerate the resume JSON based on the job description.
 
@@ -51,34 +208,49 @@ def regen_resume_json(job_description, resume_json):
     Args:
         job_description (str): The job description to tailor the resume to.
         resume_json (str): The original resume in JSON format.
+        client (OpenAI or LLMBackend): The backend to use. Defaults to the process-wide backend.
+        rate_limiter (TokenBucket): An optional throttle for the API calls.
+        mode (str): 'full' to have the model rewrite the whole resume, or 'patch' to ask
+                    only for changed sections and merge them locally. Defaults to 'full'.
+        max_job_tokens (int): The token budget of the job description, or None for no
+                              limit. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+        usage_log (list): If given, the TokenUsage of the request is appended to it.
 
     Returns:
         dict: The regenerated resume as a Python dictionary.
     """
-    regen_prompt = generate_regen_prompt(job_description, resume_json)
+    if mode == 'patch' and isinstance(resume_json, str):
+        resume_json = json.loads(resume_json)
 
-    client = OpenAI()
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "user", "content": regen_prompt}
-        ]
-    )
-    result = completion.choices[0].message.content
+    messages, stats = build_regen_messages(job_description, resume_json, mode=mode, max_job_tokens=max_job_tokens)
+    if stats.job_tokens < stats.untrimmed_job_tokens:
+        logger.info("Trimmed job description from %d to %d tokens", stats.untrimmed_job_tokens, stats.job_tokens)
+    logger.debug("Regen prompt tokens: %d instructions, %d resume, %d job description, %d total",
+                 stats.instruction_tokens, stats.resume_tokens, stats.job_tokens, stats.total_tokens)
 
-    try:
-        parsed_json = json.loads(result)
-    except:
-        # Remove the leading and trailing backticks and 'json' identifier
-        json_string = result.strip().lstrip('```json').rstrip('```')
+    def validate(parsed_json):
+        if mode == 'patch':
+            return apply_resume_patch(resume_json, parsed_json)
+        parsed_json = drop_unknown_keys(parsed_json)
+        errors = validate_resume_json(parsed_json)
+        if errors:
+            raise ValueError("Regenerated resume does not match the resume structure: " + "; ".join(errors))
+        return parsed_json
 
-        # Parse the JSON string
-        parsed_json = json.loads(json_string)
+    # Malformed or invalid output gets one repair request instead of failing the job
+    parsed_json = request_json(
+        messages,
+        validate=validate,
+        client=client,
+        rate_limiter=rate_limiter,
+        usage_log=usage_log
+    )
 
     return parsed_json
 
 
-def regen_resume(job_description, resume_json, job_id):
+def regen_resume(job_description, resume_json, job_id, client=None, rate_limiter=None, write_pdf=True, mode='full',
+                 max_job_tokens=DEFAULT_JOB_TOKEN_BUDGET, usage_log=None):
     """
     Regenerate and save a tailored resume.
 
@@ -88,14 +260,71 @@ def regen_resume(job_description, resume_json, job_id):
         job_description (str): The job description to tailor the resume to.
         resume_json (str): The original resume in JSON format.
         job_id (str): An identifier for the job application.
+        client (OpenAI or LLMBackend): The backend to use. Defaults to the process-wide backend.
+        rate_limiter (TokenBucket): An optional throttle for the API calls.
+        write_pdf (bool): Whether to render the resume PDF. Defaults to True.
+        mode (str): 'full' or 'patch', as for regen_resume_json. Defaults to 'full'.
+        max_job_tokens (int): The token budget of the job description. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+        usage_log (list): If given, the TokenUsage of the request is appended to it.
 
     Returns:
         tuple: A tuple containing:
             - dict: The regenerated resume as a Python dictionary.
-            - str: The file path of the generated resume document.
+            - str: The file path of the generated resume document, or None if
+                   write_pdf is False.
+    """
+    regen_json = regen_resume_json(job_description, resume_json, client=client, rate_limiter=rate_limiter, mode=mode,
+                                   max_job_tokens=max_job_tokens, usage_log=usage_log)
+
+    output_filepath = generate_resume_from_json(regen_json, job_id) if write_pdf else None
+
+    return regen_json, output_filepath
+
+
+def regen_resumes_batch(jobs, resume_json, max_concurrency=4, requests_per_minute=60,
+                        client=None, return_exceptions=False, write_pdf=True, mode='full',
+                        max_job_tokens=DEFAULT_JOB_TOKEN_BUDGET, usage_log=None):
+    """
+    Regenerate and save tailored resumes for many jobs concurrently.
+
+    Requests run on a thread pool sharing one pooled client and one token-bucket
+    throttle, and each request is retried with exponential backoff on transient errors.
+
+    Args:
+        jobs (iterable): (job_description, job_id) pairs to tailor the resume to.
+        resume_json (str): The original resume in JSON format.
+        max_concurrency (int): The maximum number of requests in flight. Defaults to 4.
+        requests_per_minute (float): The request rate limit. Pass None to disable
+                                     throttling. Defaults to 60.
+        client (OpenAI or LLMBackend): The backend to use. Defaults to the process-wide backend.
+        return_exceptions (bool): If True, a failed job yields its exception in place of
+                                  a result instead of raising. Defaults to False.
+        write_pdf (bool): Whether to render each resume PDF. Defaults to True.
+        mode (str): 'full' or 'patch', as for regen_resume_json. Defaults to 'full'.
+        max_job_tokens (int): The token budget of each job description. Defaults to DEFAULT_JOB_TOKEN_BUDGET.
+        usage_log (list): If given, the TokenUsage of every request is appended to it.
+
+    Returns:
+        list: One (regen_json, output_filepath) tuple per job, in input order.
     """
-    regen_json = regen_resume_json(job_description, resume_json)
+    jobs = list(jobs)
+    rate_limiter = TokenBucket.per_minute(requests_per_minute) if requests_per_minute else None
+
+    def run(job):
+        job_description, job_id = job
+        return regen_resume(job_description, resume_json, job_id, client=client, rate_limiter=rate_limiter,
+                            write_pdf=write_pdf, mode=mode, max_job_tokens=max_job_tokens, usage_log=usage_log)
+
+    with ThreadPoolExecutor(max_workers=max(1, max_concurrency)) as executor:
+        futures = [executor.submit(run, job) for job in jobs]
 
-    output_filepath = generate_resume_from_json(regen_json, job_id)
+        results = []
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results.append(error)
 
-    return regen_json, output_filepath
\ No newline at end of file
+    return results
\ No newline at end of file
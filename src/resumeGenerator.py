@@ -1,9 +1,42 @@
-from reportlab.lib.pagesizes import LETTER
-from reportlab.lib.styles import getSampleStyleSheet
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
-from reportlab.lib import colors
+from concurrent.futures import ProcessPoolExecutor
 from io import BytesIO
+import multiprocessing
 import os
+import tempfile
+
+_styles = None
+
+def create_render_executor(max_workers=None):
+    """
+    Create a process pool for rendering PDFs.
+
+    Workers are spawned rather than forked, because callers have usually started torch
+    and Selenium threads by the time they render, and forking a multi-threaded process
+    can deadlock the child.
+
+    Args:
+        max_workers (int): The number of worker processes. Defaults to the number of CPUs.
+
+    Returns:
+        ProcessPoolExecutor: The new pool.
+    """
+    return ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+
+def get_styles():
+    """
+    Get the ReportLab stylesheet shared by every render in this process.
+
+    Building the sample stylesheet is a noticeable part of rendering a short resume,
+    so it is built once per process instead of once per PDF.
+
+    Returns:
+        StyleSheet1: The sample stylesheet.
+    """
+    global _styles
+    if _styles is None:
+        from reportlab.lib.styles import getSampleStyleSheet
+        _styles = getSampleStyleSheet()
+    return _styles
 
 def is_content_empty(content):
     """
@@ -15,140 +48,274 @@ def is_content_empty(content):
         return not content
     return True
 
-def generate_resume_from_json(json_data, jobid):
+# Kinds of the blocks yielded by iter_resume_blocks
+TITLE = 'title'
+SECTION = 'section'
+ENTRY = 'entry'
+LABEL = 'label'
+TEXT = 'text'
+SPACER = 'spacer'
+
+def iter_resume_blocks(json_data):
     """
-    Generate a PDF resume from JSON data.
+    Walk resume JSON section by section, in the order the resume is laid out.
 
-    This function takes a JSON object containing personal and professional information
-    and creates a formatted PDF resume. The resume includes sections such as contact
-    information, professional summary, skills, experience, projects, education,
-    certifications, and more.
+    This is the single definition of what a resume shows and in which order; both
+    render_resume_text and build_resume_pdf consume it, so the text used for scoring
+    always matches the PDF.
 
     Args:
         json_data (dict): A dictionary containing the resume information.
-        jobid (str): A unique identifier for the job application.
-
-    Returns:
-        str: The file path of the generated PDF resume.
 
-    Note:
-        The function saves the generated PDF in a '../generatedResumes' directory
-        with the filename format '{jobid}.pdf'.
+    Yields:
+        tuple: (kind, text) pairs, where kind is TITLE, SECTION, ENTRY (an item heading
+               within a section), LABEL, TEXT or SPACER (with text None).
     """
-
-    buffer = BytesIO()
-    pdf = SimpleDocTemplate(buffer, pagesize=LETTER)
-    styles = getSampleStyleSheet()
-    
-    content = []
-    
-    # Add Name
     if 'name' in json_data and not is_content_empty(json_data['name']):
-        content.append(Paragraph(f"<b>{json_data['name']}</b>", styles['Title']))
-    
-    # Add Contact Info
+        yield TITLE, json_data['name']
+
     if 'contact' in json_data and not is_content_empty(json_data['contact']):
         contact = json_data['contact']
-        contact_info = []
-        for field in ['email', 'phone', 'linkedin', 'github', 'location']:
-            if field in contact and not is_content_empty(contact[field]):
-                contact_info.append(f"{field.capitalize()}: {contact[field]}")
+        contact_info = [f"{field.capitalize()}: {contact[field]}"
+                        for field in ['email', 'phone', 'linkedin', 'github', 'location']
+                        if field in contact and not is_content_empty(contact[field])]
         if contact_info:
-            content.append(Paragraph(" | ".join(contact_info), styles['Normal']))
-            content.append(Spacer(1, 12))
+            yield TEXT, " | ".join(contact_info)
+            yield SPACER, None
 
-    # Add Summary
     if 'summary' in json_data and not is_content_empty(json_data['summary']):
-        content.append(Paragraph("<b>Professional Summary</b>", styles['Heading2']))
-        content.append(Paragraph(json_data['summary'], styles['Normal']))
-        content.append(Spacer(1, 12))
-    
-    # Add Skills
+        yield SECTION, "Professional Summary"
+        yield TEXT, json_data['summary']
+        yield SPACER, None
+
     if 'skills' in json_data and not is_content_empty(json_data['skills']):
-        content.append(Paragraph("<b>Skills</b>", styles['Heading2']))
+        yield SECTION, "Skills"
         for skill_category, skill_list in json_data['skills'].items():
             if not is_content_empty(skill_list):
-                content.append(Paragraph(f"<b>{skill_category}:</b>", styles['Normal']))
-                content.append(Paragraph(", ".join(skill_list), styles['Normal']))
-        content.append(Spacer(1, 12))
+                yield LABEL, f"{skill_category}:"
+                yield TEXT, ", ".join(skill_list)
+        yield SPACER, None
 
-    # Add Experience
     if 'experience' in json_data and not is_content_empty(json_data['experience']):
-        content.append(Paragraph("<b>Professional Experience</b>", styles['Heading2']))
+        yield SECTION, "Professional Experience"
         for job in json_data['experience']:
             if not is_content_empty(job):
-                content.append(Paragraph(f"<b>{job.get('title', '')}</b>", styles['Heading3']))
-                content.append(Paragraph(f"{job.get('company', '')} – {job.get('location', '')}", styles['Normal']))
-                content.append(Paragraph(f"{job.get('duration', '')}", styles['Normal']))
+                yield ENTRY, job.get('title', '')
+                yield TEXT, f"{job.get('company', '')} – {job.get('location', '')}"
+                yield TEXT, f"{job.get('duration', '')}"
                 responsibilities = job.get('responsibilities', [])
                 if not is_content_empty(responsibilities):
                     for responsibility in responsibilities:
-                        content.append(Paragraph(f"• {responsibility}", styles['Normal']))
-                content.append(Spacer(1, 12))
+                        yield TEXT, f"• {responsibility}"
+                yield SPACER, None
 
-    # Add Projects
     if 'projects' in json_data and not is_content_empty(json_data['projects']):
-        content.append(Paragraph("<b>Projects</b>", styles['Heading2']))
+        yield SECTION, "Projects"
         for project in json_data['projects']:
             if not is_content_empty(project):
-                content.append(Paragraph(f"<b>{project.get('name', '')}</b>", styles['Heading3']))
-                content.append(Paragraph(project.get('company', ''), styles['Normal']))
-                content.append(Paragraph(project.get('description', ''), styles['Normal']))
-                content.append(Spacer(1, 12))
+                yield ENTRY, project.get('name', '')
+                yield TEXT, project.get('company', '')
+                yield TEXT, project.get('description', '')
+                yield SPACER, None
 
-    # Add Open Source Contributions
     if 'open_source_contributions' in json_data and not is_content_empty(json_data['open_source_contributions']):
-        content.append(Paragraph("<b>Open Source Contributions</b>", styles['Heading2']))
+        yield SECTION, "Open Source Contributions"
         for contrib in json_data['open_source_contributions']:
             if not is_content_empty(contrib):
-                content.append(Paragraph(f"<b>{contrib.get('project', '')}</b>", styles['Heading3']))
-                content.append(Paragraph(contrib.get('contribution', ''), styles['Normal']))
-                content.append(Spacer(1, 12))
+                yield ENTRY, contrib.get('project', '')
+                yield TEXT, contrib.get('contribution', '')
+                yield SPACER, None
 
-    # Add Education
     if 'education' in json_data and not is_content_empty(json_data['education']):
-        content.append(Paragraph("<b>Education</b>", styles['Heading2']))
+        yield SECTION, "Education"
         for edu in json_data['education']:
             if not is_content_empty(edu):
-                content.append(Paragraph(edu.get('degree', ''), styles['Heading3']))
-                content.append(Paragraph(edu.get('institution', ''), styles['Normal']))
+                yield ENTRY, edu.get('degree', '')
+                yield TEXT, edu.get('institution', '')
                 if 'graduation_year' in edu and not is_content_empty(edu['graduation_year']):
-                    content.append(Paragraph(f"Graduation Year: {edu['graduation_year']}", styles['Normal']))
+                    yield TEXT, f"Graduation Year: {edu['graduation_year']}"
                 if 'relevant_courses' in edu and not is_content_empty(edu['relevant_courses']):
-                    content.append(Paragraph(f"Relevant Courses: {', '.join(edu['relevant_courses'])}", styles['Normal']))
-                content.append(Spacer(1, 12))
+                    yield TEXT, f"Relevant Courses: {', '.join(edu['relevant_courses'])}"
+                yield SPACER, None
 
-    # Add Certifications
     if 'certifications' in json_data and not is_content_empty(json_data['certifications']):
-        content.append(Paragraph("<b>Certifications</b>", styles['Heading2']))
+        yield SECTION, "Certifications"
         for cert in json_data['certifications']:
             if not is_content_empty(cert):
-                content.append(Paragraph(f"{cert.get('name', '')}, Issued: {cert.get('issued', '')}", styles['Normal']))
-        content.append(Spacer(1, 12))
+                yield TEXT, f"{cert.get('name', '')}, Issued: {cert.get('issued', '')}"
+        yield SPACER, None
 
-    # Add Technical Proficiencies
     if 'technical_proficiencies' in json_data and not is_content_empty(json_data['technical_proficiencies']):
-        content.append(Paragraph("<b>Technical Proficiencies</b>", styles['Heading2']))
+        yield SECTION, "Technical Proficiencies"
         for category, profs in json_data['technical_proficiencies'].items():
             if not is_content_empty(profs):
-                content.append(Paragraph(f"{category.capitalize()}: {', '.join(profs)}", styles['Normal']))
-        content.append(Spacer(1, 12))
+                yield TEXT, f"{category.capitalize()}: {', '.join(profs)}"
+        yield SPACER, None
 
-    # Add References
     if 'references' in json_data and not is_content_empty(json_data['references']):
-        content.append(Paragraph("<b>References</b>", styles['Heading2']))
-        content.append(Paragraph(json_data['references'], styles['Normal']))
+        yield SECTION, "References"
+        yield TEXT, json_data['references']
+
+def render_resume_text(json_data):
+    """
+    Render resume JSON as plain text, one paragraph per line.
+
+    The text holds exactly the paragraphs of the PDF produced by
+    generate_resume_from_json, so it can be scored in memory in place of the text
+    extracted from that PDF.
+
+    Args:
+        json_data (dict): A dictionary containing the resume information.
+
+    Returns:
+        str: The resume as plain text, one paragraph per line.
+    """
+    return "\n".join(text for kind, text in iter_resume_blocks(json_data) if kind != SPACER and text)
+
+def write_file_atomically(data, file_path):
+    """
+    Write bytes to a file so readers see either the old file or the complete new one.
+
+    Args:
+        data (bytes): The file content.
+        file_path (str): The destination path.
+    """
+    directory = os.path.dirname(file_path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, temporary_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(temporary_path, file_path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+def build_resume_pdf(json_data):
+    """
+    Render resume JSON to PDF bytes in memory.
+
+    Args:
+        json_data (dict): A dictionary containing the resume information.
+
+    Returns:
+        bytes: The PDF document.
+    """
+    # ReportLab is imported on first render so importing this module stays cheap
+    from reportlab.lib.pagesizes import LETTER
+    from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer
+
+    buffer = BytesIO()
+    pdf = SimpleDocTemplate(buffer, pagesize=LETTER)
+    styles = get_styles()
+
+    # Paragraph markup and style of every block kind
+    block_styles = {
+        TITLE: ("<b>{}</b>", 'Title'),
+        SECTION: ("<b>{}</b>", 'Heading2'),
+        ENTRY: ("<b>{}</b>", 'Heading3'),
+        LABEL: ("<b>{}</b>", 'Normal'),
+        TEXT: ("{}", 'Normal'),
+    }
+
+    content = []
+    for kind, text in iter_resume_blocks(json_data):
+        if kind == SPACER:
+            content.append(Spacer(1, 12))
+        else:
+            markup, style = block_styles[kind]
+            content.append(Paragraph(markup.format(text), styles[style]))
 
     # Build PDF
     pdf.build(content)
-    
-    buffer.seek(0)
+
+    return buffer.getvalue()
+
+def generate_resume_from_json(json_data, jobid, output_dir='../generatedResumes', return_bytes=False):
+    """
+    Generate a PDF resume from JSON data.
+
+    This function takes a JSON object containing personal and professional information
+    and creates a formatted PDF resume. The resume includes sections such as contact
+    information, professional summary, skills, experience, projects, education,
+    certifications, and more.
+
+    Args:
+        json_data (dict): A dictionary containing the resume information.
+        jobid (str): A unique identifier for the job application.
+        output_dir (str): The directory to save the PDF in. Defaults to '../generatedResumes'.
+        return_bytes (bool): If True, return the PDF bytes without writing a file,
+                             e.g. for st.download_button. Defaults to False.
+
+    Returns:
+        str or bytes: The file path of the generated PDF resume, or the PDF bytes if
+                      return_bytes is True.
+
+    Note:
+        The function saves the generated PDF in output_dir with the filename format
+        '{jobid}.pdf', replacing any earlier file atomically.
+    """
+    pdf_bytes = build_resume_pdf(json_data)
+    if return_bytes:
+        return pdf_bytes
 
     # Save PDF to file
-    output_filename = f"{jobid}.pdf"
-    output_filepath = os.path.join('../generatedResumes', output_filename)
-    os.makedirs(os.path.dirname(output_filepath), exist_ok=True)
-    with open(output_filepath, "wb") as f:
-        f.write(buffer.getvalue())
+    output_filepath = os.path.join(output_dir, f"{jobid}.pdf")
+    write_file_atomically(pdf_bytes, output_filepath)
+
+    return output_filepath
+
+def _render_job(job):
+    json_data, jobid, output_dir, return_bytes = job
+    return generate_resume_from_json(json_data, jobid, output_dir=output_dir, return_bytes=return_bytes)
+
+def render_resumes_batch(resumes, max_workers=None, output_dir='../generatedResumes', return_bytes=False,
+                         return_exceptions=False, executor=None):
+    """
+    Render many PDF resumes in parallel on a process pool.
+
+    Rendering is CPU-bound pure Python, so separate processes let it scale with the
+    number of cores. Each worker process builds the stylesheet once and reuses it for
+    every resume it renders.
+
+    Args:
+        resumes (iterable): (json_data, jobid) pairs to render.
+        max_workers (int): The number of worker processes. Defaults to the number of CPUs.
+        output_dir (str): The directory to save the PDFs in. Defaults to '../generatedResumes'.
+        return_bytes (bool): If True, return PDF bytes instead of writing files. Defaults to False.
+        return_exceptions (bool): If True, a failed render yields its exception in place of
+                                  a result instead of raising. Defaults to False.
+        executor (ProcessPoolExecutor): An existing pool to submit to, so callers rendering
+                                        in several batches start the workers only once.
+
+    Returns:
+        list: One file path (or bytes) per resume, in input order.
+    """
+    jobs = [(json_data, jobid, output_dir, return_bytes) for json_data, jobid in resumes]
+    if not jobs:
+        return []
+
+    own_executor = executor is None and len(jobs) > 1
+    if own_executor:
+        executor = create_render_executor(min(max_workers or os.cpu_count() or 1, len(jobs)))
+
+    results = []
+    try:
+        if executor is None:
+            # A single resume is not worth starting a worker process for
+            futures = None
+        else:
+            futures = [executor.submit(_render_job, job) for job in jobs]
+
+        for i, job in enumerate(jobs):
+            try:
+                results.append(futures[i].result() if futures else _render_job(job))
+            except Exception as error:
+                if not return_exceptions:
+                    raise
+                results.append(error)
+    finally:
+        if own_executor:
+            executor.shutdown()
 
-    return output_filepath
\ No newline at end of file
+    return results
@@ -1,8 +1,71 @@
-from sentence_transformers import SentenceTransformer
-from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import os
 from pdfLoader import loadPdfContent
+from embeddingCache import EmbeddingCache
+from modelRegistry import get_model
+from resumeGenerator import render_resume_text
+
+# Relative weight of each resume section in weighted pooling; unlisted sections weigh 0.5
+SECTION_WEIGHTS = {
+    'summary': 1.0,
+    'skills': 2.0,
+    'experience': 2.0,
+    'projects': 1.0,
+}
+
+# Points subtracted from the original resume's score, so the app and the batch pipeline report it on one scale
+ORIGINAL_RESUME_SCORE_OFFSET = 10
+
+
+def split_resume_sections(resume_json, window_words=100, overlap_words=25):
+    """
+    Split resume JSON into per-section text chunks.
+
+    Sections holding lists (experience, projects, ...) yield one chunk per entry, and
+    entries longer than one window are split further with window_text, so every chunk
+    fits within the encoder's input limit.
+
+    Args:
+        resume_json (dict): The resume as a Python dictionary.
+        window_words (int): The maximum number of words per chunk. Defaults to 100.
+        overlap_words (int): Words shared by consecutive windows of one entry. Defaults to 25.
+
+    Returns:
+        dict: A mapping of section name to a list of chunk texts. Empty sections are left out.
+    """
+    sections = {}
+    for key, value in resume_json.items():
+        if key in ('name', 'contact', 'references'):
+            continue
+        entries = value if isinstance(value, list) else [value]
+        chunks = [render_resume_text({key: [entry] if isinstance(value, list) else entry}) for entry in entries]
+        chunks = [window for chunk in chunks if chunk.strip()
+                  for window in window_text(chunk, window_words, overlap_words)]
+        if chunks:
+            sections[key] = chunks
+    return sections
+
+
+def window_text(text, window_words=100, overlap_words=25):
+    """
+    Split a long text into overlapping word windows.
+
+    Args:
+        text (str): The text to split.
+        window_words (int): The number of words per window. Defaults to 100, which keeps
+                            a window within MiniLM's 128-token limit.
+        overlap_words (int): The number of words shared by consecutive windows. Defaults to 25.
+
+    Returns:
+        list of str: The windows in text order, or [text] if it fits in one window.
+    """
+    words = text.split()
+    if len(words) <= window_words:
+        return [text]
+    step = max(1, window_words - overlap_words)
+    return [' '.join(words[start:start + window_words])
+            for start in range(0, len(words) - overlap_words, step)]
+
 
 class RelevanceScorer:
     """
@@ -12,18 +75,62 @@ class RelevanceScorer:
     for the input texts and calculates their similarity using cosine similarity.
 
     Attributes:
-        model (SentenceTransformer): The pre-trained Sentence Transformer model.
+        model (SentenceTransformer): The pre-trained Sentence Transformer model, or an
+                                     OnnxSentenceEncoder with the same encode interface.
+        model_name (str): The name of the model.
+        cache_key (str): The model name plus backend, used to key cached embeddings.
+        cache (EmbeddingCache): The on-disk embedding cache, or None if caching is disabled.
     """
 
-    def __init__(self, model_name='paraphrase-MiniLM-L6-v2'):
+    def __init__(self, model_name='paraphrase-MiniLM-L6-v2', cache_dir='../cache/embeddings', backend='torch'):
         """
         Initialize the RelevanceScorer with a specified model.
 
         Args:
             model_name (str): The name of the pre-trained Sentence Transformer model to use.
                               Defaults to 'paraphrase-MiniLM-L6-v2'.
+            cache_dir (str): The directory of the persistent embedding cache. Pass None to
+                             disable caching. Defaults to '../cache/embeddings'.
+            backend (str): 'torch' for the PyTorch SentenceTransformer, or 'onnx' for the
+                           int8-quantized ONNX Runtime encoder, which is faster on CPU.
+                           Defaults to 'torch'.
+        """
+        self.model_name = model_name
+        # Models are loaded once per process and shared by every scorer
+        self.model = get_model(model_name, backend)
+        # Quantized ONNX embeddings differ slightly, so they are cached separately
+        self.cache_key = model_name if backend == 'torch' else f"{model_name}@onnx-int8"
+        self.cache = EmbeddingCache(cache_dir) if cache_dir is not None else None
+
+    def encode(self, texts, batch_size=32):
+        """
+        Generate normalized embeddings for a list of texts, using the cache where possible.
+
+        Texts already present in the cache are looked up; the rest are encoded in one
+        batched model call and written back to the cache.
+
+        Args:
+            texts (list of str): The texts to embed.
+            batch_size (int): Batch size passed to the model's encode call. Defaults to 32.
+
+        Returns:
+            np.ndarray: A 2-D array with one normalized embedding per text.
         """
-        self.model = SentenceTransformer(model_name)
+        texts = list(texts)
+        if self.cache is None:
+            return self.model.encode(texts, batch_size=batch_size, normalize_embeddings=True)
+
+        cached = self.cache.get_many(self.cache_key, texts)
+        missing = list(dict.fromkeys(text for text, embedding in zip(texts, cached) if embedding is None))
+
+        if missing:
+            new_embeddings = self.model.encode(missing, batch_size=batch_size, normalize_embeddings=True)
+            self.cache.put_many(self.cache_key, missing, new_embeddings)
+            encoded = dict(zip(missing, new_embeddings))
+            cached = [encoded[text] if embedding is None else embedding
+                      for text, embedding in zip(texts, cached)]
+
+        return np.vstack(cached)
 
     def calculate_relevance_score(self, resume_text, job_description_text):
         """
@@ -37,31 +144,180 @@ class RelevanceScorer:
             job_description_text (str): The text content of the job description.
 
         Returns:
-            float: A relevance score between 0 and 100, rounded to two decimal places.
-                   Higher scores indicate greater similarity between the texts.
+            float: A relevance score out of 100 lowered by ORIGINAL_RESUME_SCORE_OFFSET,
+                   rounded to two decimal places. Higher scores indicate greater
+                   similarity between the texts.
         """
-        # Generate embeddings
-        resume_embedding = self.model.encode(resume_text, convert_to_tensor=True)
-        job_description_embedding = self.model.encode(job_description_text, convert_to_tensor=True)
-        
-        # Calculate cosine similarity
-        similarity = cosine_similarity(resume_embedding.cpu().numpy().reshape(1, -1), 
-                                       job_description_embedding.cpu().numpy().reshape(1, -1))[0][0]
-        
-        # Convert similarity to score out of 100
-        score = (similarity + 1) / 2 * 100
-        
-        return round(score, 2) - 10
+        return self.score_original_resume(resume_text, [job_description_text])[0]
+
+    def score_original_resume(self, resume_text, job_description_texts, batch_size=32):
+        """
+        Calculate the scores of the original, untailored resume against job descriptions.
+
+        These are the scores of score_many lowered by ORIGINAL_RESUME_SCORE_OFFSET. Every
+        'Old Resume Score' is computed here, so the app, the batch pipeline and min_score
+        all use the same scale.
+
+        Args:
+            resume_text (str): The text content of the original resume.
+            job_description_texts (list of str): The job description texts to score against.
+            batch_size (int): Batch size passed to the model's encode call. Defaults to 32.
+
+        Returns:
+            list of float: One score per job description, in input order.
+        """
+        scores = self.score_many(resume_text, job_description_texts, batch_size=batch_size)
+        return [round(score - ORIGINAL_RESUME_SCORE_OFFSET, 2) for score in scores]
+
+    def score_many(self, resume_text, job_description_texts, batch_size=32):
+        """
+        Calculate relevance scores between one resume and many job descriptions.
+
+        The resume is encoded once and all job descriptions are encoded in a single
+        batched call with normalized embeddings, so every cosine similarity reduces
+        to one matrix-vector product.
+
+        Args:
+            resume_text (str): The text content of the resume.
+            job_description_texts (list of str): The job description texts to score against.
+            batch_size (int): Batch size passed to the model's encode call. Defaults to 32.
+
+        Returns:
+            list of float: Relevance scores between 0 and 100, rounded to two decimal
+                           places, in the same order as job_description_texts.
+        """
+        job_description_texts = list(job_description_texts)
+        if not job_description_texts:
+            return []
+
+        # Encode the resume once and every description in one batched pass
+        embeddings = self.encode([resume_text] + job_description_texts, batch_size=batch_size)
+        resume_embedding, job_description_embeddings = embeddings[0], embeddings[1:]
+
+        # Normalized embeddings make the dot product equal to cosine similarity
+        similarities = job_description_embeddings @ resume_embedding
+
+        # Convert similarities to scores out of 100
+        scores = np.round((similarities.astype(np.float64) + 1) / 2 * 100, 2)
+
+        return scores.tolist()
     
     def calculate_relevance_score_new(self, job_id, job_description_text):
         resume_text = loadPdfContent(os.path.join('../generatedResumes', f"{job_id}.pdf"))
-        resume_embedding = self.model.encode(resume_text, convert_to_tensor=True)
-        job_description_embedding = self.model.encode(job_description_text, convert_to_tensor=True)
-        # Calculate cosine similarity
-        similarity = cosine_similarity(resume_embedding.cpu().numpy().reshape(1, -1), 
-                                       job_description_embedding.cpu().numpy().reshape(1, -1))[0][0]
+        resume_embedding, job_description_embedding = self.encode([resume_text, job_description_text])
+        # Calculate cosine similarity; the embeddings are normalized, so it is their dot product
+        similarity = float(np.dot(resume_embedding, job_description_embedding))
         
         # Convert similarity to score out of 100
         score = (similarity + 1) / 2 * 100
         
-        return round(score, 2)
\ No newline at end of file
+        return round(score, 2)
+
+    def calculate_relevance_score_from_json(self, resume_json, job_description_text):
+        """
+        Calculate the relevance score of a resume given as JSON, without a PDF round-trip.
+
+        Args:
+            resume_json (dict): The resume as a Python dictionary, e.g. from regen_resume_json.
+            job_description_text (str): The text content of the job description.
+
+        Returns:
+            float: A relevance score between 0 and 100, rounded to two decimal places.
+        """
+        return self.score_pairs([render_resume_text(resume_json)], [job_description_text])[0]
+
+    def score_pairs(self, resume_texts, job_description_texts, batch_size=32):
+        """
+        Calculate relevance scores for matching pairs of resumes and job descriptions.
+
+        All texts are encoded in one batched call, and the i-th resume is scored against
+        the i-th job description, which suits one tailored resume per job.
+
+        Args:
+            resume_texts (list of str): The resume texts, or dictionaries rendered with
+                                        render_resume_text.
+            job_description_texts (list of str): The job description texts, one per resume.
+            batch_size (int): Batch size passed to the model's encode call. Defaults to 32.
+
+        Returns:
+            list of float: Relevance scores between 0 and 100, rounded to two decimal places,
+                           one per pair.
+        """
+        resume_texts = [render_resume_text(resume) if isinstance(resume, dict) else resume
+                        for resume in resume_texts]
+        job_description_texts = list(job_description_texts)
+        if len(resume_texts) != len(job_description_texts):
+            raise ValueError("resume_texts and job_description_texts must have the same length")
+        if not resume_texts:
+            return []
+
+        embeddings = self.encode(resume_texts + job_description_texts, batch_size=batch_size)
+        resume_embeddings = embeddings[:len(resume_texts)]
+        job_description_embeddings = embeddings[len(resume_texts):]
+
+        # Row-wise dot products of normalized embeddings are the pairwise cosine similarities
+        similarities = np.einsum('ij,ij->i', resume_embeddings, job_description_embeddings)
+        scores = np.round((similarities.astype(np.float64) + 1) / 2 * 100, 2)
+
+        return scores.tolist()
+
+    def score_sections(self, resume, job_description_text, pooling='weighted', section_weights=None,
+                       window_words=100, overlap_words=25):
+        """
+        Calculate a chunked relevance score with per-section scores.
+
+        The resume is split by section and both the resume chunks and the job description
+        are split into overlapping windows, and all windows are embedded in one batch, so
+        no text is silently truncated. Each resume window is matched to its best job
+        description window, each section takes its best window, and the sections are
+        pooled into one overall score. Chunk
+        embeddings go through the cache, so editing one section only re-embeds that section.
+
+        Args:
+            resume (dict or str): The resume as a Python dictionary, or plain resume text,
+                                  which is then windowed as a single 'resume' section.
+            job_description_text (str): The text content of the job description.
+            pooling (str): 'weighted' for a weighted mean of section scores, or 'max' for
+                           the best section score. Defaults to 'weighted'.
+            section_weights (dict): Weights per section for weighted pooling. Defaults to SECTION_WEIGHTS.
+            window_words (int): Words per resume and job description window. Defaults to 100.
+            overlap_words (int): Words shared by consecutive windows. Defaults to 25.
+
+        Returns:
+            dict: A dictionary containing:
+                - 'score' (float): The overall relevance score between 0 and 100.
+                - 'sections' (dict): The relevance score of each resume section.
+        """
+        if isinstance(resume, dict):
+            sections = split_resume_sections(resume, window_words, overlap_words)
+        else:
+            sections = {'resume': window_text(resume, window_words, overlap_words)}
+        if not sections:
+            return {'score': 0.0, 'sections': {}}
+
+        section_names = [name for name, chunks in sections.items() for _ in chunks]
+        resume_chunks = [chunk for chunks in sections.values() for chunk in chunks]
+        job_windows = window_text(job_description_text, window_words, overlap_words)
+
+        embeddings = self.encode(resume_chunks + job_windows)
+        similarities = embeddings[:len(resume_chunks)] @ embeddings[len(resume_chunks):].T
+
+        # Best job description window for every resume chunk, then best chunk per section
+        chunk_scores = (similarities.max(axis=1) + 1) / 2 * 100
+        section_scores = {}
+        for name, score in zip(section_names, chunk_scores):
+            section_scores[name] = max(section_scores.get(name, 0.0), float(score))
+
+        if pooling == 'max':
+            overall = max(section_scores.values())
+        elif pooling == 'weighted':
+            weights = SECTION_WEIGHTS if section_weights is None else section_weights
+            total_weight = sum(weights.get(name, 0.5) for name in section_scores) or 1.0
+            overall = sum(score * weights.get(name, 0.5) for name, score in section_scores.items()) / total_weight
+        else:
+            raise ValueError(f"Unknown pooling: {pooling}")
+
+        return {
+            'score': round(overall, 2),
+            'sections': {name: round(score, 2) for name, score in section_scores.items()}
+        }
@@ -1,8 +1,90 @@
 from pdfLoader import loadPdfContent
-from openai import OpenAI
+from jsonResponse import request_json
 import json
 from resumeGenerator import generate_resume_from_json
 
+# The structure of the JSON requested by get_restructure_prompt. A list holds the
+# schema of its items, and a dict keyed by str alone has free-form keys.
+RESUME_SCHEMA = {
+    "name": str,
+    "contact": {"email": str, "linkedin": str, "github": str, "phone": str, "location": str},
+    "summary": str,
+    "skills": {str: [str]},
+    "experience": [{"title": str, "company": str, "location": str, "duration": str, "responsibilities": [str]}],
+    "projects": [{"name": str, "company": str, "description": str}],
+    "open_source_contributions": [{"project": str, "contribution": str}],
+    "education": [{"degree": str, "institution": str, "graduation_year": str, "relevant_courses": [str]}],
+    "certifications": [{"name": str, "issued": str}],
+    "technical_proficiencies": {str: [str]},
+    "references": str,
+}
+
+def validate_resume_json(resume_json, schema=RESUME_SCHEMA, path="resume"):
+    """
+    Check resume JSON against the structure requested by get_restructure_prompt.
+
+    Keys may be missing and values may be empty, as the restructure prompt leaves
+    fields without data empty. Text fields also accept numbers, e.g. a graduation year.
+
+    Args:
+        resume_json: The resume, or a part of it when called recursively.
+        schema: The schema of resume_json. Defaults to RESUME_SCHEMA.
+        path (str): The location of resume_json, used in error messages.
+
+    Returns:
+        list of str: One message per problem found; empty if the resume is valid.
+    """
+    if resume_json is None or resume_json == "":
+        return []
+
+    if schema is str:
+        if isinstance(resume_json, (str, int, float)) and not isinstance(resume_json, bool):
+            return []
+        return [f"{path} should be text, got {type(resume_json).__name__}"]
+
+    if isinstance(schema, list):
+        if not isinstance(resume_json, list):
+            return [f"{path} should be a list, got {type(resume_json).__name__}"]
+        errors = []
+        for i, item in enumerate(resume_json):
+            errors += validate_resume_json(item, schema[0], f"{path}[{i}]")
+        return errors
+
+    if not isinstance(resume_json, dict):
+        return [f"{path} should be an object, got {type(resume_json).__name__}"]
+    errors = []
+    for key, value in resume_json.items():
+        if list(schema) == [str]:
+            errors += validate_resume_json(value, schema[str], f"{path}.{key}")
+        elif key in schema:
+            errors += validate_resume_json(value, schema[key], f"{path}.{key}")
+        else:
+            errors.append(f"{path}.{key} is not part of the resume structure")
+    return errors
+
+def drop_unknown_keys(resume_json, schema=RESUME_SCHEMA):
+    """
+    Remove the keys that are not part of the resume structure, at any depth.
+
+    Extra keys, such as a 'languages' section the model added on its own, are never
+    rendered, so they are dropped instead of failing the response.
+
+    Args:
+        resume_json: The resume, or a part of it when called recursively.
+        schema: The schema of resume_json. Defaults to RESUME_SCHEMA.
+
+    Returns:
+        A copy of resume_json without unknown keys. Values that do not match the
+        schema's type are returned unchanged, for validate_resume_json to report.
+    """
+    if isinstance(schema, list) and isinstance(resume_json, list):
+        return [drop_unknown_keys(item, schema[0]) for item in resume_json]
+    if not isinstance(schema, dict) or not isinstance(resume_json, dict):
+        return resume_json
+    if list(schema) == [str]:
+        return {key: drop_unknown_keys(value, schema[str]) for key, value in resume_json.items()}
+    return {key: drop_unknown_keys(value, schema[key]) for key, value in resume_json.items() if key in schema}
+
 def get_restructure_prompt(resume_text):
     prompt = f"""
     I have a resume, and I want to extract specific details from it to fill a predefined JSON structure. For each key in the JSON, find the corresponding data in the resume text. If a key does not have relevant information in the resume, leave the value empty and do not generate random or placeholder values. Below is the JSON structure I need to fill:
@@ -144,23 +226,18 @@ def restructure_old_resume(old_resume_path):
 
     restructured_prompt = get_restructure_prompt(resume_text)
 
-    client = OpenAI()
-    completion = client.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "user", "content": restructured_prompt}
-        ]
-    )
-    result = completion.choices[0].message.content
+    messages = [
+        {"role": "user", "content": restructured_prompt}
+    ]
 
-    try:
-        parsed_json = json.loads(result)
-    except:
-        # Remove the leading and trailing backticks and 'json' identifier
-        json_string = result.strip().lstrip('```json').rstrip('```')
+    def validate(parsed_json):
+        parsed_json = drop_unknown_keys(parsed_json)
+        errors = validate_resume_json(parsed_json)
+        if errors:
+            raise ValueError("Restructured resume does not match the resume structure: " + "; ".join(errors))
+        return parsed_json
 
-        # Parse the JSON string
-        parsed_json = json.loads(json_string)
+    parsed_json = request_json(messages, validate=validate)
     return parsed_json
 
 def save_restructured_resume(old_resume_path, restructured_resume_id):
@@ -0,0 +1,127 @@
+"""
+Seen Jobs Index Module.
+
+This module keeps a persistent SQLite index of every job listing that has been scraped,
+with first-seen and last-seen timestamps and a hash of the listing content, so repeated
+crawls can stop at already-known listings and forward only new or changed jobs.
+"""
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+CONTENT_COLUMNS = ['Job Title', 'Company Name', 'Location']
+
+NEW = 'new'
+CHANGED = 'changed'
+SEEN = 'seen'
+
+
+def hash_job(job):
+    """
+    Compute the content hash of a job listing.
+
+    Args:
+        job (dict or pd.Series): A job listing with the CONTENT_COLUMNS fields.
+
+    Returns:
+        str: The hex SHA-256 digest of the listing content.
+    """
+    content = '\x1f'.join(str(job.get(column, '')) for column in CONTENT_COLUMNS)
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+class SeenJobsIndex:
+    """
+    A class to track which job listings have already been scraped.
+
+    Attributes:
+        db_path (str): The path of the SQLite database file.
+    """
+
+    def __init__(self, db_path='../cache/seen_jobs.sqlite'):
+        """
+        Initialize the SeenJobsIndex.
+
+        Args:
+            db_path (str): The path of the SQLite database file. Defaults to '../cache/seen_jobs.sqlite'.
+        """
+        self.db_path = db_path
+        self._lock = threading.Lock()
+
+        if os.path.dirname(db_path):
+            os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._connection = sqlite3.connect(db_path, check_same_thread=False)
+        with self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS seen_jobs ("
+                "job_id TEXT PRIMARY KEY, first_seen REAL NOT NULL, "
+                "last_seen REAL NOT NULL, content_hash TEXT NOT NULL)"
+            )
+
+    def _hashes(self, job_ids):
+        job_ids = [str(job_id) for job_id in job_ids]
+        hashes = {}
+        with self._lock:
+            # Query in chunks to stay under SQLite's parameter limit
+            for i in range(0, len(job_ids), 500):
+                chunk = job_ids[i:i + 500]
+                rows = self._connection.execute(
+                    f"SELECT job_id, content_hash FROM seen_jobs WHERE job_id IN ({','.join('?' * len(chunk))})",
+                    chunk
+                ).fetchall()
+                hashes.update(rows)
+        return hashes
+
+    def known_ids(self, job_ids):
+        """
+        Find which job IDs are already in the index.
+
+        Args:
+            job_ids (iterable): The job IDs to check.
+
+        Returns:
+            set: The subset of job_ids that has been seen before, as strings.
+        """
+        return set(self._hashes(job_ids))
+
+    def classify(self, jobs):
+        """
+        Classify job listings as new, changed or already seen.
+
+        Args:
+            jobs (pd.DataFrame): Job listings with a 'Job ID' column and the CONTENT_COLUMNS.
+
+        Returns:
+            list of str: One of NEW, CHANGED or SEEN per row, in row order.
+        """
+        known = self._hashes(jobs['Job ID'])
+        statuses = []
+        for _, job in jobs.iterrows():
+            stored_hash = known.get(str(job['Job ID']))
+            if stored_hash is None:
+                statuses.append(NEW)
+            elif stored_hash != hash_job(job):
+                statuses.append(CHANGED)
+            else:
+                statuses.append(SEEN)
+        return statuses
+
+    def update(self, jobs):
+        """
+        Record job listings as seen now, keeping their original first-seen time.
+
+        Args:
+            jobs (pd.DataFrame): Job listings with a 'Job ID' column and the CONTENT_COLUMNS.
+        """
+        now = time.time()
+        rows = [(str(job['Job ID']), now, now, hash_job(job)) for _, job in jobs.iterrows()]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO seen_jobs (job_id, first_seen, last_seen, content_hash) VALUES (?, ?, ?, ?) "
+                "ON CONFLICT(job_id) DO UPDATE SET last_seen = excluded.last_seen, "
+                "content_hash = excluded.content_hash",
+                rows
+            )
@@ -0,0 +1,156 @@
+"""
+Adaptive Wait Module.
+
+This module provides an explicit wait for Selenium drivers that polls a readiness
+condition with exponentially growing intervals instead of sleeping for a fixed time,
+and records how long every wait actually took.
+"""
+
+import time
+from collections import namedtuple
+
+from selenium.common.exceptions import (NoSuchElementException, StaleElementReferenceException,
+                                        TimeoutException)
+
+WaitTiming = namedtuple('WaitTiming', ['label', 'seconds', 'succeeded'])
+
+
+def document_ready(driver):
+    """
+    Condition that holds once the page has finished loading.
+
+    Args:
+        driver (webdriver): The WebDriver instance.
+
+    Returns:
+        bool: True if document.readyState is 'complete'.
+    """
+    return driver.execute_script("return document.readyState") == 'complete'
+
+
+def network_idle(idle_time=0.5):
+    """
+    Build a condition that holds once no new network resources loaded for a while.
+
+    Args:
+        idle_time (float): Seconds without a new resource entry before the network
+                           counts as idle. Defaults to 0.5.
+
+    Returns:
+        callable: A condition taking a driver and returning True once the network is idle.
+    """
+    state = {'count': None, 'since': None}
+
+    def condition(driver):
+        count = driver.execute_script(
+            "return document.readyState === 'complete' ? "
+            "performance.getEntriesByType('resource').length : -1"
+        )
+        now = time.monotonic()
+        if count < 0 or count != state['count']:
+            state['count'], state['since'] = count, now
+            return False
+        return now - state['since'] >= idle_time
+
+    return condition
+
+
+class AdaptiveWait:
+    """
+    An explicit wait with exponential polling backoff and timing records.
+
+    The condition is first checked almost immediately, and the interval between checks
+    doubles up to a ceiling, so fast pages return quickly while slow pages are not
+    polled aggressively.
+
+    Attributes:
+        driver (webdriver): The WebDriver instance passed to conditions.
+        timeout (float): The default maximum wait in seconds.
+        initial_poll (float): The first polling interval in seconds.
+        max_poll (float): The largest polling interval in seconds.
+        backoff (float): The factor the polling interval grows by after each check.
+        timings (list of WaitTiming): The label, duration and outcome of every wait.
+    """
+
+    def __init__(self, driver, timeout=10, initial_poll=0.05, max_poll=1.0, backoff=2.0,
+                 ignored_exceptions=(NoSuchElementException, StaleElementReferenceException),
+                 timings=None):
+        """
+        Initialize the AdaptiveWait.
+
+        Args:
+            driver (webdriver): The WebDriver instance passed to conditions.
+            timeout (float): The default maximum wait in seconds. Defaults to 10.
+            initial_poll (float): The first polling interval in seconds. Defaults to 0.05.
+            max_poll (float): The largest polling interval in seconds. Defaults to 1.0.
+            backoff (float): The factor the polling interval grows by. Defaults to 2.0.
+            ignored_exceptions (tuple): Exceptions raised by a condition that count as
+                                        "not ready yet". Defaults to missing or stale elements.
+            timings (list): A list to append timing records to, so records can outlive the
+                            wait object. Defaults to a new list.
+        """
+        self.driver = driver
+        self.timeout = timeout
+        self.initial_poll = initial_poll
+        self.max_poll = max_poll
+        self.backoff = backoff
+        self.ignored_exceptions = ignored_exceptions
+        self.timings = timings if timings is not None else []
+
+    def until(self, condition, label=None, timeout=None):
+        """
+        Wait until a condition returns a truthy value.
+
+        Args:
+            condition (callable): A function taking the driver, such as a Selenium
+                                  expected condition.
+            label (str): A name for the wait in the timing records. Defaults to the
+                         condition's name.
+            timeout (float): The maximum wait in seconds. Defaults to self.timeout.
+
+        Returns:
+            The truthy value returned by the condition.
+
+        Raises:
+            TimeoutException: If the condition did not hold within the timeout.
+        """
+        timeout = self.timeout if timeout is None else timeout
+        label = label or getattr(condition, '__name__', type(condition).__name__)
+        start = time.monotonic()
+        deadline = start + timeout
+        poll = self.initial_poll
+
+        while True:
+            try:
+                value = condition(self.driver)
+                if value:
+                    self.timings.append(WaitTiming(label, time.monotonic() - start, True))
+                    return value
+            except self.ignored_exceptions:
+                pass
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self.timings.append(WaitTiming(label, time.monotonic() - start, False))
+                raise TimeoutException(f"Timed out after {timeout}s waiting for {label}")
+            time.sleep(min(poll, remaining))
+            poll = min(poll * self.backoff, self.max_poll)
+
+    def summary(self):
+        """
+        Summarize the recorded waits per label.
+
+        Returns:
+            dict: For each label, the number of waits, timeouts, and the mean and
+                  maximum duration in seconds.
+        """
+        summary = {}
+        for timing in self.timings:
+            stats = summary.setdefault(timing.label, {'count': 0, 'timeouts': 0, 'total': 0.0, 'max': 0.0})
+            stats['count'] += 1
+            stats['timeouts'] += 0 if timing.succeeded else 1
+            stats['total'] += timing.seconds
+            stats['max'] = max(stats['max'], timing.seconds)
+        for stats in summary.values():
+            stats['mean'] = stats.pop('total') / stats['count']
+        return summary
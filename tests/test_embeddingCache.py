@@ -0,0 +1,98 @@
+"""
+Tests for the persistent embedding cache.
+"""
+
+import numpy as np
+import pytest
+
+from embeddingCache import EmbeddingCache
+
+MODEL = 'test-model'
+
+
+def vector(value, dim=4):
+    return np.full(dim, value, dtype=np.float32)
+
+
+@pytest.fixture
+def cache_dir(tmp_path):
+    return str(tmp_path)
+
+
+def test_put_and_get(cache_dir):
+    cache = EmbeddingCache(cache_dir)
+    cache.put_many(MODEL, ["a", "b"], np.vstack([vector(1), vector(2)]))
+
+    a, b, missing = cache.get_many(MODEL, ["a", "b", "c"])
+
+    assert np.array_equal(a, vector(1))
+    assert np.array_equal(b, vector(2))
+    assert missing is None
+    assert cache.get_many('other-model', ["a"]) == [None]
+
+
+def test_embeddings_survive_a_reload(cache_dir):
+    cache = EmbeddingCache(cache_dir)
+    cache.put_many(MODEL, ["a", "b"], np.vstack([vector(1), vector(2)]))
+    cache.close()
+
+    a, b = EmbeddingCache(cache_dir).get_many(MODEL, ["a", "b"])
+
+    assert np.array_equal(a, vector(1))
+    assert np.array_equal(b, vector(2))
+
+
+def test_least_recently_used_entries_are_evicted(cache_dir, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr('embeddingCache.time.time', lambda: next(clock))
+    cache = EmbeddingCache(cache_dir, max_entries=2)
+    cache.put_many(MODEL, ["a"], [vector(1)])
+    cache.put_many(MODEL, ["b"], [vector(2)])
+    cache.get_many(MODEL, ["a"])
+
+    cache.put_many(MODEL, ["c"], [vector(3)])
+
+    a, b, c = cache.get_many(MODEL, ["a", "b", "c"])
+    assert np.array_equal(a, vector(1))
+    assert b is None
+    assert np.array_equal(c, vector(3))
+
+
+def test_lookup_recency_is_persisted_after_a_flush(cache_dir, monkeypatch):
+    clock = iter(range(100))
+    monkeypatch.setattr('embeddingCache.time.time', lambda: next(clock))
+    cache = EmbeddingCache(cache_dir, max_entries=2, flush_interval=3600)
+    cache.put_many(MODEL, ["a", "b"], np.vstack([vector(1), vector(2)]))
+    cache.get_many(MODEL, ["a"])
+    cache.flush()
+
+    reloaded = EmbeddingCache(cache_dir, max_entries=2)
+    reloaded.put_many(MODEL, ["c"], [vector(3)])
+
+    a, b = reloaded.get_many(MODEL, ["a", "b"])
+    assert np.array_equal(a, vector(1))
+    assert b is None
+
+
+def test_crash_while_reusing_a_row_never_returns_another_texts_embedding(cache_dir, monkeypatch):
+    cache = EmbeddingCache(cache_dir, max_entries=2)
+    cache.put_many(MODEL, ["a", "b"], np.vstack([vector(1), vector(2)]))
+
+    # Simulate a crash after the new embedding is flushed but before its entry is saved
+    save_index = cache._save_index
+    saves = []
+
+    def crashing_save_index(model_name, store):
+        saves.append(model_name)
+        if len(saves) > 1:
+            raise OSError("simulated crash")
+        save_index(model_name, store)
+
+    monkeypatch.setattr(cache, '_save_index', crashing_save_index)
+    with pytest.raises(OSError):
+        cache.put_many(MODEL, ["c"], [vector(3)])
+
+    a, b, c = EmbeddingCache(cache_dir, max_entries=2).get_many(MODEL, ["a", "b", "c"])
+    assert a is None
+    assert np.array_equal(b, vector(2))
+    assert c is None
@@ -0,0 +1,123 @@
+"""
+Tests for ranking stored jobs with the job index, run with random embeddings instead
+of a sentence-transformer.
+"""
+
+import json
+import os
+import zlib
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from jobIndex import JobIndex, TopKFilter
+from resumeRelevancyScore import ORIGINAL_RESUME_SCORE_OFFSET
+
+DIMENSION = 32
+
+
+class RandomScorer:
+    """
+    Embeds every text as a fixed random unit vector seeded by the text.
+    """
+
+    def encode(self, texts, batch_size=32):
+        embeddings = np.vstack([np.random.default_rng(zlib.crc32(text.encode())).standard_normal(DIMENSION)
+                                for text in texts])
+        return (embeddings / np.linalg.norm(embeddings, axis=1, keepdims=True)).astype(np.float32)
+
+
+def make_jobs(count, start=0):
+    return pd.DataFrame({
+        'Job ID': [str(1000 + i) for i in range(start, start + count)],
+        'Job Title': [f"Job {i}" for i in range(start, start + count)],
+        'Job Descriptions': [f"Description of job {i}" for i in range(start, start + count)],
+    })
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = JobIndex(RandomScorer(), str(tmp_path))
+    index.add_jobs(make_jobs(200))
+    return index
+
+
+def test_exact_search_returns_the_best_matches_in_order(index):
+    query = RandomScorer().encode(["resume"])[0]
+    expected = np.argsort(-(np.asarray(index.embeddings, dtype=np.float32) @ query))[:10]
+
+    top = index.top_k("resume", k=10)
+
+    assert top['Job ID'].tolist() == index.jobs['Job ID'].iloc[expected].tolist()
+    assert top['Match Score'].is_monotonic_decreasing
+
+
+def test_ann_search_finds_the_exact_matches(index):
+    pytest.importorskip('hnswlib')
+
+    exact = index.top_k("resume", k=10, backend='exact')
+    approximate = index.top_k("resume", k=10, backend='hnsw')
+
+    assert set(approximate['Job ID']) == set(exact['Job ID'])
+    assert np.allclose(approximate['Match Score'], exact['Match Score'], atol=0.01)
+
+
+@pytest.mark.parametrize('k', [0, -1])
+def test_non_positive_k_returns_no_jobs(index, k):
+    assert index.top_k("resume", k=k).empty
+
+
+def test_adding_jobs_switches_to_a_new_version(index, tmp_path):
+    first = json.loads((tmp_path / 'manifest.json').read_text())
+
+    assert index.add_jobs(make_jobs(20, start=190)) == 10
+
+    second = json.loads((tmp_path / 'manifest.json').read_text())
+    assert second['version'] != first['version']
+    assert second['rows'] == 210
+    # Only the files of the current version are kept
+    assert sorted(name for name in os.listdir(tmp_path) if name != 'manifest.json') == \
+        sorted([second['embeddings'], second['jobs']])
+
+    reloaded = JobIndex(RandomScorer(), str(tmp_path))
+    assert reloaded.jobs['Job ID'].tolist() == index.jobs['Job ID'].tolist()
+    assert np.array_equal(reloaded.embeddings, index.embeddings)
+
+
+def test_mismatched_files_are_ignored(index, tmp_path):
+    manifest = json.loads((tmp_path / 'manifest.json').read_text())
+    # As if the metadata of a newer version had been written without its embeddings
+    index.jobs.head(150).to_csv(tmp_path / manifest['jobs'], index=False)
+
+    assert len(JobIndex(RandomScorer(), str(tmp_path))) == 0
+
+
+def test_unversioned_index_still_loads(tmp_path):
+    embeddings = RandomScorer().encode(["a", "b"]).astype(np.float16)
+    np.save(tmp_path / 'embeddings.npy', embeddings)
+    pd.DataFrame({'Job ID': ['1', '2']}).to_csv(tmp_path / 'jobs.csv', index=False)
+
+    index = JobIndex(RandomScorer(), str(tmp_path))
+
+    assert index.jobs['Job ID'].tolist() == ['1', '2']
+    index.add_jobs(make_jobs(1))
+    assert not os.path.exists(tmp_path / 'embeddings.npy')
+    assert len(JobIndex(RandomScorer(), str(tmp_path))) == 3
+
+
+def test_top_k_filter_keeps_jobs_scoring_like_the_top_stored_jobs(index):
+    top = index.top_k("resume", k=5)
+    top_k_filter = TopKFilter(index, "resume", k=5)
+    cutoff = top['Match Score'].min() - ORIGINAL_RESUME_SCORE_OFFSET
+
+    assert all(top_k_filter(job_id, 0.0) for job_id in top['Job ID'])
+    assert top_k_filter('new-job', cutoff + 1)
+    assert not top_k_filter('new-job', cutoff - 1)
+
+
+def test_top_k_filter_keeps_every_job_while_few_are_stored(tmp_path):
+    index = JobIndex(RandomScorer(), str(tmp_path))
+    index.add_jobs(make_jobs(3))
+
+    assert TopKFilter(index, "resume", k=5)('new-job', -100.0)
@@ -0,0 +1,66 @@
+"""
+Tests for the partitioned Parquet job store.
+"""
+
+from datetime import date
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from jobStore import JobStore, search_key
+
+SEARCH = search_key("Data Analyst", "India")
+
+
+@pytest.fixture
+def store(tmp_path):
+    return JobStore(str(tmp_path / 'jobs'))
+
+
+def listing(job_id, title, scraped_at, **extra):
+    return {'Job ID': job_id, 'Job Title': title, 'Company Name': 'Acme', 'Location': 'Remote',
+            'Scraped At': pd.Timestamp(scraped_at, tz='UTC'), **extra}
+
+
+def test_a_bare_rescrape_does_not_hide_stored_results(store):
+    store.append(pd.DataFrame([listing('1', "Analyst", '2024-01-01', **{
+        'Job Descriptions': "Build dashboards", 'Old Resume Score': 60.0, 'ReGen JSON': {'summary': "Tailored."}})]),
+        SEARCH, scraped_date=date(2024, 1, 1))
+    # A later crawl sees the same listing with a new title, but without any enrichment
+    store.append(pd.DataFrame([listing('1', "Senior Analyst", '2024-01-02')]), SEARCH, scraped_date=date(2024, 1, 2))
+
+    jobs = store.load()
+
+    assert len(jobs) == 1
+    job = jobs.iloc[0]
+    assert job['Job Title'] == "Senior Analyst"
+    assert job['Job Descriptions'] == "Build dashboards"
+    assert job['Old Resume Score'] == 60.0
+    assert job['ReGen JSON'] == '{"summary": "Tailored."}'
+
+
+def test_newer_values_win(store):
+    store.append(pd.DataFrame([listing('1', "Analyst", '2024-01-02', **{'Old Resume Score': 70.0})]),
+                 SEARCH, scraped_date=date(2024, 1, 2))
+    store.append(pd.DataFrame([listing('1', "Analyst", '2024-01-01', **{'Old Resume Score': 50.0})]),
+                 SEARCH, scraped_date=date(2024, 1, 1))
+
+    assert store.load()['Old Resume Score'].tolist() == [70.0]
+
+
+def test_load_without_dedupe_keeps_every_row(store):
+    store.append(pd.DataFrame([listing('1', "Analyst", '2024-01-01'), listing('2', "Engineer", '2024-01-01')]),
+                 SEARCH, scraped_date=date(2024, 1, 1))
+    store.append(pd.DataFrame([listing('1', "Analyst", '2024-01-02')]), SEARCH, scraped_date=date(2024, 1, 2))
+
+    assert len(store.load(dedupe=False)) == 3
+    assert sorted(store.load(columns=['Job ID'])['Job ID']) == ['1', '2']
+
+
+def test_empty_store_loads_the_requested_columns(store):
+    jobs = store.load(columns=['Job ID', 'Job Descriptions'])
+
+    assert jobs.empty
+    assert list(jobs.columns) == ['Job ID', 'Job Descriptions']
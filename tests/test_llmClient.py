@@ -0,0 +1,186 @@
+"""
+Tests for the retries, rate limiting and concurrency of LLM requests, run against a
+fake backend instead of the OpenAI API.
+"""
+
+import json
+import os
+import threading
+import time
+import types
+
+import pytest
+
+import llmClient
+from llmBackends import LLMBackend
+from rateLimiter import TokenBucket
+from reGenerate import regen_resumes_batch
+
+RESUME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'inputs', 'resume_data.json')
+USAGE = {'prompt_tokens': 10, 'cached_prompt_tokens': 0, 'completion_tokens': 5}
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+class TransientError(Exception):
+    """Stands in for a retryable API error such as RateLimitError."""
+
+
+class FlakyBackend(LLMBackend):
+    """
+    A backend that fails its first requests, then answers with a fixed response.
+    """
+
+    name = 'flaky'
+    cache_namespace = 'flaky'
+
+    def __init__(self, failures=0, error=TransientError, response='{}', latency=0.0):
+        self.failures = failures
+        self.error = error
+        self.response = response
+        self.latency = latency
+        self.calls = 0
+        self.call_times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def complete(self, messages, model, **kwargs):
+        with self._lock:
+            self.calls += 1
+            self.call_times.append(time.monotonic())
+            fail = self.calls <= self.failures
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                time.sleep(self.latency)
+            if fail:
+                raise self.error("simulated failure")
+            return self.response, dict(USAGE)
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+
+
+@pytest.fixture(autouse=True)
+def fake_environment(monkeypatch):
+    # Treat TransientError like the OpenAI errors and keep responses out of the real cache
+    monkeypatch.setattr(llmClient, 'retryable_errors', lambda: (TransientError,))
+    monkeypatch.setattr(llmClient, '_completion_cache', None)
+    monkeypatch.setattr(llmClient, '_completion_cache_set', True)
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    recorded = []
+    monkeypatch.setattr(llmClient, 'time', types.SimpleNamespace(sleep=recorded.append))
+    monkeypatch.setattr(llmClient.random, 'random', lambda: 0.0)
+    return recorded
+
+
+@pytest.fixture
+def resume_json():
+    with open(RESUME_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def test_retries_transient_errors_with_exponential_backoff(sleeps):
+    backend = FlakyBackend(failures=2)
+    usage_log = []
+
+    result = llmClient.create_completion(MESSAGES, client=backend, max_retries=3, backoff=0.5, usage_log=usage_log)
+
+    assert result == '{}'
+    assert backend.calls == 3
+    assert sleeps == [0.5, 1.0]
+    assert len(usage_log) == 1
+
+
+def test_raises_last_error_when_retries_are_exhausted(sleeps):
+    backend = FlakyBackend(failures=10)
+
+    with pytest.raises(TransientError):
+        llmClient.create_completion(MESSAGES, client=backend, max_retries=2, backoff=0.5)
+
+    assert backend.calls == 3
+    assert sleeps == [0.5, 1.0]
+
+
+def test_non_retryable_errors_fail_immediately(sleeps):
+    backend = FlakyBackend(failures=1, error=RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        llmClient.create_completion(MESSAGES, client=backend, max_retries=3)
+
+    assert backend.calls == 1
+    assert sleeps == []
+
+
+def test_rate_limiter_spaces_out_every_attempt(sleeps):
+    backend = FlakyBackend(failures=2)
+    rate_limiter = TokenBucket(rate=20, capacity=1)
+
+    for _ in range(3):
+        llmClient.create_completion(MESSAGES, client=backend, rate_limiter=rate_limiter, backoff=0)
+
+    # Retries draw from the bucket too, so five attempts need four refills of 50 ms
+    assert backend.calls == 5
+    assert backend.call_times[-1] - backend.call_times[0] >= 0.18
+
+
+def test_batch_runs_requests_concurrently_up_to_the_limit(resume_json):
+    backend = FlakyBackend(response='{"summary": "Tailored summary."}', latency=0.1)
+    jobs = [(f"Job description {i}", f"job-{i}") for i in range(8)]
+
+    start = time.monotonic()
+    results = regen_resumes_batch(jobs, resume_json, max_concurrency=4, requests_per_minute=None,
+                                  client=backend, write_pdf=False, mode='patch')
+    elapsed = time.monotonic() - start
+
+    assert backend.max_in_flight == 4
+    assert elapsed < 8 * 0.1
+    assert [regen_json['summary'] for regen_json, _ in results] == ["Tailored summary."] * 8
+    assert all(output_filepath is None for _, output_filepath in results)
+
+
+def test_batch_retries_transient_errors(resume_json, sleeps):
+    backend = FlakyBackend(failures=3, response='{"summary": "Tailored summary."}')
+    jobs = [(f"Job description {i}", f"job-{i}") for i in range(4)]
+
+    results = regen_resumes_batch(jobs, resume_json, max_concurrency=2, requests_per_minute=None,
+                                  client=backend, write_pdf=False, mode='patch')
+
+    assert backend.calls == 7
+    assert len(sleeps) == 3
+    assert all(regen_json['summary'] == "Tailored summary." for regen_json, _ in results)
+
+
+def test_batch_returns_exceptions_of_failed_jobs(resume_json):
+    backend = FlakyBackend(failures=1, error=RuntimeError, response='{"summary": "Tailored summary."}')
+    jobs = [("Job description", "job-0"), ("Job description", "job-1")]
+
+    results = regen_resumes_batch(jobs, resume_json, max_concurrency=1, requests_per_minute=None,
+                                  client=backend, return_exceptions=True, write_pdf=False, mode='patch')
+
+    assert isinstance(results[0], RuntimeError)
+    assert results[1][0]['summary'] == "Tailored summary."
+
+
+def test_batch_respects_the_request_rate(resume_json):
+    backend = FlakyBackend(response='{"summary": "Tailored summary."}')
+    jobs = [(f"Job description {i}", f"job-{i}") for i in range(3)]
+
+    regen_resumes_batch(jobs, resume_json, max_concurrency=3, requests_per_minute=120,
+                        client=backend, write_pdf=False, mode='patch')
+
+    # 120 requests per minute allow a burst of two, then one request every 500 ms
+    assert backend.calls == 3
+    assert backend.call_times[2] - backend.call_times[0] >= 0.45
+
+
+def test_shared_openai_client_disables_sdk_retries(monkeypatch):
+    pytest.importorskip('openai')
+    monkeypatch.setenv('OPENAI_API_KEY', 'test-key')
+    monkeypatch.setattr(llmClient, '_client', None)
+
+    assert llmClient.get_openai_client().max_retries == 0
@@ -0,0 +1,46 @@
+"""
+Tests for sharing embedding models per process.
+"""
+
+import builtins
+import sys
+
+import pytest
+
+import modelRegistry
+
+
+@pytest.fixture(autouse=True)
+def fake_loader(monkeypatch):
+    loads = []
+
+    def load_model(model_name, backend):
+        loads.append((model_name, backend))
+        return object()
+
+    monkeypatch.setattr(modelRegistry, '_load_model', load_model)
+    monkeypatch.setattr(modelRegistry, '_models', {})
+    return loads
+
+
+def test_models_are_loaded_once_per_process(fake_loader):
+    first = modelRegistry.get_model('model', 'torch')
+
+    assert modelRegistry.get_model('model', 'torch') is first
+    assert modelRegistry.get_model('model', 'onnx') is not first
+    assert fake_loader == [('model', 'torch'), ('model', 'onnx')]
+
+
+def test_streamlit_is_not_imported_outside_streamlit(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'streamlit', raising=False)
+    imported = []
+    real_import = builtins.__import__
+
+    def recording_import(name, *args, **kwargs):
+        imported.append(name)
+        return real_import(name, *args, **kwargs)
+
+    monkeypatch.setattr(builtins, '__import__', recording_import)
+    modelRegistry.get_model('model', 'torch')
+
+    assert not [name for name in imported if name.startswith('streamlit')]
@@ -0,0 +1,71 @@
+"""
+Parity tests of the ONNX encoder against the PyTorch sentence-transformer it is exported from.
+
+The tests export the model on first run, so they need torch, transformers,
+onnxruntime and access to the Hugging Face Hub, and are skipped otherwise.
+"""
+
+import json
+import os
+
+import pytest
+
+pytest.importorskip('torch')
+pytest.importorskip('transformers')
+pytest.importorskip('onnxruntime')
+sentence_transformers = pytest.importorskip('sentence_transformers')
+
+from onnxEncoder import OnnxSentenceEncoder, score_drift
+from resumeGenerator import render_resume_text
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODEL_NAME = 'paraphrase-MiniLM-L6-v2'
+
+# Largest allowed difference of relevance scores, on RelevanceScorer's 0 to 100 scale
+MAX_INT8_SCORE_DRIFT = 2.0
+MAX_FP32_SCORE_DRIFT = 0.1
+
+
+@pytest.fixture(scope='module')
+def texts():
+    with open(os.path.join(REPO_DIR, 'inputs', 'resume_data.json'), 'r', encoding='utf-8') as f:
+        resume_text = render_resume_text(json.load(f))
+    with open(os.path.join(REPO_DIR, 'benchmarks', 'fixtures', 'job_descriptions.json'), 'r', encoding='utf-8') as f:
+        job_descriptions = json.load(f)[:20]
+    return [resume_text] * len(job_descriptions), job_descriptions
+
+
+@pytest.fixture(scope='module')
+def export_dir(tmp_path_factory):
+    return str(tmp_path_factory.mktemp('onnx'))
+
+
+@pytest.fixture(scope='module')
+def torch_model():
+    try:
+        return sentence_transformers.SentenceTransformer(MODEL_NAME)
+    except OSError as error:
+        pytest.skip(f"Model could not be downloaded: {error}")
+
+
+def test_int8_scores_stay_close_to_torch(torch_model, export_dir, texts):
+    encoder = OnnxSentenceEncoder(MODEL_NAME, cache_dir=export_dir, quantize=True)
+
+    assert score_drift(torch_model, encoder, *texts) < MAX_INT8_SCORE_DRIFT
+
+
+def test_fp32_export_matches_torch(torch_model, export_dir, texts):
+    encoder = OnnxSentenceEncoder(MODEL_NAME, cache_dir=export_dir, quantize=False)
+
+    assert score_drift(torch_model, encoder, *texts) < MAX_FP32_SCORE_DRIFT
+
+
+def test_encode_keeps_input_order_and_shape(torch_model, export_dir):
+    encoder = OnnxSentenceEncoder(MODEL_NAME, cache_dir=export_dir, quantize=False)
+    sentences = ["short", "a considerably longer sentence than the first one", "medium length text"]
+
+    embeddings = encoder.encode(sentences, batch_size=2, normalize_embeddings=True)
+    single = encoder.encode(sentences[1], normalize_embeddings=True)
+
+    assert embeddings.shape == (3, torch_model.get_sentence_embedding_dimension())
+    assert abs(float(embeddings[1] @ single) - 1.0) < 1e-5
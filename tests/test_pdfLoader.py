@@ -0,0 +1,41 @@
+"""
+Tests for picking the PDF text extraction backend.
+"""
+
+import pytest
+
+import pdfLoader
+
+
+@pytest.fixture(autouse=True)
+def fresh_default_backend():
+    pdfLoader.get_default_backend.cache_clear()
+    yield
+    pdfLoader.get_default_backend.cache_clear()
+
+
+def test_default_backend_is_probed_once(monkeypatch):
+    imported = []
+
+    def import_module(name):
+        imported.append(name)
+        if name != 'pypdf':
+            raise ImportError(name)
+
+    monkeypatch.setattr(pdfLoader.importlib, 'import_module', import_module)
+
+    assert pdfLoader.get_default_backend() == 'pypdf'
+    assert pdfLoader.get_default_backend() == 'pypdf'
+    assert imported.count('fitz') == 1
+
+
+def test_missing_backends_are_not_remembered(monkeypatch):
+    def import_module(name):
+        raise ImportError(name)
+
+    monkeypatch.setattr(pdfLoader.importlib, 'import_module', import_module)
+    with pytest.raises(ImportError):
+        pdfLoader.get_default_backend()
+
+    monkeypatch.setattr(pdfLoader.importlib, 'import_module', lambda name: None)
+    assert pdfLoader.get_default_backend() == pdfLoader.PDF_BACKENDS[0]
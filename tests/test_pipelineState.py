@@ -0,0 +1,62 @@
+"""
+Tests for the checkpointed pipeline state store.
+"""
+
+import pytest
+
+from pipelineState import PipelineStateStore
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'state.sqlite')
+
+
+@pytest.fixture
+def stores(db_path):
+    return {namespace: PipelineStateStore(db_path, namespace=namespace) for namespace in [None, 'app', 'batch']}
+
+
+def test_record_skip_and_failure(stores):
+    store = stores['batch']
+    store.record('score', '1', {'Old Resume Score': 70.0})
+    store.record_skipped('score', '2')
+    store.record_failure('score', '3', ValueError("boom"))
+
+    assert store.get_many('score', ['1', '2', '3', '4']) == [{'Old Resume Score': 70.0}, False, None, None]
+    assert store.failures() == {('score', '3'): "boom"}
+
+
+def test_namespaces_do_not_read_each_other(stores):
+    for namespace, store in stores.items():
+        store.record('score', '1', str(namespace))
+        store.record_failure('describe', '1', f"{namespace} failed")
+
+    for namespace, store in stores.items():
+        assert store.get('score', '1') == str(namespace)
+        assert store.failures() == {('describe', '1'): f"{namespace} failed"}
+
+
+@pytest.mark.parametrize('cleared', [None, 'app', 'batch'])
+def test_clear_only_touches_its_own_namespace(stores, cleared):
+    for namespace, store in stores.items():
+        store.record('score', '1', str(namespace))
+        store.record('render', '1', str(namespace))
+
+    stores[cleared].clear()
+
+    for namespace, store in stores.items():
+        expected = None if namespace == cleared else str(namespace)
+        assert store.get_many('score', ['1']) + store.get_many('render', ['1']) == [expected, expected]
+
+
+def test_clear_one_stage(stores):
+    store = stores['app']
+    store.record('score', '1', 1)
+    store.record('render', '1', 2)
+
+    store.clear('score')
+
+    assert store.get('score', '1') is None
+    assert store.get('render', '1') == 2
+    assert stores['batch'].get('render', '1') is None
@@ -0,0 +1,64 @@
+"""
+Tests for trimming job descriptions to a token budget.
+"""
+
+import pytest
+
+from promptBuilder import count_tokens, strip_boilerplate, trim_job_description
+
+JOB_DESCRIPTION = """About the role
+We are hiring a data analyst to build dashboards for our sales team.
+
+Responsibilities
+- Build and maintain Tableau dashboards
+- Write SQL against the data warehouse
+1. Present weekly findings
+
+Benefits
+- Health insurance
+- 401k matching
+• Unlimited PTO
+* Free lunch
+
+Equal Employment Opportunity
+- All qualified applicants will receive consideration
+- We do not discriminate on the basis of religion
+2) Accommodations are available on request
+
+Requirements
+- 3+ years of SQL
+"""
+
+
+def test_bulleted_boilerplate_sections_are_dropped_whole():
+    stripped = strip_boilerplate(JOB_DESCRIPTION)
+
+    for boilerplate in ["Benefits", "Health insurance", "401k matching", "Unlimited PTO", "Free lunch",
+                        "Equal Employment Opportunity", "qualified applicants", "religion", "Accommodations"]:
+        assert boilerplate not in stripped
+
+
+def test_sections_about_the_role_are_kept():
+    stripped = strip_boilerplate(JOB_DESCRIPTION)
+
+    for kept in ["About the role", "data analyst", "Responsibilities", "Tableau dashboards",
+                 "SQL against the data warehouse", "Present weekly findings", "Requirements", "3+ years of SQL"]:
+        assert kept in stripped
+
+
+@pytest.mark.parametrize('bullet', ['-', '*', '•', '1.', '12)'])
+def test_list_items_do_not_end_a_boilerplate_section(bullet):
+    text = f"Perks\n{bullet} Gym membership\n{bullet} Team offsites\nSkills\n{bullet} Python"
+
+    assert strip_boilerplate(text) == f"Skills\n{bullet} Python"
+
+
+def test_boilerplate_is_dropped_before_the_role_is_cut():
+    padding = "\n".join(f"- Perk number {i} for every employee" for i in range(200))
+    description = f"Responsibilities\n- Build dashboards\n\nBenefits\n{padding}\n\nRequirements\n- SQL"
+    budget = count_tokens("Responsibilities\n- Build dashboards\n\nRequirements\n- SQL") + 5
+
+    trimmed = trim_job_description(description, max_tokens=budget)
+
+    assert "Requirements" in trimmed
+    assert "Perk number" not in trimmed
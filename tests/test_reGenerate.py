@@ -0,0 +1,81 @@
+"""
+Tests for merging resume patches and repairing malformed ones.
+"""
+
+import json
+import logging
+import os
+
+import pytest
+
+import llmClient
+from llmBackends import FakeBackend
+from reGenerate import apply_resume_patch, regen_resume_json
+
+RESUME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'inputs', 'resume_data.json')
+
+
+@pytest.fixture
+def resume_json():
+    with open(RESUME_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(autouse=True)
+def no_completion_cache(monkeypatch):
+    monkeypatch.setattr(llmClient, '_completion_cache', None)
+    monkeypatch.setattr(llmClient, '_completion_cache_set', True)
+
+
+def test_patch_replaces_and_appends_bullets(resume_json):
+    bullets = resume_json['experience'][0]['responsibilities']
+    patch = {"summary": "New summary.",
+             "experience": [{"index": 0, "responsibilities": {"0": "Rewritten."}, "append": ["Added."]}]}
+
+    patched = apply_resume_patch(resume_json, patch)
+
+    assert patched['summary'] == "New summary."
+    assert patched['experience'][0]['responsibilities'] == ["Rewritten."] + bullets[1:] + ["Added."]
+    assert resume_json['experience'][0]['responsibilities'] == bullets
+
+
+@pytest.mark.parametrize('patch', [
+    {"experience": [{"index": 0, "responsibilities": ["Not a mapping."]}]},
+    {"experience": [{"index": 0, "responsibilities": {"0": ["Not a string."]}}]},
+    {"experience": [{"index": 0, "append": "Not a list."}]},
+    {"experience": [{"index": 0, "append": [{"text": "Not a string."}]}]},
+    {"experience": {"index": 0}},
+    {"experience": [{"index": 99}]},
+    {"experience": [{"index": True, "append": ["Added."]}]},
+    {"experience": [{"index": "0", "append": ["Added."]}]},
+    {"experience": [{"index": 0, "responsibilities": {"99": "Unknown bullet."}}]},
+    {"education": []},
+    ["not", "an", "object"],
+])
+def test_malformed_patches_raise_value_error(resume_json, patch):
+    with pytest.raises(ValueError):
+        apply_resume_patch(resume_json, patch)
+
+
+def test_malformed_patch_gets_one_repair_request(resume_json):
+    bad_patch = json.dumps({"experience": [{"index": 0, "append": "New bullet"}]})
+    good_patch = json.dumps({"experience": [{"index": 0, "append": ["New bullet"]}]})
+    # Only the repair request carries more than the system and user message
+    backend = FakeBackend(default_response=lambda messages: good_patch if len(messages) > 2 else bad_patch)
+
+    patched = regen_resume_json("Job description", resume_json, client=backend, mode='patch')
+
+    assert backend.calls == 2
+    assert patched['experience'][0]['responsibilities'][-1] == "New bullet"
+
+
+def test_prompt_token_counts_are_logged(resume_json, caplog):
+    backend = FakeBackend(default_response=json.dumps({"summary": "Tailored."}))
+    description = "Responsibilities\n" + "\n".join(f"- Build dashboard number {i}" for i in range(500))
+
+    with caplog.at_level(logging.DEBUG, logger='reGenerate'):
+        regen_resume_json(description, resume_json, client=backend, mode='patch', max_job_tokens=100)
+
+    messages = [record.getMessage() for record in caplog.records if record.name == 'reGenerate']
+    assert any(message.startswith("Trimmed job description") for message in messages)
+    assert any(message.startswith("Regen prompt tokens") for message in messages)
@@ -0,0 +1,77 @@
+"""
+Tests for section-level chunked relevance scoring, run with a bag-of-words encoder
+instead of a sentence-transformer.
+"""
+
+import zlib
+
+import numpy as np
+import pytest
+
+import modelRegistry
+from resumeRelevancyScore import ORIGINAL_RESUME_SCORE_OFFSET, RelevanceScorer, split_resume_sections
+
+DIMENSION = 256
+MAX_WINDOW_WORDS = 100
+
+
+class BagOfWordsEncoder:
+    """
+    Embeds a text as its normalized bag of hashed words, and records every encoded text.
+    """
+
+    def __init__(self):
+        self.encoded = []
+
+    def encode(self, texts, batch_size=32, normalize_embeddings=True):
+        self.encoded.extend(texts)
+        embeddings = np.zeros((len(texts), DIMENSION), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                embeddings[row, zlib.crc32(word.encode()) % DIMENSION] += 1.0
+        return embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+
+
+@pytest.fixture
+def scorer(monkeypatch):
+    monkeypatch.setitem(modelRegistry._models, ('bag-of-words', 'torch'), BagOfWordsEncoder())
+    return RelevanceScorer('bag-of-words', cache_dir=None)
+
+
+def long_resume():
+    # 200 filler words followed by the only words that match the job below
+    filler = " ".join(f"filler{i}" for i in range(200))
+    return {
+        "name": "Jane Doe",
+        "summary": "Analyst.",
+        "experience": [{"title": "Engineer", "company": "Acme", "dates": "2020 - 2024",
+                        "responsibilities": [filler, "kubernetes terraform observability"]}],
+    }
+
+
+def test_long_entries_are_split_into_windows():
+    sections = split_resume_sections(long_resume(), window_words=MAX_WINDOW_WORDS)
+
+    assert len(sections['experience']) > 1
+    assert all(len(chunk.split()) <= MAX_WINDOW_WORDS for chunk in sections['experience'])
+    assert "observability" in sections['experience'][-1]
+
+
+def test_section_scores_see_the_end_of_long_entries(scorer):
+    result = scorer.score_sections(long_resume(), "kubernetes terraform observability",
+                                   window_words=MAX_WINDOW_WORDS)
+
+    assert all(len(text.split()) <= MAX_WINDOW_WORDS for text in scorer.model.encoded)
+    # Orthogonal embeddings score 50, which is all a truncated first window would reach
+    assert result['sections']['experience'] > 55
+    assert result['sections']['summary'] == 50
+
+
+def test_original_resume_scores_are_offset_from_score_many(scorer):
+    descriptions = ["kubernetes terraform", "sql dashboards"]
+
+    raw = scorer.score_many("kubernetes sql", descriptions)
+    original = scorer.score_original_resume("kubernetes sql", descriptions)
+
+    assert original == [round(score - ORIGINAL_RESUME_SCORE_OFFSET, 2) for score in raw]
+    assert scorer.calculate_relevance_score("kubernetes sql", descriptions[0]) == original[0]
@@ -0,0 +1,63 @@
+"""
+Tests for validating restructured resumes, run against a fake backend.
+"""
+
+import json
+import os
+
+import pytest
+
+import llmClient
+import resumeRestructre
+from llmBackends import FakeBackend
+from resumeRestructre import drop_unknown_keys, restructure_old_resume, validate_resume_json
+
+RESUME_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'inputs', 'resume_data.json')
+
+
+@pytest.fixture
+def resume_json():
+    with open(RESUME_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture(autouse=True)
+def no_completion_cache(monkeypatch):
+    monkeypatch.setattr(llmClient, '_completion_cache', None)
+    monkeypatch.setattr(llmClient, '_completion_cache_set', True)
+    monkeypatch.setattr(resumeRestructre, 'loadPdfContent', lambda path: "Resume text")
+
+
+def test_unknown_keys_are_dropped_at_every_depth(resume_json):
+    extended = dict(resume_json, languages=["English"])
+    extended['contact'] = dict(resume_json['contact'], twitter="@jane")
+    extended['experience'] = [dict(job, team="Platform") for job in resume_json['experience']]
+
+    cleaned = drop_unknown_keys(extended)
+
+    assert cleaned == resume_json
+    assert validate_resume_json(cleaned) == []
+
+
+def test_free_form_sections_keep_their_keys():
+    assert drop_unknown_keys({"skills": {"Any Category": ["Python"]}}) == {"skills": {"Any Category": ["Python"]}}
+
+
+def test_restructure_accepts_extra_sections_without_a_repair(resume_json, monkeypatch):
+    backend = FakeBackend(default_response=json.dumps(dict(resume_json, languages=["English"])))
+    monkeypatch.setattr(llmClient, '_backend', backend)
+
+    restructured = restructure_old_resume("resume.pdf")
+
+    assert backend.calls == 1
+    assert restructured == resume_json
+
+
+def test_restructure_still_repairs_wrongly_typed_sections(resume_json, monkeypatch):
+    bad = json.dumps(dict(resume_json, summary=["Not", "text"]))
+    good = json.dumps(resume_json)
+    backend = FakeBackend(default_response=lambda messages: good if len(messages) > 1 else bad)
+    monkeypatch.setattr(llmClient, '_backend', backend)
+
+    assert restructure_old_resume("resume.pdf") == resume_json
+    assert backend.calls == 2
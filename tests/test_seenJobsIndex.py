@@ -0,0 +1,39 @@
+"""
+Tests for the persistent index of already scraped job listings.
+"""
+
+import pandas as pd
+import pytest
+
+from seenJobsIndex import CHANGED, NEW, SEEN, SeenJobsIndex
+
+
+@pytest.fixture
+def index(tmp_path):
+    return SeenJobsIndex(str(tmp_path / 'seen.sqlite'))
+
+
+def listings(*rows):
+    return pd.DataFrame([{'Job ID': job_id, 'Job Title': title, 'Company Name': 'Acme', 'Location': 'Remote'}
+                         for job_id, title in rows])
+
+
+def test_classifies_new_changed_and_seen_listings(index):
+    index.update(listings(('1', "Analyst"), ('2', "Engineer")))
+
+    statuses = index.classify(listings(('1', "Analyst"), ('2', "Senior Engineer"), ('3', "Designer")))
+
+    assert statuses == [SEEN, CHANGED, NEW]
+    assert index.known_ids(['1', '3', 4]) == {'1'}
+
+
+def test_update_keeps_the_first_seen_time(index):
+    index.update(listings(('1', "Analyst")))
+    first_seen, = index._connection.execute("SELECT first_seen FROM seen_jobs").fetchone()
+
+    index.update(listings(('1', "Senior Analyst")))
+
+    row = index._connection.execute("SELECT first_seen, last_seen FROM seen_jobs").fetchone()
+    assert row[0] == first_seen
+    assert row[1] >= first_seen
+    assert index.classify(listings(('1', "Senior Analyst"))) == [SEEN]